@@ -2,6 +2,13 @@ import streamlit as st
 from app.components.onboarding import OnboardingFlow
 from app.utils.profile_manager import ProfileManager
 from app.utils.pdf_processor import PDFProcessor
+from app.utils.lazy_document import lazy_document_for
+from app.services.gpt_service import DEFAULT_MODEL
+from app.services.model_registry import get_model_registry
+import time
+
+# Seconds between reruns while a PDF is still being extracted
+POLL_SECONDS = 1.0
 
 # Configure Streamlit page
 st.set_page_config(
@@ -40,21 +47,38 @@ def show_first_episode(profile):
     if uploaded_file:
         st.success("Document uploaded successfully!")
         
-        # Process the PDF
+        # Decode the first pages for the overview, the rest in the background;
+        # large uploads skip this and are streamed in bounded memory below
+        document = None if pdf_processor.is_large(uploaded_file) else lazy_document_for(uploaded_file, st.session_state)
+        
+        # Show document info
+        st.subheader("📄 Document Overview")
+        col1, col2, col3 = st.columns(3)
+        if document is not None:
+            with col1:
+                st.metric("Pages", document.num_pages)
+        with col3:
+            size_mb = round(uploaded_file.size / (1024 * 1024), 2)
+            st.metric("Size", f"{size_mb} MB")
+        
+        if document is not None and not document.done:
+            with st.expander("👀 Preview", expanded=True):
+                st.markdown(document.preview_text(1000) + "...")
+            st.progress(document.progress)
+            st.caption(f"Analyzing your document: {document.pages_done} of {document.num_pages} pages")
+            time.sleep(POLL_SECONDS)
+            st.rerun()
+        
+        # Process the PDF; page texts come from the finished background extraction
         with st.spinner("Analyzing your document..."):
             doc_info = pdf_processor.process_uploaded_file(uploaded_file)
             
             if doc_info:
-                # Show document info
-                st.subheader("📄 Document Overview")
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Pages", doc_info["metadata"]["num_pages"])
+                if document is None:
+                    with col1:
+                        st.metric("Pages", doc_info["metadata"]["num_pages"])
                 with col2:
                     st.metric("Sections", len(doc_info["sections"]))
-                with col3:
-                    size_mb = round(doc_info["metadata"]["file_size"] / (1024 * 1024), 2)
-                    st.metric("Size", f"{size_mb} MB")
                 
                 # Show sections
                 st.subheader("📚 Document Structure")
@@ -106,6 +130,9 @@ def show_first_episode(profile):
                         """)
 
 def main():
+    # Load the LLM in the background so the first episode doesn't wait for it
+    get_model_registry().warm_up(DEFAULT_MODEL)
+    
     # Initialize profile manager
     profile_manager = ProfileManager()
 
@@ -1,13 +1,103 @@
 import streamlit as st
 from app.services.zotero_service import ZoteroService
-from app.services.pdf_service import PDFService
-from app.services.generator import Generator
+from app.services.gpt_service import DEFAULT_MODEL
+from app.services.job_queue import JobQueue, ensure_workers
+from app.services.model_registry import get_model_registry
+from app.utils.dedup import LSHIndex, add_source, remove_source, source_title
+from app.utils.lazy_document import lazy_document_for
+from app.utils.profile_manager import ProfileManager
+from app.utils.search_index import get_search_index
 from pathlib import Path
+from typing import Dict
 import os
 
+# Seconds between polls of a running job or PDF extraction; only the
+# polling fragment reruns, not the whole page
+POLL_SECONDS = 1.0
+
+# Audio file suffix -> MIME type, by TTS engine format
+AUDIO_MIME_TYPES = {".mp3": "audio/mpeg", ".wav": "audio/wav"}
+
+def _poll_job(job_id: str) -> Dict:
+    """Return a queued or running job, replacing dead workers; rerun the whole page once it has finished."""
+    ensure_workers()
+    job = JobQueue().get(job_id)
+    if job is None or job['status'] not in ("queued", "running"):
+        st.rerun()
+    return job
+
+@st.fragment(run_every=POLL_SECONDS)
+def _wait_for_items(job_id: str):
+    _poll_job(job_id)
+    st.caption("Fetching collection items...")
+
+@st.fragment(run_every=POLL_SECONDS)
+def _extraction_progress(document):
+    if document.done:
+        st.rerun()
+    st.progress(document.progress)
+    st.caption(f"Extracting text: {document.pages_done} of {document.num_pages} pages")
+
+@st.fragment(run_every=POLL_SECONDS)
+def _episode_progress(job_id: str):
+    job = _poll_job(job_id)
+    st.progress(job['progress'])
+    st.caption(job['message'] or "Waiting for a worker... This may take a few minutes.")
+    # Play the first finished segment and render the script as it is written
+    partial = job['partial'] or {}
+    # Segments are removed once joined into the episode's audio file
+    first_segment = (partial.get('segments') or [None])[0]
+    if first_segment and os.path.exists(first_segment):
+        st.audio(first_segment, format=AUDIO_MIME_TYPES.get(Path(first_segment).suffix, "audio/mpeg"))
+    if partial.get('script'):
+        st.markdown(partial['script'])
+
+def _collection_items(collection_key: str):
+    """Return a Zotero collection's items, fetched once by a job worker.
+
+    While the fetch is running, a fragment polls the job and returns
+    nothing; the page reruns once the items are in.
+    """
+    jobs = st.session_state.setdefault('zotero_jobs', {})
+    if collection_key not in jobs:
+        ensure_workers()
+        jobs[collection_key] = JobQueue().submit("zotero_items", {
+            'library_id': st.session_state.zotero_library_id,
+            'api_key': st.session_state.zotero_api_key,
+            'collection_key': collection_key
+        })
+    
+    job = JobQueue().get(jobs[collection_key])
+    if job is None or job['status'] == "failed":
+        jobs.pop(collection_key, None)
+        st.error(f"Error fetching collection items: {job['error'] if job else 'job lost'}")
+        return []
+    if job['status'] != "done":
+        _wait_for_items(jobs[collection_key])
+        return []
+    return job['result']['items']
+
+def _add_to_sources(source):
+    """Add a source to the selection unless the same work is already there."""
+    # One index kept with the selection, so each addition only indexes the new source
+    duplicate = add_source(
+        st.session_state.setdefault('selected_sources', []),
+        source,
+        st.session_state.setdefault('selected_sources_index', LSHIndex())
+    )
+    if duplicate is None:
+        st.success("Added to selected sources!")
+    elif duplicate in st.session_state['selected_sources']:
+        st.info(f"Already in your sources as \"{source_title(duplicate)}\".")
+    else:
+        st.info(f"Replaced \"{source_title(duplicate)}\" with this fuller copy of the same work.")
+
 def show_create_episode():
     st.title("Create Episode 🎙️")
     
+    # Load the LLM in the background while sources are being chosen
+    get_model_registry().warm_up(DEFAULT_MODEL)
+    
     # Initialize step if not exists
     if "create_step" not in st.session_state:
         st.session_state.create_step = 1
@@ -36,11 +126,8 @@ def show_create_episode():
     
     # Step 1: Add Sources
     if st.session_state.create_step == 1:
-        # Initialize services
-        pdf_service = PDFService()
-        
         # Create tabs for different source types
-        source_tab, pdf_tab = st.tabs(["Zotero Library", "PDF Upload"])
+        source_tab, pdf_tab, search_tab = st.tabs(["Zotero Library", "PDF Upload", "Search"])
         
         with source_tab:
             st.subheader("Zotero Library")
@@ -95,7 +182,7 @@ def show_create_episode():
                         )
                         
                         if selected_collection:
-                            items = zotero_service.get_items_in_collection(selected_collection['key'])
+                            items = _collection_items(selected_collection['key'])
                             if items:
                                 st.write(f"Found {len(items)} items in collection")
                                 for item in items:
@@ -107,8 +194,7 @@ def show_create_episode():
                                             st.write(item['data']['abstractNote'])
                                         
                                         if st.button(f"Add to Sources", key=f"add_{item['key']}"):
-                                            st.session_state.setdefault('selected_sources', []).append(item)
-                                            st.success("Added to selected sources!")
+                                            _add_to_sources(item)
                 except Exception as e:
                     st.error(f"Error accessing Zotero: {str(e)}")
                     st.session_state.zotero_configured = False
@@ -116,10 +202,6 @@ def show_create_episode():
         with pdf_tab:
             st.subheader("Upload PDF")
             
-            # Create upload directory if it doesn't exist
-            upload_dir = Path("uploads")
-            upload_dir.mkdir(exist_ok=True)
-            
             uploaded_file = st.file_uploader(
                 "Choose a PDF file",
                 type=['pdf'],
@@ -128,14 +210,10 @@ def show_create_episode():
             
             if uploaded_file:
                 try:
-                    # Save the uploaded file
-                    file_path = upload_dir / uploaded_file.name
-                    with open(file_path, "wb") as f:
-                        f.write(uploaded_file.getvalue())
-                    
-                    # Extract text and metadata
-                    text = pdf_service.extract_text(str(file_path))
-                    metadata = pdf_service.get_metadata(str(file_path))
+                    # Decode the first pages now and the rest in the background,
+                    # straight from the upload's buffer
+                    document = lazy_document_for(uploaded_file, st.session_state)
+                    metadata = document.metadata
                     
                     # Display metadata
                     st.subheader("Document Information")
@@ -145,22 +223,55 @@ def show_create_episode():
                     
                     # Display preview
                     with st.expander("Preview Content"):
-                        st.write(text[:1000] + "..." if len(text) > 1000 else text)
+                        preview = document.preview_text(1001)
+                        st.write(preview[:1000] + "..." if len(preview) > 1000 else preview)
                     
                     if st.button("Add to Sources"):
+                        # Only persist the file once it is actually used
+                        upload_dir = Path("uploads")
+                        upload_dir.mkdir(exist_ok=True)
+                        file_path = upload_dir / uploaded_file.name
+                        with open(file_path, "wb") as f:
+                            f.write(uploaded_file.getbuffer())
+                        
                         pdf_source = {
                             'type': 'pdf',
                             'path': str(file_path),
-                            'metadata': metadata,
-                            'text': text
+                            'metadata': metadata
                         }
-                        st.session_state.setdefault('selected_sources', []).append(pdf_source)
-                        st.success("PDF added to selected sources!")
+                        # Generator extracts the text later if it isn't ready yet
+                        if document.done and not document.error:
+                            pdf_source['text'] = document.text()
+                        _add_to_sources(pdf_source)
+                        
+                    # Poll the background extraction until it finishes
+                    if not document.done:
+                        _extraction_progress(document)
+                    elif document.error:
+                        st.error(f"Error processing PDF: {document.error}")
                         
                 except Exception as e:
                     st.error(f"Error processing PDF: {str(e)}")
-                    if file_path.exists():
-                        file_path.unlink()
+        
+        with search_tab:
+            st.subheader("Search Your Documents")
+            query = st.text_input(
+                "Search",
+                placeholder="Search uploaded PDFs and Zotero abstracts",
+                help="Matches passages from every indexed document; add any of them as a source"
+            )
+            
+            if query:
+                hits = get_search_index().search(query)
+                if not hits:
+                    st.info("No matching passages found.")
+                for idx, hit in enumerate(hits):
+                    icon = "📄" if hit['kind'] == "pdf" else "📚"
+                    label = f"{hit['title']} — {hit['section']}" if hit['section'] else hit['title']
+                    with st.expander(f"{icon} {label}", expanded=idx < 3):
+                        st.markdown(hit['snippet'])
+                        if st.button("Add to Sources", key=f"add_hit_{hit['doc_id']}_{idx}"):
+                            _add_to_sources(hit['source'])
         
         # Display selected sources
         if st.session_state.get('selected_sources', []):
@@ -172,14 +283,14 @@ def show_create_episode():
                         st.write(f"**Author:** {source['metadata'].get('author', 'Unknown')}")
                         st.write(f"**Pages:** {source['metadata'].get('pages', 0)}")
                         if st.button("Remove", key=f"remove_pdf_{idx}"):
-                            st.session_state['selected_sources'].pop(idx)
+                            remove_source(st.session_state['selected_sources'], idx, st.session_state.get('selected_sources_index'))
                             st.rerun()
                 else:
                     with st.expander(f"📚 {source['data'].get('title', 'Untitled')}"):
                         st.write(f"**Type:** {source['data'].get('itemType', 'Unknown')}")
                         st.write(f"**Authors:** {', '.join([author.get('firstName', '') + ' ' + author.get('lastName', '') for author in source['data'].get('creators', [])])}")
                         if st.button("Remove", key=f"remove_zotero_{idx}"):
-                            st.session_state['selected_sources'].pop(idx)
+                            remove_source(st.session_state['selected_sources'], idx, st.session_state.get('selected_sources_index'))
                             st.rerun()
             
             # Next step button
@@ -259,47 +370,67 @@ def show_create_episode():
             else:
                 st.write(f"📚 {source['data'].get('title', 'Unknown Source')}")
         
-        # Generate button
+        # Generate button; the work runs in a job worker so it survives reruns
         if st.button("Generate Episode", type="primary"):
-            with st.spinner("Generating your episode... This may take a few minutes."):
-                try:
-                    generator = Generator()
-                    result = generator.generate_episode(
-                        sources=st.session_state['selected_sources'],
-                        title=config['title'],
-                        tone=config['tone'],
-                        duration_minutes=config['duration'],
-                        language=config['language']
+            ensure_workers()
+            profile = ProfileManager().get_profile(st.session_state['profile_id']) if 'profile_id' in st.session_state else None
+            st.session_state['episode_job_id'] = JobQueue().submit("generate_episode", {
+                'sources': st.session_state['selected_sources'],
+                'title': config['title'],
+                'tone': config['tone'],
+                'duration_minutes': config['duration'],
+                'language': config['language'],
+                # Long sources are cut down to what matters to the listener
+                'interests': (profile or {}).get('interests', []),
+                'voice': (profile or {}).get('voice_preference', 'default'),
+                # Audio is made while the script is written, so it can be played early
+                'pipelined': True
+            })
+        
+        job = JobQueue().get(st.session_state['episode_job_id']) if st.session_state.get('episode_job_id') else None
+        if job and job['status'] in ("queued", "running"):
+            _episode_progress(job['id'])
+        elif job and job['status'] == "failed":
+            st.error(f"Error generating episode: {job['error']}")
+        elif job:
+            result = job['result']
+            st.success("Episode generated successfully!")
+            
+            # Display episode details
+            st.header("Episode Details")
+            st.subheader(result["title"])
+            st.write(result["summary"])
+            if result.get("tags"):
+                st.caption(" · ".join(f"#{tag}" for tag in result["tags"]))
+            if result.get("chapters"):
+                with st.expander("Chapters"):
+                    for number, chapter in enumerate(result["chapters"], 1):
+                        st.write(f"{number}. {chapter}")
+            with st.expander("Script"):
+                st.markdown(open(result["transcript_path"], "r").read())
+            
+            col1, col2 = st.columns(2)
+            if result["audio_path"]:
+                audio_mime = AUDIO_MIME_TYPES.get(Path(result["audio_path"]).suffix, "audio/mpeg")
+                with col1:
+                    st.audio(result["audio_path"], format=audio_mime)
+                with col2:
+                    st.download_button(
+                        "Download Audio",
+                        open(result["audio_path"], "rb"),
+                        file_name=Path(result["audio_path"]).name,
+                        mime=audio_mime
                     )
-                    
-                    if result:
-                        st.success("Episode generated successfully!")
-                        
-                        # Display episode details
-                        st.header("Episode Details")
-                        st.subheader(result["title"])
-                        st.write(result["summary"])
-                        
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            st.audio(result["audio_path"])
-                        with col2:
-                            st.download_button(
-                                "Download Audio",
-                                open(result["audio_path"], "rb"),
-                                file_name=f"{config['title'].lower().replace(' ', '_')}.mp3",
-                                mime="audio/mpeg"
-                            )
-                            st.download_button(
-                                "Download Transcript",
-                                open(result["transcript_path"], "r").read(),
-                                file_name=f"{config['title'].lower().replace(' ', '_')}.txt",
-                                mime="text/plain"
-                            )
-                    else:
-                        st.error("Failed to generate episode. Please try again.")
-                except Exception as e:
-                    st.error(f"Error generating episode: {str(e)}")
+            else:
+                with col1:
+                    st.warning(f"The script is ready, but its audio could not be made: {result.get('audio_error')}")
+            with col2:
+                st.download_button(
+                    "Download Transcript",
+                    open(result["transcript_path"], "r").read(),
+                    file_name=Path(result["transcript_path"]).name,
+                    mime="text/plain"
+                )
         
         # Back button
         if st.button("⬅️ Back to Configuration"):
@@ -310,6 +441,8 @@ def show_create_episode():
         if st.button("Start Over"):
             st.session_state.pop('episode_config', None)
             st.session_state.pop('selected_sources', None)
+            st.session_state.pop('selected_sources_index', None)
+            st.session_state.pop('episode_job_id', None)
             st.session_state.create_step = 1
             st.rerun()
 
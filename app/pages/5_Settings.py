@@ -1,6 +1,8 @@
 import streamlit as st
 import json
 from app.utils.profile_manager import ProfileManager
+from app.utils.llm_cache import get_llm_cache
+from app.utils.tts_cache import get_tts_cache
 from datetime import datetime
 
 def show_settings():
@@ -198,6 +200,17 @@ def show_settings():
                 help="Maximum number of episodes to store locally"
             )
         with col2:
+            tts_stats = get_tts_cache().stats()
+            st.caption(
+                f"Audio segment cache: {tts_stats['bytes'] / 1e6:.1f} MB, "
+                f"{tts_stats['hit_rate']:.0%} hit rate, "
+                f"{tts_stats['bytes_saved'] / 1e6:.1f} MB reused"
+            )
+            llm_stats = get_llm_cache().stats()
+            st.caption(
+                f"LLM response cache: {llm_stats['bytes'] / 1e6:.1f} MB, "
+                f"{llm_stats['hit_rate']:.0%} hit rate"
+            )
             if st.button("Clear Cache", type="secondary"):
                 # TODO: Implement cache clearing
                 st.info("Cache clearing not implemented yet")
@@ -0,0 +1,217 @@
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, TypeVar, Union
+import asyncio
+import contextlib
+import os
+import queue
+import random
+import threading
+import weakref
+
+import httpx
+import ollama
+
+# Ollama server; None lets the client fall back to OLLAMA_HOST or localhost
+DEFAULT_HOST = os.getenv("WOOHOO_OLLAMA_HOST") or None
+
+# Requests in flight at once, seconds allowed per attempt, and retries
+# after the first attempt (with exponential backoff plus jitter)
+DEFAULT_CONCURRENCY = int(os.getenv("WOOHOO_LLM_CONCURRENCY", 4))
+DEFAULT_TIMEOUT = float(os.getenv("WOOHOO_LLM_TIMEOUT", 300))
+DEFAULT_RETRIES = 3
+BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 30.0
+
+# How often a request waiting for a slot held by another event loop checks again
+SLOT_POLL_SECONDS = 0.01
+
+T = TypeVar("T")
+
+# Server statuses worth retrying: overloaded or failing, not a bad request
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+def _retryable(error: Exception) -> bool:
+    """Whether a failed request may succeed if sent again."""
+    if isinstance(error, ollama.ResponseError):
+        return error.status_code in RETRY_STATUSES
+    return isinstance(error, (asyncio.TimeoutError, ConnectionError, httpx.TransportError))
+
+class AsyncLLM:
+    def __init__(
+        self,
+        model: str,
+        host: Optional[str] = DEFAULT_HOST,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = BACKOFF_SECONDS,
+        keep_alive: Optional[Union[str, float]] = None
+    ):
+        """Initialize an asyncio Ollama client with bounded concurrency.
+
+        At most ``concurrency`` requests run at once; each attempt is cut
+        off after ``timeout`` seconds, and timeouts, connection errors and
+        5xx/429 responses are retried up to ``retries`` times with
+        exponential backoff. ``keep_alive`` is sent with every request to
+        control how long the server keeps the model loaded. Point ``host``
+        at a fake server to test. The limit holds across every thread and
+        event loop using this client.
+        """
+        self.model = model
+        self.host = host
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.keep_alive = keep_alive
+        self._slots = threading.BoundedSemaphore(self.concurrency)
+        self._sessions = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _session(self):
+        """Return the client and semaphore for the running event loop.
+
+        Both are bound to a loop, every asyncio.run starts a new one, and
+        several threads may each be running one.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if loop not in self._sessions:
+                self._sessions[loop] = (
+                    ollama.AsyncClient(host=self.host, timeout=self.timeout),
+                    asyncio.Semaphore(self.concurrency)
+                )
+            return self._sessions[loop]
+
+    @contextlib.asynccontextmanager
+    async def _slot(self, semaphore: asyncio.Semaphore):
+        """Hold one of the ``concurrency`` request slots shared by all event loops.
+
+        The loop's own semaphore queues its requests first, so at most
+        ``concurrency`` per loop poll for a shared slot.
+        """
+        async with semaphore:
+            while not self._slots.acquire(blocking=False):
+                await asyncio.sleep(SLOT_POLL_SECONDS)
+            try:
+                yield
+            finally:
+                self._slots.release()
+
+    async def chat(self, messages: List[Dict], options: Optional[Dict] = None, format: Optional[Union[str, Dict]] = None) -> str:
+        """Send a chat request and return the reply text, retrying transient failures.
+
+        ``format`` is "json" or a JSON schema the reply must follow.
+        """
+        client, semaphore = self._session()
+        for attempt in range(self.retries + 1):
+            try:
+                async with self._slot(semaphore):
+                    response = await asyncio.wait_for(
+                        client.chat(model=self.model, messages=messages, options=options, format=format, keep_alive=self.keep_alive),
+                        self.timeout
+                    )
+                return response['message']['content']
+            except Exception as e:
+                if attempt == self.retries or not _retryable(e):
+                    raise
+                delay = min(MAX_BACKOFF_SECONDS, self.backoff * 2 ** attempt)
+                await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+
+
+    async def stream(self, messages: List[Dict], options: Optional[Dict] = None) -> AsyncIterator[str]:
+        """Yield the reply text piece by piece as the model generates it.
+
+        Failures before the first piece are retried like ``chat``; once
+        text has been yielded, errors propagate. ``timeout`` bounds the
+        wait for each piece rather than the whole reply.
+        """
+        client, semaphore = self._session()
+        for attempt in range(self.retries + 1):
+            started = False
+            try:
+                async with self._slot(semaphore):
+                    parts = await asyncio.wait_for(
+                        client.chat(model=self.model, messages=messages, options=options, stream=True, keep_alive=self.keep_alive),
+                        self.timeout
+                    )
+                    while True:
+                        try:
+                            part = await asyncio.wait_for(parts.__anext__(), self.timeout)
+                        except StopAsyncIteration:
+                            return
+                        content = part['message']['content']
+                        if content:
+                            started = True
+                            yield content
+            except Exception as e:
+                if started or attempt == self.retries or not _retryable(e):
+                    raise
+                delay = min(MAX_BACKOFF_SECONDS, self.backoff * 2 ** attempt)
+                await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+
+_DONE = object()
+
+# Items ``iterate_sync`` buffers ahead of its consumer, and how often a
+# producer waiting for room checks again
+ITERATE_QUEUE_SIZE = 64
+QUEUE_POLL_SECONDS = 0.01
+
+def iterate_sync(make_iterator: Callable[[], AsyncIterator[T]]) -> Iterator[T]:
+    """Consume an async iterator from synchronous code, item by item.
+
+    The iterator runs on its own event loop in a background thread, so
+    items are handed over as soon as they are produced, at most
+    ``ITERATE_QUEUE_SIZE`` ahead of the consumer. Errors are raised in the
+    consuming thread. If the consumer stops early (closing the generator,
+    or dropping it), the iterator is closed on its loop, which releases
+    any request slot it holds.
+    """
+    items: queue.Queue = queue.Queue(maxsize=ITERATE_QUEUE_SIZE)
+    stop = threading.Event()
+
+    def hand_over(item) -> bool:
+        """Queue an item unless the consumer has stopped; False if it has."""
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=QUEUE_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run():
+        async def consume():
+            iterator = make_iterator()
+            try:
+                async for item in iterator:
+                    # Waits on the loop rather than blocking it
+                    while True:
+                        try:
+                            items.put_nowait(item)
+                            break
+                        except queue.Full:
+                            if stop.is_set():
+                                return
+                            await asyncio.sleep(QUEUE_POLL_SECONDS)
+                    if stop.is_set():
+                        return
+            finally:
+                await iterator.aclose()
+        try:
+            asyncio.run(consume())
+        except BaseException as e:
+            hand_over(e)
+        finally:
+            hand_over(_DONE)
+
+    threading.Thread(target=run, daemon=True, name="woohoo-llm-stream").start()
+    try:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
@@ -1,13 +1,84 @@
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
 from pathlib import Path
+import queue
+import re
+import shutil
+import threading
 import time
 import json
 import os
-import tempfile
+import unicodedata
+import uuid
 
 from app.services.gpt_service import LLMService
+from app.services.pdf_service import PDFService
 from app.services.tts_service import TTSService
+from app.utils.budget_planner import plan_sources
+from app.utils.audio_processing import AudioPostProcessor
+from app.utils.chunking import iter_paragraphs
+from app.utils.dedup import unique_sources
+from app.utils.disk_cache import sha256_digest
 from app.utils.file_handler import FileHandler
+from app.utils.pdf_source import source_digest
+
+# Script generation modes: "map_reduce" covers every source in full through
+# the LLM and streams the script; "structured" does the same but writes the
+# script, summary, chapters and tags in one call; "template" is the offline
+# placeholder script.
+SCRIPT_MODES = ("map_reduce", "structured", "template")
+
+# Tokens of material per formatted source
+DEFAULT_SOURCE_TOKENS = 500
+
+# Episodes generate_batch works on at once
+DEFAULT_BATCH_WORKERS = int(os.getenv("WOOHOO_BATCH_WORKERS", 4))
+
+# Paragraphs written but not yet synthesized in pipelined mode; past this
+# the script stage waits for speech synthesis to catch up
+PIPELINE_QUEUE_SIZE = 4
+
+# Longest title part of an episode's file names
+MAX_SLUG_CHARS = 60
+
+def _check_script_mode(script_mode: str):
+    if script_mode not in SCRIPT_MODES:
+        raise ValueError(f"Unknown script mode: {script_mode}")
+
+def _episode_slug(title: str) -> str:
+    """A file name stem for an episode: its title made safe, plus a unique suffix.
+
+    Episodes with the same title get their own audio, segments and
+    transcript instead of overwriting each other's.
+    """
+    ascii_title = unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode("ascii")
+    slug = re.sub(r"[^a-z0-9]+", "_", ascii_title.lower()).strip("_")[:MAX_SLUG_CHARS].rstrip("_")
+    return f"{slug or 'episode'}_{time.strftime('%Y%m%d-%H%M%S')}_{uuid.uuid4().hex[:6]}"
+
+def _source_key(source: Dict) -> str:
+    """Identify a source across episode specs, so a shared one is processed once.
+
+    PDF sources are keyed by content, not path: a search hit carries its
+    file's path but only one passage as ``text``, so sources with text are
+    keyed by it, and a path alone by the file's bytes.
+    """
+    if source.get('type') == 'pdf':
+        if 'text' in source or not source.get('path'):
+            content = f"{source.get('path') or ''}\0{source.get('text', '')}"
+            return f"pdf:text:{sha256_digest(content.encode('utf-8'))}"
+        try:
+            return f"pdf:file:{source_digest(source['path'])}"
+        except OSError:
+            # Reported per episode when the source is loaded
+            return f"pdf:path:{source['path']}"
+    key = source.get('key') or source.get('data', {}).get('key')
+    if key:
+        return f"zotero:{key}"
+    return f"zotero:{sha256_digest(json.dumps(source, sort_keys=True, default=str).encode('utf-8'))}"
+
+def _focus(title: str, interests: Optional[List[str]] = None) -> str:
+    """What an episode should focus on: its title and the listener's interests."""
+    return "\n".join([title, *(interests or [])])
 
 class Generator:
     def __init__(self):
@@ -16,39 +87,232 @@ class Generator:
         self.output_dir.mkdir(exist_ok=True)
         self.llm = LLMService()
         self.tts = TTSService()
+        self.post = AudioPostProcessor()
+        self.pdf = PDFService()
         self.file_handler = FileHandler()
     
+    def _load_pdf_source(self, source: Dict) -> Dict:
+        """Fill in text and metadata for a PDF source that only has a path."""
+        if 'text' in source and 'metadata' in source:
+            return source
+        document = self.pdf.parse(source['path'])
+        source.setdefault('text', document['text'])
+        source.setdefault('metadata', document['metadata'])
+        return source
+    
     def _extract_text_from_sources(self, sources: List[Dict]) -> str:
         """Extract text content from all sources."""
         texts = []
         for source in sources:
             if source.get('type') == 'pdf':
-                texts.append(source['text'])
+                texts.append(self._load_pdf_source(source)['text'])
             else:  # Zotero source
                 if 'abstractNote' in source['data']:
                     texts.append(source['data']['abstractNote'])
                 # TODO: Add support for full-text content from Zotero
         return "\n\n".join(texts)
         
-    def _generate_script(self, content: str, title: str, tone: str, duration_minutes: int, language: str) -> Dict:
-        """Generate a podcast script from the content."""
-        # TODO: Implement LLM-based script generation
-        # For now, return a simple template
+    def stream_script(
+        self,
+        sources: List[Dict],
+        title: str,
+        tone: str,
+        duration_minutes: int,
+        mode: str = "map_reduce",
+        on_summary: Optional[Callable[[str], None]] = None,
+        interests: Optional[List[str]] = None
+    ) -> Iterator[str]:
+        """Yield the script paragraph by paragraph as it is written.
+
+        Each paragraph is complete when yielded, so the next stage can
+        start on it while later ones are still being generated. Long
+        sources are cut down to what is most relevant to the title and
+        ``interests``.
+        """
+        if mode == "map_reduce":
+            yield from iter_paragraphs(self.llm.stream_script(
+                sources, tone, duration_minutes, on_summary=on_summary, focus=_focus(title, interests)
+            ))
+        else:
+            yield from iter_paragraphs([self._template_script(sources, title)])
+    
+    def _template_script(self, sources: List[Dict], title: str) -> str:
+        """Placeholder script built from the start of the sources."""
+        content = self._extract_text_from_sources(sources)
+        return f"Welcome to this episode about {title}.\n\nHere's what we found in our sources:\n\n{content[:500]}..."
+    
+    def _generate_script(
+        self,
+        sources: List[Dict],
+        title: str,
+        tone: str,
+        duration_minutes: int,
+        language: str,
+        mode: str = "map_reduce",
+        on_paragraph: Optional[Callable[[str], None]] = None,
+        interests: Optional[List[str]] = None
+    ) -> Dict:
+        """Generate a podcast script from the sources, passing each paragraph to ``on_paragraph``.
+
+        Falls back to the template script if the LLM produces nothing. In
+        "structured" mode the paragraphs arrive together with the chapters
+        and tags, which other modes leave empty.
+        """
+        summary = {}
+        structured = {}
+        paragraphs = []
+        try:
+            if mode == "structured":
+                structured = self.llm.generate_structured(sources, tone, duration_minutes, focus=_focus(title, interests))
+                summary["text"] = structured["summary"]
+                pieces = iter_paragraphs([structured["script"]])
+            else:
+                pieces = self.stream_script(
+                    sources, title, tone, duration_minutes, mode,
+                    on_summary=lambda text: summary.setdefault("text", text), interests=interests
+                )
+            for paragraph in pieces:
+                paragraphs.append(paragraph)
+                if on_paragraph:
+                    on_paragraph(paragraph)
+        except Exception as e:
+            # A half-written script is not worth recording
+            if paragraphs:
+                raise
+            print(f"Error generating script: {e}")
+        
+        if not paragraphs:
+            paragraphs = list(iter_paragraphs([self._template_script(sources, title)]))
+            for paragraph in paragraphs:
+                if on_paragraph:
+                    on_paragraph(paragraph)
         return {
             "title": title,
-            "summary": f"A {duration_minutes}-minute episode about {title}",
-            "script": f"Welcome to this episode about {title}.\n\nHere's what we found in our sources:\n\n{content[:500]}...",
+            "summary": summary.get("text") or f"A {duration_minutes}-minute episode about {title}",
+            "script": "\n\n".join(paragraphs),
+            "chapters": structured.get("chapters", []),
+            "tags": structured.get("tags", []),
             "language": language,
             "tone": tone
         }
         
-    def _generate_audio(self, script: Dict) -> str:
-        """Generate audio from the script."""
-        # TODO: Implement text-to-speech
-        # For now, create a dummy audio file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
-        temp_file.close()
-        return temp_file.name
+    def _finish_audio(self, pieces: List[bytes]) -> bytes:
+        """Post-process speech pieces into the episode's audio.
+
+        Without a codec for the engine's format (ffmpeg, for MP3) the
+        pieces are joined as they are.
+        """
+        if self.post.supports(self.tts.format):
+            return self.post.process(pieces, self.tts.format)
+        return self.tts.join(pieces)
+
+    def _generate_audio(self, script: Dict, slug: str, voice: str = "default") -> str:
+        """Synthesize the script and save it as ``<slug>`` in the TTS engine's format; errors propagate."""
+        pieces = self.tts.synthesize_pieces(script["script"], script["language"], voice)
+        audio_path = self.output_dir / f"{slug}.{self.tts.format}"
+        with open(audio_path, 'wb') as f:
+            f.write(self._finish_audio(pieces))
+        return str(audio_path)
+
+    def _generate_pipelined(
+        self,
+        sources: List[Dict],
+        title: str,
+        tone: str,
+        duration_minutes: int,
+        language: str,
+        mode: str,
+        on_paragraph: Optional[Callable[[str], None]],
+        interests: Optional[List[str]],
+        voice: str,
+        on_segment: Optional[Callable[[int, str], None]],
+        slug: str
+    ) -> Tuple[Dict, Optional[str], float, Optional[str]]:
+        """Write the script and synthesize it together, paragraph by paragraph.
+
+        Written paragraphs go through a bounded queue to speech threads,
+        which synthesize them while the LLM writes the next ones. Each is
+        saved, in script order, as a numbered audio segment whose path is
+        passed to ``on_segment(index, path)``, and the speech is then
+        post-processed into the episode's audio, saved as ``<slug>``.
+
+        If speech synthesis fails, the script is still written to the end.
+        Returns the script, the audio's path (None if it failed), when the
+        first segment was ready, as a ``time.perf_counter()`` value, and
+        the audio error, if any.
+        """
+        segment_dir = self.output_dir / f"{slug}_segments"
+        written: queue.Queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        finished: Dict[int, List[bytes]] = {}
+        segments: List[Path] = []
+        pieces: List[bytes] = []
+        state: Dict = {"written": 0}
+        lock = threading.Lock()
+
+        def save_finished():
+            """Save finished paragraphs that every earlier one has been saved before."""
+            while len(segments) in finished:
+                path = segment_dir / f"{len(segments):04d}.{self.tts.format}"
+                paragraph_pieces = finished.pop(len(segments))
+                path.write_bytes(self.tts.join(paragraph_pieces))
+                pieces.extend(paragraph_pieces)
+                segments.append(path)
+                state.setdefault("first_audio", time.perf_counter())
+                if on_segment:
+                    on_segment(len(segments) - 1, str(path))
+
+        def synthesize():
+            while True:
+                item = written.get()
+                if item is None:
+                    return
+                # After a failure, keep draining so the script stage never blocks
+                if "error" in state:
+                    continue
+                index, paragraph = item
+                try:
+                    audio = self.tts.synthesize_pieces(paragraph, language, voice)
+                    with lock:
+                        finished[index] = audio
+                        save_finished()
+                except Exception as e:
+                    state["error"] = e
+
+        def on_written(paragraph: str):
+            written.put((state["written"], paragraph))
+            state["written"] += 1
+            if on_paragraph:
+                on_paragraph(paragraph)
+
+        speakers = [
+            threading.Thread(target=synthesize, name=f"woohoo-pipeline-{i}", daemon=True)
+            for i in range(self.tts.workers)
+        ]
+        try:
+            # Removed however the script or speech stage ends
+            segment_dir.mkdir(parents=True, exist_ok=True)
+            for speaker in speakers:
+                speaker.start()
+            try:
+                script = self._generate_script(sources, title, tone, duration_minutes, language, mode, on_written, interests)
+            finally:
+                for _ in speakers:
+                    written.put(None)
+                for speaker in speakers:
+                    speaker.join()
+            first_audio = state.get("first_audio", time.perf_counter())
+            try:
+                if "error" in state:
+                    raise state["error"]
+                audio_path = self.output_dir / f"{slug}.{self.tts.format}"
+                with open(audio_path, 'wb') as f:
+                    f.write(self._finish_audio(pieces))
+            except Exception as e:
+                print(f"Error generating audio: {e}")
+                return script, None, first_audio, str(e)
+            return script, str(audio_path), first_audio, None
+        finally:
+            shutil.rmtree(segment_dir, ignore_errors=True)
         
     def generate_episode(
         self,
@@ -56,33 +320,162 @@ class Generator:
         title: str,
         tone: str = "professional",
         duration_minutes: int = 15,
-        language: str = "en"
+        language: str = "en",
+        on_progress: Optional[Callable[[float, str], None]] = None,
+        script_mode: str = "map_reduce",
+        on_paragraph: Optional[Callable[[str], None]] = None,
+        interests: Optional[List[str]] = None,
+        voice: str = "default",
+        pipelined: bool = False,
+        on_segment: Optional[Callable[[int, str], None]] = None
     ) -> Optional[Dict]:
-        """Generate a podcast episode from the given sources."""
+        """Generate a podcast episode from the given sources.
+
+        ``on_progress(fraction, message)`` is called as each stage starts.
+        ``script_mode`` is one of SCRIPT_MODES. ``on_paragraph(text)``
+        receives each script paragraph as soon as it is written. The
+        profile's ``interests`` steer which parts of long sources are used,
+        and its ``voice`` preference is part of each speech segment's
+        cache key.
+
+        With ``pipelined`` the audio is synthesized paragraph by paragraph
+        while the script is being written, and ``on_segment(index, path)``
+        receives each finished segment's audio file, playable right away. The
+        result's ``time_to_first_audio`` is the number of seconds until the
+        first audio was ready, in either mode.
+
+        If speech synthesis fails, the episode keeps its script and
+        transcript, with ``audio_path`` None and the reason in
+        ``audio_error``. Returns None if the episode can't be made at all.
+        """
+        _check_script_mode(script_mode)
         try:
-            # Extract content from sources
-            content = self._extract_text_from_sources(sources)
-            
-            # Generate script
-            script = self._generate_script(content, title, tone, duration_minutes, language)
-            
-            # Generate audio
-            audio_path = self._generate_audio(script)
-            
-            # Save transcript
-            transcript_path = self.output_dir / f"{title.lower().replace(' ', '_')}_transcript.txt"
-            with open(transcript_path, 'w') as f:
-                f.write(script['script'])
-            
-            return {
-                "title": script["title"],
-                "summary": script["summary"],
-                "audio_path": audio_path,
-                "transcript_path": str(transcript_path)
-            }
+            return self._build_episode(
+                sources, title, tone, duration_minutes, language, on_progress, script_mode, on_paragraph, interests, voice,
+                pipelined, on_segment
+            )
         except Exception as e:
             print(f"Error generating episode: {str(e)}")
             return None
+
+    def _build_episode(
+        self,
+        sources: List[Dict],
+        title: str,
+        tone: str = "professional",
+        duration_minutes: int = 15,
+        language: str = "en",
+        on_progress: Optional[Callable[[float, str], None]] = None,
+        script_mode: str = "map_reduce",
+        on_paragraph: Optional[Callable[[str], None]] = None,
+        interests: Optional[List[str]] = None,
+        voice: str = "default",
+        pipelined: bool = False,
+        on_segment: Optional[Callable[[int, str], None]] = None
+    ) -> Dict:
+        """Body of ``generate_episode``, for a checked ``script_mode``; errors propagate."""
+        report = on_progress or (lambda progress, message: None)
+        start = time.perf_counter()
+        slug = _episode_slug(title)
+
+        # Extract content from sources
+        report(0.05, "Reading sources")
+        for source in sources:
+            if source.get('type') == 'pdf':
+                self._load_pdf_source(source)
+        # The same paper added twice (PDF, Zotero item) would be paid for twice
+        sources = unique_sources(sources)
+        
+        if pipelined:
+            report(0.2, "Writing script and audio")
+            script, audio_path, first_audio, audio_error = self._generate_pipelined(
+                sources, title, tone, duration_minutes, language, script_mode, on_paragraph, interests, voice, on_segment, slug
+            )
+        else:
+            # Generate script
+            report(0.2, "Writing script")
+            script = self._generate_script(sources, title, tone, duration_minutes, language, script_mode, on_paragraph, interests)
+
+            # Generate audio
+            report(0.7, "Generating audio")
+            audio_path, audio_error = None, None
+            try:
+                audio_path = self._generate_audio(script, slug, voice)
+            except Exception as e:
+                print(f"Error generating audio: {e}")
+                audio_error = str(e)
+            first_audio = time.perf_counter()
+        
+        # Save transcript
+        transcript_path = self.output_dir / f"{slug}_transcript.txt"
+        with open(transcript_path, 'w') as f:
+            f.write(script['script'])
+        
+        return {
+            "title": script["title"],
+            "summary": script["summary"],
+            "chapters": script["chapters"],
+            "tags": list(dict.fromkeys(script["tags"] + self._extract_tags(sources))),
+            "audio_path": audio_path,
+            "audio_error": audio_error,
+            "transcript_path": str(transcript_path),
+            "time_to_first_audio": first_audio - start
+        }
+
+    def generate_batch(self, specs: List[Dict], max_workers: int = DEFAULT_BATCH_WORKERS) -> Iterator[Dict]:
+        """Generate many episodes, yielding each result as soon as it is finished.
+
+        Each spec holds ``generate_episode`` keyword arguments, ``sources``
+        and ``title`` at least. Sources shared by several specs are
+        extracted once, then the episodes run on ``max_workers`` threads,
+        which share the LLM concurrency limit; a chunk summary needed by
+        several episodes is requested once and shared or cached. Callbacks
+        in a spec are called from those threads.
+
+        Yields ``{"index", "title", "episode", "error"}`` in completion
+        order, ``index`` being the spec's position. A failed episode has
+        ``episode`` None and the error message; the batch carries on.
+        """
+        shared: Dict[str, Dict] = {}
+        batch = []
+        for spec in specs:
+            keys = [_source_key(source) for source in spec.get('sources', [])]
+            sources = [shared.setdefault(key, source) for key, source in zip(keys, spec.get('sources', []))]
+            batch.append(({**spec, 'sources': sources}, keys))
+
+        pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="woohoo-batch")
+        try:
+            # Extract every unique PDF once, in parallel
+            failed: Dict[str, str] = {}
+            loads = {
+                pool.submit(self._load_pdf_source, source): key
+                for key, source in shared.items() if source.get('type') == 'pdf'
+            }
+            for future in as_completed(loads):
+                if future.exception() is not None:
+                    failed[loads[future]] = f"Could not read source: {future.exception()}"
+
+            futures = {}
+            for index, (spec, keys) in enumerate(batch):
+                errors = [failed[key] for key in keys if key in failed]
+                try:
+                    _check_script_mode(spec.get('script_mode', "map_reduce"))
+                except ValueError as e:
+                    errors.append(str(e))
+                if errors:
+                    yield {"index": index, "title": spec.get('title'), "episode": None, "error": errors[0]}
+                else:
+                    futures[pool.submit(self._build_episode, **spec)] = index
+
+            for future in as_completed(futures):
+                index = futures[future]
+                spec, _ = batch[index]
+                try:
+                    yield {"index": index, "title": spec.get('title'), "episode": future.result(), "error": None}
+                except Exception as e:
+                    yield {"index": index, "title": spec.get('title'), "episode": None, "error": str(e)}
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
     
     def _extract_tags(self, sources: List[Dict]) -> List[str]:
         """Extract unique tags from sources."""
@@ -98,13 +491,15 @@ class Generator:
                 tags.update(source.get("tags", []))
         return list(tags)
     
-    def _format_source_for_llm(self, source: Dict) -> str:
-        """Format a source for LLM input."""
+    def _format_source_for_llm(self, source: Dict, max_tokens: int = DEFAULT_SOURCE_TOKENS) -> str:
+        """Format a source for LLM input, its useful sections fitted to ``max_tokens``."""
         if source.get('type') == 'pdf':
+            source = self._load_pdf_source(source)
+            content, = plan_sources([source], max_tokens)
             return f"""Source:
 Title: {source['metadata'].get('title', 'Unknown')}
 Author: {source['metadata'].get('author', 'Unknown')}
-Content: {source['text'][:2000]}...  # Truncate long PDFs
+Content: {content}
 """
         else:
             # Handle Zotero sources
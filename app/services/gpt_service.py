@@ -1,79 +1,556 @@
-import ollama
-from typing import List, Dict
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import AsyncIterator, Callable, List, Dict, Iterator, Optional, Tuple, Union
+import asyncio
 import os
+import threading
+
+from app.services.async_llm import DEFAULT_CONCURRENCY, DEFAULT_HOST, DEFAULT_TIMEOUT, AsyncLLM, iterate_sync
+from app.services.model_registry import DEFAULT_KEEP_ALIVE, get_model_registry
+from app.utils.budget_planner import (
+    CONTEXT_TOKENS, LOW_VALUE_SECTIONS, READ_TOKENS_PER_MINUTE, SCRIPT_TOKENS_PER_MINUTE, plan_sources, source_budget
+)
+from app.utils.chunking import chunk_sections, estimate_tokens
+from app.utils.dedup import dedupe_chunks
+from app.utils.embeddings import select_chunks
+from app.utils.llm_cache import LLMCache, get_llm_cache, llm_cache_key
+from app.utils.structured_output import EPISODE_SCHEMA, MAX_TAGS, parse_episode
+
+DEFAULT_MODEL = 'claude'
+
+# Token budgets for each map-reduce stage: chunk size sent to the map
+# stage, length of each chunk summary, and the most summary text merged
+# in one reduce call. The script budget follows the target duration.
+CHUNK_TOKENS = 1500
+SUMMARY_TOKENS = 300
+REDUCE_TOKENS = 6000
+
+# Output tokens a structured reply needs beyond the script: summary,
+# chapter titles, tags and JSON syntax
+STRUCTURED_EXTRA_TOKENS = 400
+
+# Documents whose map-stage chunks are kept in memory, so a source shared
+# by several episodes of a batch is chunked once
+CHUNK_MEMO_SIZE = 16
+
+# Skip cache lookups (fresh responses are still stored)
+BYPASS_CACHE = os.getenv("WOOHOO_LLM_CACHE_BYPASS", "0") == "1"
+
+SCRIPT_SYSTEM_PROMPT = 'You are an expert at creating engaging podcast scripts from academic sources.'
+
+def _authors(source: Dict) -> str:
+    """Format the creators of a Zotero item."""
+    return ', '.join([author.get('firstName', '') + ' ' + author.get('lastName', '') for author in source['data'].get('creators', [])])
+
+def _style_guidelines(tone: str, duration_minutes: int) -> str:
+    return f"""Style guidelines:
+- Tone: {tone}
+- Target duration: {duration_minutes} minutes
+- Format: Include introduction, main discussion, and conclusion
+- Make complex topics accessible while maintaining academic integrity
+- Use conversational language and clear transitions
+- Include brief source citations when discussing specific findings"""
+
+@lru_cache(maxsize=CHUNK_MEMO_SIZE)
+def _chunk_texts(text: str, chunk_tokens: int) -> Tuple[str, ...]:
+    """Split a document into map-stage chunks, leaving out low-value sections."""
+    return tuple(chunk['text'] for chunk in chunk_sections(text, chunk_tokens, skip_types=LOW_VALUE_SECTIONS))
 
 class LLMService:
-    def __init__(self):
-        """Initialize Ollama client for Claude."""
-        # Ensure Claude model is pulled
+    def __init__(
+        self,
+        model: str = DEFAULT_MODEL,
+        host: Optional[str] = DEFAULT_HOST,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        timeout: float = DEFAULT_TIMEOUT,
+        cache: Optional[LLMCache] = None,
+        bypass_cache: bool = BYPASS_CACHE,
+        keep_alive: Union[str, float] = DEFAULT_KEEP_ALIVE,
+        context_tokens: int = CONTEXT_TOKENS
+    ):
+        """Initialize Ollama client for Claude.
+
+        Requests go through an asyncio client that runs up to
+        ``concurrency`` of them at once; the synchronous methods wrap the
+        ``a``-prefixed coroutines. Responses are cached on disk; with
+        ``bypass_cache`` every request goes to the model and refreshes
+        its cache entry. ``keep_alive`` keeps the model loaded between
+        episodes. Every request runs with a ``context_tokens`` window and
+        prompts are planned to fit it.
+        """
+        self.model = model
+        self.context_tokens = context_tokens
+        self.client = AsyncLLM(model, host=host, concurrency=concurrency, timeout=timeout, keep_alive=keep_alive)
+        self.cache = cache or get_llm_cache()
+        self.bypass_cache = bypass_cache
+        # Requests being sent, so identical ones from other episodes wait for the same reply
+        self._in_flight: Dict[str, Future] = {}
+        self._in_flight_lock = threading.Lock()
+        # Checked against the server once per process and TTL, pulled only if missing
+        self.registry = get_model_registry(host)
+        self.registry.ensure(self.model)
+
+    def _options(self, max_tokens: Optional[int] = None) -> Dict:
+        """Request options: the same context window for every call, so the model is never reloaded."""
+        options = {'num_ctx': self.context_tokens}
+        if max_tokens:
+            options['num_predict'] = max_tokens
+        return options
+
+    async def _achat(self, system: str, prompt: str, max_tokens: Optional[int] = None, format: Optional[Dict] = None) -> str:
+        """Send one system/user exchange and return the reply; ``max_tokens`` caps its length.
+
+        ``format`` is a JSON schema the reply must follow. Every LLM call
+        goes through here, so every call is cached, and an identical call
+        already in flight, from any thread, is shared.
+        """
+        options = self._options(max_tokens)
+        key = llm_cache_key(self.model, system, prompt, {**options, 'format': format} if format else options)
+        if not self.bypass_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        with self._in_flight_lock:
+            pending = self._in_flight.get(key)
+            if pending is None:
+                self._in_flight[key] = owned = Future()
+        if pending is not None:
+            # Shielded so a cancelled waiter doesn't cancel the shared reply
+            return await asyncio.shield(asyncio.wrap_future(pending))
+
         try:
-            ollama.pull('claude')
-        except Exception as e:
-            print(f"Warning: Could not pull Claude model: {e}")
-    
+            reply = await self.client.chat([
+                {
+                    'role': 'system',
+                    'content': system
+                },
+                {
+                    'role': 'user',
+                    'content': prompt
+                }
+            ], options=options, format=format)
+            if reply:
+                self.cache.put(key, reply)
+            owned.set_result(reply)
+            return reply
+        except BaseException as e:
+            owned.set_exception(e)
+            raise
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
+
+    def _chat(self, system: str, prompt: str, max_tokens: Optional[int] = None, format: Optional[Dict] = None) -> str:
+        """Blocking form of ``_achat``."""
+        return asyncio.run(self._achat(system, prompt, max_tokens, format))
+
     def generate_script(self, sources: List[Dict], tone: str, duration_minutes: int) -> str:
-        """Generate a podcast script from the provided sources."""
+        """Generate a podcast script from the provided sources.
+
+        The sources share whatever the context window leaves after the
+        prompt and the script, in proportion to the target duration.
+        """
+        # Measure the prompt without source material, then fill the rest
+        overhead = estimate_tokens(SCRIPT_SYSTEM_PROMPT + self._single_pass_prompt(sources, [''] * len(sources), tone, duration_minutes))
+        contents = plan_sources(sources, source_budget(duration_minutes, overhead, self.context_tokens))
+        prompt = self._single_pass_prompt(sources, contents, tone, duration_minutes)
+
+        try:
+            return self._chat(SCRIPT_SYSTEM_PROMPT, prompt, duration_minutes * SCRIPT_TOKENS_PER_MINUTE)
+        except Exception as e:
+            print(f"Error generating script: {e}")
+            return ""
+
+    def _single_pass_prompt(self, sources: List[Dict], contents: List[str], tone: str, duration_minutes: int) -> str:
         # Format each source
         source_texts = []
-        for source in sources:
+        for source, content in zip(sources, contents):
             if source.get('type') == 'pdf':
                 source_text = f"""PDF Source:
 Title: {source['metadata'].get('title', 'Unknown')}
 Author: {source['metadata'].get('author', 'Unknown')}
-Content: {source['text'][:2000]}...
+Content: {content}
 """
             else:
                 source_text = f"""Zotero Source:
 Title: {source['data'].get('title', 'Untitled')}
-Authors: {', '.join([author.get('firstName', '') + ' ' + author.get('lastName', '') for author in source['data'].get('creators', [])])}
-Abstract: {source['data'].get('abstractNote', '')}
+Authors: {_authors(source)}
+Abstract: {content}
 """
             source_texts.append(source_text)
-        
-        prompt = f"""Create an engaging podcast script based on these sources:
+        sources_block = '\n\n'.join(source_texts)
 
-{'\n\n'.join(source_texts)}
+        return f"""Create an engaging podcast script based on these sources:
 
-Style guidelines:
-- Tone: {tone}
-- Target duration: {duration_minutes} minutes
-- Format: Include introduction, main discussion, and conclusion
-- Make complex topics accessible while maintaining academic integrity
-- Use conversational language and clear transitions
-- Include brief source citations when discussing specific findings
+{sources_block}
+
+{_style_guidelines(tone, duration_minutes)}
 
 Please structure the output as a complete podcast script."""
 
+    def generate_script_map_reduce(
+        self,
+        sources: List[Dict],
+        tone: str,
+        duration_minutes: int,
+        chunk_tokens: int = CHUNK_TOKENS,
+        summary_tokens: int = SUMMARY_TOKENS,
+        reduce_tokens: int = REDUCE_TOKENS,
+        focus: str = ""
+    ) -> str:
+        """Generate a podcast script that covers every source in full.
+
+        Sources are split into section-aligned chunks of ``chunk_tokens``,
+        the chunks are summarized concurrently (map), the summaries are
+        merged until they fit ``reduce_tokens`` (reduce), and the script is
+        written from the merged notes. Every prompt stays within its stage
+        budget however long the documents are. With a ``focus``, such as
+        the episode title and the listener's interests, long sources are
+        cut down to the chunks most relevant to it before the map stage.
+        """
+        script, _ = self.generate_script_and_summary(
+            sources, tone, duration_minutes, chunk_tokens, summary_tokens, reduce_tokens, with_summary=False, focus=focus
+        )
+        return script
+
+    def generate_script_and_summary(
+        self,
+        sources: List[Dict],
+        tone: str,
+        duration_minutes: int,
+        chunk_tokens: int = CHUNK_TOKENS,
+        summary_tokens: int = SUMMARY_TOKENS,
+        reduce_tokens: int = REDUCE_TOKENS,
+        with_summary: bool = True,
+        focus: str = ""
+    ) -> Tuple[str, str]:
+        """Blocking form of ``agenerate_script_and_summary``."""
+        return asyncio.run(self.agenerate_script_and_summary(
+            sources, tone, duration_minutes, chunk_tokens, summary_tokens, reduce_tokens, with_summary, focus
+        ))
+
+    async def agenerate_script_and_summary(
+        self,
+        sources: List[Dict],
+        tone: str,
+        duration_minutes: int,
+        chunk_tokens: int = CHUNK_TOKENS,
+        summary_tokens: int = SUMMARY_TOKENS,
+        reduce_tokens: int = REDUCE_TOKENS,
+        with_summary: bool = True,
+        focus: str = ""
+    ) -> Tuple[str, str]:
+        """Map-reduce the sources, then write the script and the episode summary in parallel.
+
+        Both are written from the merged notes, so neither waits for the
+        other. Returns ("", "") if nothing could be generated.
+        """
         try:
-            response = ollama.chat(model='claude', messages=[
-                {
-                    'role': 'system',
-                    'content': 'You are an expert at creating engaging podcast scripts from academic sources.'
-                },
-                {
-                    'role': 'user',
-                    'content': prompt
-                }
-            ])
-            return response['message']['content']
+            budget = self._notes_budget(self._script_prompt([], tone, duration_minutes), duration_minutes, reduce_tokens, summary_tokens)
+            notes = await self._notes(sources, chunk_tokens, summary_tokens, budget, focus, duration_minutes * READ_TOKENS_PER_MINUTE)
+            if not notes:
+                return "", ""
+            script = self._achat(SCRIPT_SYSTEM_PROMPT, self._script_prompt(notes, tone, duration_minutes), duration_minutes * SCRIPT_TOKENS_PER_MINUTE)
+            if not with_summary:
+                return await script, ""
+            script, summary = await asyncio.gather(script, self._asummarize_notes(notes), return_exceptions=True)
+            if isinstance(script, Exception):
+                raise script
+            if isinstance(summary, Exception):
+                print(f"Error generating summary: {summary}")
+                summary = ""
+            return script, summary
         except Exception as e:
             print(f"Error generating script: {e}")
-            return ""
-    
+            return "", ""
+
+    def stream_script(
+        self,
+        sources: List[Dict],
+        tone: str,
+        duration_minutes: int,
+        on_summary: Optional[Callable[[str], None]] = None,
+        chunk_tokens: int = CHUNK_TOKENS,
+        summary_tokens: int = SUMMARY_TOKENS,
+        reduce_tokens: int = REDUCE_TOKENS,
+        focus: str = ""
+    ) -> Iterator[str]:
+        """Blocking form of ``astream_script``: iterate over script text as it arrives."""
+        return iterate_sync(lambda: self.astream_script(
+            sources, tone, duration_minutes, on_summary, chunk_tokens, summary_tokens, reduce_tokens, focus
+        ))
+
+    async def astream_script(
+        self,
+        sources: List[Dict],
+        tone: str,
+        duration_minutes: int,
+        on_summary: Optional[Callable[[str], None]] = None,
+        chunk_tokens: int = CHUNK_TOKENS,
+        summary_tokens: int = SUMMARY_TOKENS,
+        reduce_tokens: int = REDUCE_TOKENS,
+        focus: str = ""
+    ) -> AsyncIterator[str]:
+        """Map-reduce the sources like ``agenerate_script_and_summary``, then stream the script.
+
+        Script text is yielded piece by piece as the model writes it. If
+        ``on_summary`` is given, the episode summary is written alongside
+        and passed to it once the script is finished. Errors propagate.
+        """
+        budget = self._notes_budget(self._script_prompt([], tone, duration_minutes), duration_minutes, reduce_tokens, summary_tokens)
+        notes = await self._notes(sources, chunk_tokens, summary_tokens, budget, focus, duration_minutes * READ_TOKENS_PER_MINUTE)
+        if not notes:
+            return
+        summary = asyncio.ensure_future(self._asummarize_notes(notes)) if on_summary else None
+        try:
+            async for piece in self._astream(SCRIPT_SYSTEM_PROMPT, self._script_prompt(notes, tone, duration_minutes), duration_minutes * SCRIPT_TOKENS_PER_MINUTE):
+                yield piece
+        except BaseException:
+            if summary:
+                summary.cancel()
+            raise
+        if summary:
+            try:
+                on_summary(await summary)
+            except Exception as e:
+                print(f"Error generating summary: {e}")
+                on_summary("")
+
+    def generate_structured(
+        self,
+        sources: List[Dict],
+        tone: str,
+        duration_minutes: int,
+        chunk_tokens: int = CHUNK_TOKENS,
+        summary_tokens: int = SUMMARY_TOKENS,
+        reduce_tokens: int = REDUCE_TOKENS,
+        focus: str = ""
+    ) -> Dict:
+        """Blocking form of ``agenerate_structured``."""
+        return asyncio.run(self.agenerate_structured(
+            sources, tone, duration_minutes, chunk_tokens, summary_tokens, reduce_tokens, focus
+        ))
+
+    async def agenerate_structured(
+        self,
+        sources: List[Dict],
+        tone: str,
+        duration_minutes: int,
+        chunk_tokens: int = CHUNK_TOKENS,
+        summary_tokens: int = SUMMARY_TOKENS,
+        reduce_tokens: int = REDUCE_TOKENS,
+        focus: str = ""
+    ) -> Dict:
+        """Map-reduce the sources, then write the script, summary, chapters and tags in one call.
+
+        The reply is requested as JSON following EPISODE_SCHEMA and read by
+        ``parse_episode``, which falls back to plain text. Returns a dict
+        with ``script``, ``summary``, ``chapters`` and ``tags``; errors
+        propagate.
+        """
+        budget = self._notes_budget(
+            self._structured_prompt([], tone, duration_minutes), duration_minutes,
+            reduce_tokens, summary_tokens, STRUCTURED_EXTRA_TOKENS
+        )
+        notes = await self._notes(sources, chunk_tokens, summary_tokens, budget, focus, duration_minutes * READ_TOKENS_PER_MINUTE)
+        if not notes:
+            raise ValueError("No source material to write from")
+        reply = await self._achat(
+            SCRIPT_SYSTEM_PROMPT,
+            self._structured_prompt(notes, tone, duration_minutes),
+            duration_minutes * SCRIPT_TOKENS_PER_MINUTE + STRUCTURED_EXTRA_TOKENS,
+            format=EPISODE_SCHEMA
+        )
+        return parse_episode(reply)
+
+    async def _astream(self, system: str, prompt: str, max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """Streaming form of ``_achat``, sharing its cache; a cached reply arrives in one piece."""
+        options = self._options(max_tokens)
+        key = llm_cache_key(self.model, system, prompt, options)
+        if not self.bypass_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+        
+        pieces = []
+        async for piece in self.client.stream([
+            {
+                'role': 'system',
+                'content': system
+            },
+            {
+                'role': 'user',
+                'content': prompt
+            }
+        ], options=options):
+            pieces.append(piece)
+            yield piece
+        reply = "".join(pieces)
+        if reply:
+            self.cache.put(key, reply)
+
+    async def _notes(
+        self,
+        sources: List[Dict],
+        chunk_tokens: int,
+        summary_tokens: int,
+        reduce_tokens: int,
+        focus: str = "",
+        read_tokens: Optional[int] = None
+    ) -> List[str]:
+        """Map and reduce the sources into notes that fit ``reduce_tokens``.
+
+        With a ``focus``, the map stage reads at most ``read_tokens`` of
+        the chunks most relevant to it.
+        """
+        notes = await self._map_summaries(sources, chunk_tokens, summary_tokens, focus, read_tokens)
+        if not notes:
+            return []
+        return await self._reduce_summaries(notes, reduce_tokens, summary_tokens)
+
+    def _notes_budget(
+        self,
+        empty_prompt: str,
+        duration_minutes: int,
+        reduce_tokens: int,
+        summary_tokens: int,
+        extra_tokens: int = 0
+    ) -> int:
+        """Cap ``reduce_tokens`` so the final prompt and its reply fit the context window.
+
+        ``empty_prompt`` is that prompt without notes; ``extra_tokens`` is
+        what the reply holds beyond the script.
+        """
+        overhead = estimate_tokens(SCRIPT_SYSTEM_PROMPT + empty_prompt) + extra_tokens
+        return max(summary_tokens, min(reduce_tokens, source_budget(duration_minutes, overhead, self.context_tokens)))
+
+    def _script_prompt(self, notes: List[str], tone: str, duration_minutes: int) -> str:
+        return f"""Create an engaging podcast script from these research notes, which cover the sources in full:
+
+{self._join(notes)}
+
+{_style_guidelines(tone, duration_minutes)}
+
+Please structure the output as a complete podcast script, with a blank line between paragraphs."""
+
+    def _structured_prompt(self, notes: List[str], tone: str, duration_minutes: int) -> str:
+        return f"""Create an engaging podcast episode from these research notes, which cover the sources in full:
+
+{self._join(notes)}
+
+{_style_guidelines(tone, duration_minutes)}
+
+Reply with a JSON object with these fields:
+- "script": the complete podcast script, with a blank line between paragraphs
+- "summary": a brief, engaging summary of the episode
+- "chapters": the titles of the episode's main segments, in order
+- "tags": up to {MAX_TAGS} short topic tags"""
+
+    async def _asummarize_notes(self, notes: List[str]) -> str:
+        """Summarize the episode the notes will become."""
+        return await self._achat(
+            'Create a brief, engaging summary of the podcast episode these research notes will become.',
+            self._join(notes)
+        )
+
+    async def _map_summaries(
+        self,
+        sources: List[Dict],
+        chunk_tokens: int,
+        summary_tokens: int,
+        focus: str = "",
+        read_tokens: Optional[int] = None
+    ) -> List[str]:
+        """Summarize the chunks of every source concurrently, in source order.
+
+        Chunks that nearly duplicate an earlier one, such as the same
+        paper added twice, are summarized once. Every other chunk is
+        summarized unless a ``focus`` and ``read_tokens`` are given; then
+        only the chunks most relevant to the focus are, within that budget.
+        """
+        titles, chunks_per_source = [], []
+        for source in sources:
+            if source.get('type') == 'pdf':
+                titles.append(source['metadata'].get('title', 'Unknown'))
+                chunks_per_source.append(_chunk_texts(source.get('text', ''), chunk_tokens))
+            else:
+                abstract = source['data'].get('abstractNote', '')
+                titles.append(source['data'].get('title', 'Untitled'))
+                chunks_per_source.append((f"Authors: {_authors(source)}\nAbstract: {abstract}",) if abstract else ())
+        # Hashing and embedding are CPU work; keep them off the event loop
+        chunks_per_source = await asyncio.to_thread(self._pick_chunks, chunks_per_source, focus, read_tokens)
+        tasks = [(title, chunk) for title, chunks in zip(titles, chunks_per_source) for chunk in chunks]
+
+        async def summarize(title: str, text: str) -> str:
+            try:
+                return await self.asummarize_chunk(title, text, summary_tokens)
+            except Exception as e:
+                print(f"Warning: Could not summarize a chunk of {title}: {e}")
+                return ""
+
+        summaries = await asyncio.gather(*(summarize(title, text) for title, text in tasks))
+        return [summary for summary in summaries if summary]
+
+    def _pick_chunks(self, chunks_per_source: List[Tuple[str, ...]], focus: str, read_tokens: Optional[int]) -> List[List[str]]:
+        if len(chunks_per_source) > 1:
+            chunks_per_source = dedupe_chunks(chunks_per_source)
+        if focus and read_tokens:
+            kept = select_chunks(chunks_per_source, focus, read_tokens)
+            chunks_per_source = [[chunks[i] for i in indices] for chunks, indices in zip(chunks_per_source, kept)]
+        return list(chunks_per_source)
+
+    async def _reduce_summaries(self, notes: List[str], reduce_tokens: int, summary_tokens: int) -> List[str]:
+        """Merge groups of notes concurrently until all of them fit in ``reduce_tokens``."""
+        while estimate_tokens(self._join(notes)) > reduce_tokens and len(notes) > 1:
+            groups, current = [], []
+            for note in notes:
+                if current and estimate_tokens(self._join(current + [note])) > reduce_tokens:
+                    groups.append(current)
+                    current = []
+                current.append(note)
+            groups.append(current)
+            if len(groups) == len(notes):
+                # Every note fills the budget alone; pair them up to make progress
+                groups = [notes[i:i + 2] for i in range(0, len(notes), 2)]
+
+            notes = await asyncio.gather(*(self.amerge_summaries(group, summary_tokens) for group in groups))
+        return list(notes)
+
+    def _join(self, notes: List[str]) -> str:
+        return "\n\n".join(notes)
+
+    async def asummarize_chunk(self, title: str, text: str, max_tokens: int = SUMMARY_TOKENS) -> str:
+        """Summarize one chunk of a source as notes for a podcast script."""
+        summary = await self._achat(
+            'You summarize excerpts of academic sources into concise, factual notes for a podcast writer.',
+            f"""Summarize this excerpt from "{title}" in at most {max_tokens * 3 // 4} words.
+Keep key findings, methods, numbers and claims, and mention the source title.
+
+{text}""",
+            max_tokens
+        )
+        return f"[{title}] {summary.strip()}"
+
+    async def amerge_summaries(self, notes: List[str], max_tokens: int = SUMMARY_TOKENS) -> str:
+        """Merge several notes into one, keeping source attributions."""
+        if len(notes) == 1:
+            return notes[0]
+        merged = await self._achat(
+            'You merge research notes for a podcast writer without losing key findings.',
+            f"""Merge these notes into one set of notes of at most {max_tokens * 3 // 4} words.
+Keep the source titles in square brackets next to the findings they support.
+
+{self._join(notes)}""",
+            max_tokens
+        )
+        return merged.strip()
+
     def generate_summary(self, script: str) -> str:
         """Generate a brief summary of the podcast script."""
         try:
-            response = ollama.chat(model='claude', messages=[
-                {
-                    'role': 'system',
-                    'content': 'Create a brief, engaging summary of this podcast script.'
-                },
-                {
-                    'role': 'user',
-                    'content': script
-                }
-            ])
-            return response['message']['content']
+            return self._chat('Create a brief, engaging summary of this podcast script.', script)
         except Exception as e:
             print(f"Error generating summary: {e}")
-            return "" 
\ No newline at end of file
+            return ""
@@ -0,0 +1,81 @@
+"""
+Handlers for background jobs, run inside job worker processes.
+"""
+from typing import Callable, Dict
+
+from app.services.job_queue import register
+
+# Spoken words per minute, to estimate how far along a script is
+WORDS_PER_MINUTE = 150
+
+@register("extract_pdf")
+def extract_pdf(payload: Dict, report_progress: Callable) -> Dict:
+    """Parse a PDF on disk into the extraction cache; return its metadata."""
+    from app.services.pdf_service import PDFService
+    report_progress(0.1, "Extracting text")
+    document = PDFService().parse(payload["path"])
+    return {"metadata": document["metadata"], "num_pages": document["num_pages"]}
+
+@register("generate_episode")
+def generate_episode(payload: Dict, report_progress: Callable) -> Dict:
+    """Generate an episode; ``payload`` holds Generator.generate_episode arguments.
+
+    The job's partial output is ``{"script", "segments"}``: the script
+    written so far and, in pipelined mode, the paths of the audio
+    segments finished so far, in order.
+    """
+    from app.services.generator import Generator
+    paragraphs = []
+    segments = []
+    progress = {"fraction": 0.2, "message": "Writing script"}
+    expected_words = payload.get("duration_minutes", 15) * WORDS_PER_MINUTE
+
+    def publish():
+        partial = {"script": "\n\n".join(paragraphs), "segments": list(segments)}
+        report_progress(progress["fraction"], progress["message"], partial=partial)
+
+    def on_paragraph(paragraph: str):
+        paragraphs.append(paragraph)
+        words = sum(len(text.split()) for text in paragraphs)
+        progress["fraction"] = 0.2 + 0.5 * min(1.0, words / expected_words)
+        publish()
+
+    def on_segment(index: int, path: str):
+        segments.append(path)
+        progress["message"] = f"Writing script, {len(segments)} audio segments ready"
+        publish()
+
+    result = Generator().generate_episode(
+        on_progress=report_progress, on_paragraph=on_paragraph, on_segment=on_segment, **payload
+    )
+    if result is None:
+        raise RuntimeError("Failed to generate episode")
+    return result
+
+@register("generate_batch")
+def generate_batch(payload: Dict, report_progress: Callable) -> Dict:
+    """Generate a batch of episodes; ``payload`` holds Generator.generate_batch arguments.
+
+    Finished episodes are counted as they complete; failed ones are
+    returned with their error rather than failing the job.
+    """
+    from app.services.generator import Generator
+    specs = payload["specs"]
+    results = []
+    report_progress(0.05, "Reading sources")
+    for result in Generator().generate_batch(**payload):
+        results.append(result)
+        report_progress(0.1 + 0.9 * len(results) / len(specs), f"{len(results)} of {len(specs)} episodes done")
+    return {"episodes": sorted(results, key=lambda result: result["index"])}
+
+@register("zotero_items")
+def zotero_items(payload: Dict, report_progress: Callable) -> Dict:
+    """Fetch the items of a Zotero collection and index their abstracts."""
+    from app.services.zotero_service import ZoteroService
+    from app.utils.search_index import get_search_index
+    report_progress(0.1, "Fetching Zotero items")
+    service = ZoteroService(library_id=payload["library_id"], api_key=payload["api_key"])
+    items = service.get_items_in_collection(payload["collection_key"])
+    report_progress(0.8, "Indexing Zotero items")
+    get_search_index().add_zotero_items(items)
+    return {"items": items}
@@ -0,0 +1,315 @@
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import atexit
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+
+DEFAULT_DB_PATH = "data/jobs.sqlite3"
+
+# Workers refresh their heartbeat this often, from a background thread
+# while a job runs; a worker silent for STALE_AFTER seconds is hung or
+# dead, and its running job is requeued.
+HEARTBEAT_SECONDS = 2.0
+STALE_AFTER = 30.0
+POLL_SECONDS = 0.5
+
+DEFAULT_WORKERS = int(os.getenv("WOOHOO_JOB_WORKERS", 2))
+
+# Job kind -> handler(payload, report_progress) returning a JSON-serializable
+# result; report_progress(fraction, message, partial=None) may also publish
+# JSON-serializable partial output, such as the script written so far
+HANDLERS: Dict[str, Callable] = {}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT NOT NULL DEFAULT '',
+    partial TEXT,
+    result TEXT,
+    error TEXT,
+    worker_id TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+CREATE TABLE IF NOT EXISTS workers (
+    id TEXT PRIMARY KEY,
+    pid INTEGER NOT NULL,
+    heartbeat REAL NOT NULL
+);
+"""
+
+def register(kind: str):
+    """Register a function as the handler for a job kind."""
+    def decorator(handler: Callable) -> Callable:
+        HANDLERS[kind] = handler
+        return handler
+    return decorator
+
+class JobQueue:
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        """Initialize a persistent job queue backed by SQLite.
+
+        The database is shared by every session and worker process, so jobs
+        survive Streamlit reruns and server restarts.
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "partial" not in columns:
+                # Databases created before partial results existed
+                conn.execute("ALTER TABLE jobs ADD COLUMN partial TEXT")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open an autocommit connection; transactions are explicit."""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def submit(self, kind: str, payload: Dict) -> str:
+        """Queue a job and return its ID."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, payload, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, 'queued', ?, ?)",
+                (job_id, kind, json.dumps(payload), now, now)
+            )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return a job's status, progress and result, or None if unknown."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job.pop("payload")
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        job["partial"] = json.loads(job["partial"]) if job["partial"] else None
+        return job
+
+    def claim(self, worker_id: str) -> Optional[Dict]:
+        """Atomically take the oldest queued job for a worker."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id, kind, payload FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', worker_id = ?, updated_at = ? WHERE id = ?",
+                (worker_id, time.time(), row["id"])
+            )
+            conn.execute("COMMIT")
+        return {"id": row["id"], "kind": row["kind"], "payload": json.loads(row["payload"])}
+
+    def set_progress(self, job_id: str, progress: float, message: str = "", partial=None):
+        """Record a running job's progress (0 to 1), status message and, optionally, partial output."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET progress = ?, message = ?, partial = COALESCE(?, partial), updated_at = ? WHERE id = ?",
+                (max(0.0, min(1.0, progress)), message, None if partial is None else json.dumps(partial), time.time(), job_id)
+            )
+
+    def complete(self, job_id: str, result, worker_id: Optional[str] = None):
+        """Mark a job done and store its result; the payload is dropped.
+
+        With a ``worker_id``, only while that worker still holds the job.
+        """
+        self._finish(job_id, "done", worker_id, result=json.dumps(result))
+
+    def fail(self, job_id: str, error: str, worker_id: Optional[str] = None):
+        """Mark a job failed with an error message; the payload is dropped.
+
+        With a ``worker_id``, only while that worker still holds the job.
+        """
+        self._finish(job_id, "failed", worker_id, error=error)
+
+    def _finish(self, job_id: str, status: str, worker_id: Optional[str] = None,
+                result: Optional[str] = None, error: Optional[str] = None):
+        # Payloads can carry credentials (e.g. Zotero API keys), so they are
+        # not kept once a job has finished.
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, payload = '{}', "
+                "progress = CASE WHEN ? = 'done' THEN 1 ELSE progress END, updated_at = ? "
+                "WHERE id = ? AND (? IS NULL OR worker_id = ?)",
+                (status, result, error, status, time.time(), job_id, worker_id, worker_id)
+            )
+
+    def heartbeat(self, worker_id: str):
+        """Record that a worker is alive."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO workers (id, pid, heartbeat) VALUES (?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET heartbeat = excluded.heartbeat",
+                (worker_id, os.getpid(), time.time())
+            )
+
+    def remove_worker(self, worker_id: str):
+        """Forget a worker that is shutting down."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM workers WHERE id = ?", (worker_id,))
+
+    def live_workers(self) -> List[str]:
+        """Return the IDs of workers with a recent heartbeat whose process still exists."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, pid FROM workers WHERE heartbeat > ?", (time.time() - STALE_AFTER,)
+            ).fetchall()
+        return [row["id"] for row in rows if _pid_alive(row["pid"])]
+
+    def requeue_stale(self):
+        """Forget dead workers and put the jobs they held back in the queue.
+
+        A worker is dead once its process is gone, or hung once its
+        heartbeat is stale: workers beat from a background thread while a
+        job runs, so a long, silent job keeps its worker alive.
+        """
+        cutoff = time.time() - STALE_AFTER
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM workers WHERE heartbeat <= ?", (cutoff,))
+            for row in conn.execute("SELECT id, pid FROM workers").fetchall():
+                if not _pid_alive(row["pid"]):
+                    conn.execute("DELETE FROM workers WHERE id = ?", (row["id"],))
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', worker_id = NULL, updated_at = ? "
+                "WHERE status = 'running' AND worker_id NOT IN (SELECT id FROM workers)",
+                (time.time(),)
+            )
+            conn.execute("COMMIT")
+
+def _pid_alive(pid: int) -> bool:
+    """Whether a process with this ID exists on this machine."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # It exists, but belongs to another user
+        return True
+    return True
+
+def run_worker(db_path: str = DEFAULT_DB_PATH, parent_pid: Optional[int] = None, stop=None):
+    """Worker process loop: claim jobs, run their handlers, record results.
+
+    Exits, between jobs, once the shared ``stop`` flag is set or the
+    process that started it goes away.
+    """
+    # Handlers register themselves on import
+    import app.services.job_handlers  # noqa: F401
+
+    queue = JobQueue(db_path)
+    worker_id = uuid.uuid4().hex
+    last_beat = 0.0
+    try:
+        while (parent_pid is None or os.getppid() == parent_pid) and not (stop and stop.value):
+            if time.time() - last_beat > HEARTBEAT_SECONDS:
+                queue.heartbeat(worker_id)
+                queue.requeue_stale()
+                last_beat = time.time()
+
+            job = queue.claim(worker_id)
+            if job is None:
+                time.sleep(POLL_SECONDS)
+                continue
+
+            handler = HANDLERS.get(job["kind"])
+            if handler is None:
+                queue.fail(job["id"], f"Unknown job kind: {job['kind']}")
+                continue
+
+            def report_progress(progress: float, message: str = "", partial=None, job_id=job["id"]):
+                queue.set_progress(job_id, progress, message, partial)
+
+            done = threading.Event()
+            beating = threading.Thread(target=_beat, args=(queue, worker_id, done), daemon=True)
+            beating.start()
+            try:
+                # A job requeued while this worker was hung is no longer
+                # its to finish, so both are keyed on the worker
+                queue.complete(job["id"], handler(job["payload"], report_progress), worker_id)
+            except Exception as e:
+                traceback.print_exc()
+                queue.fail(job["id"], str(e), worker_id)
+            finally:
+                done.set()
+                beating.join()
+            last_beat = time.time()
+    finally:
+        queue.remove_worker(worker_id)
+
+def _beat(queue: JobQueue, worker_id: str, done: threading.Event):
+    """Refresh a worker's heartbeat until ``done`` is set."""
+    while not done.wait(HEARTBEAT_SECONDS):
+        try:
+            queue.heartbeat(worker_id)
+        except sqlite3.Error:
+            traceback.print_exc()
+
+# Seconds a worker gets to finish its current job at exit before it is terminated
+SHUTDOWN_GRACE = 5.0
+
+_started: List[multiprocessing.Process] = []
+_stop = None
+_exit_registered = False
+
+def stop_workers(timeout: float = SHUTDOWN_GRACE):
+    """Ask the workers this process started to exit, terminating those that don't in time."""
+    if _stop is not None:
+        _stop.value = True
+    deadline = time.time() + timeout
+    for process in _started:
+        process.join(max(0.0, deadline - time.time()))
+        if process.is_alive():
+            process.terminate()
+            process.join()
+    _started.clear()
+
+def ensure_workers(db_path: str = DEFAULT_DB_PATH, count: int = DEFAULT_WORKERS) -> int:
+    """Start worker processes unless enough are already alive; return how many run.
+
+    Workers are shared: every session (and every server process using the
+    same database) counts the live workers before starting more. Jobs
+    held by dead workers are requeued first, so calling this while
+    polling a job replaces a worker that was killed. Workers started here
+    are stopped when this process exits.
+    """
+    global _started, _stop, _exit_registered
+    _started = [process for process in _started if process.is_alive()]
+    queue = JobQueue(db_path)
+    queue.requeue_stale()
+    alive = max(len(queue.live_workers()), len(_started))
+    context = multiprocessing.get_context("spawn")
+    for _ in range(count - alive):
+        if _stop is None:
+            # Lock-free, so a killed worker can't leave it locked for the rest
+            _stop = context.RawValue("b", False)
+        # Not daemonic, so workers may start their own process pools
+        process = context.Process(target=run_worker, args=(db_path, os.getpid(), _stop), name="woohoo-job-worker")
+        process.start()
+        _started.append(process)
+        if not _exit_registered:
+            # Registered after multiprocessing's own exit handler, which
+            # waits for the workers forever, so this one runs first
+            atexit.register(stop_workers)
+            _exit_registered = True
+    return max(alive, count)
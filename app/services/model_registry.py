@@ -0,0 +1,140 @@
+from typing import Dict, Optional, Set, Union
+import os
+import threading
+import time
+
+import ollama
+
+from app.services.async_llm import DEFAULT_HOST
+
+# Seconds a successful availability check is trusted
+AVAILABILITY_TTL = float(os.getenv("WOOHOO_MODEL_TTL", 600))
+
+def parse_keep_alive(value: str) -> Union[str, float]:
+    """Read a keep-alive setting: seconds as a number, anything else as a duration string.
+
+    Ollama rejects numbers sent as strings, such as "-1" or "300".
+    """
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+    return int(number) if number.is_integer() else number
+
+# How long the server keeps a model loaded after a request: a duration
+# such as "30m", seconds, or -1 to keep it loaded indefinitely
+DEFAULT_KEEP_ALIVE: Union[str, float] = parse_keep_alive(os.getenv("WOOHOO_KEEP_ALIVE", "30m"))
+
+def _model_names(name: str) -> Set[str]:
+    """Names a model may be listed under, with and without the default tag."""
+    return {name, name[:-len(":latest")]} if name.endswith(":latest") else {name, f"{name}:latest"}
+
+class ModelRegistry:
+    def __init__(self, host: Optional[str] = DEFAULT_HOST, ttl: float = AVAILABILITY_TTL, keep_alive: Union[str, float] = DEFAULT_KEEP_ALIVE):
+        """Initialize a registry of the models available on an Ollama server.
+
+        A model is checked against the server's list once per ``ttl`` and
+        pulled only if missing. Use ``get_model_registry`` to share one
+        registry per server across the process.
+        """
+        self.host = host
+        self.ttl = ttl
+        self.keep_alive = keep_alive
+        self._verified: Dict[str, float] = {}
+        self._warmed: Dict[str, float] = {}
+        self._warming: Dict[str, threading.Thread] = {}
+        # Model -> set once its in-progress check (and pull) finishes
+        self._checking: Dict[str, threading.Event] = {}
+        # Guards the dicts above only; server calls are made without it
+        self._lock = threading.Lock()
+
+    def _client(self) -> ollama.Client:
+        return ollama.Client(host=self.host)
+
+    def is_available(self, model: str) -> bool:
+        """Whether the model was verified within the TTL, without asking the server."""
+        verified = self._verified.get(model)
+        return verified is not None and time.time() - verified < self.ttl
+
+    def ensure(self, model: str) -> bool:
+        """Make sure the server has the model, pulling it only if missing.
+
+        Returns whether the model is available; failures are not cached.
+        Concurrent calls for the same model wait for one check instead of
+        repeating it.
+        """
+        if self.is_available(model):
+            return True
+        with self._lock:
+            if self.is_available(model):
+                return True
+            checking = self._checking.get(model)
+            if checking is None:
+                self._checking[model] = done = threading.Event()
+        if checking is not None:
+            checking.wait()
+            return self.is_available(model)
+        try:
+            client = self._client()
+            installed = {entry.model for entry in client.list().models}
+            if not installed & _model_names(model):
+                client.pull(model)
+            self._verified[model] = time.time()
+            return True
+        except Exception as e:
+            print(f"Warning: Could not make model {model} available: {e}")
+            return False
+        finally:
+            with self._lock:
+                self._checking.pop(model, None)
+            done.set()
+
+    def warm_up(self, model: str, background: bool = True) -> Optional[threading.Thread]:
+        """Ensure the model and load it into server memory for ``keep_alive``.
+
+        Runs on a daemon thread by default and returns it; calls while a
+        warm-up is running or still fresh return at once, without waiting
+        for the server.
+        """
+        with self._lock:
+            running = self._warming.get(model)
+            if running is not None and running.is_alive():
+                return running
+            warmed = self._warmed.get(model)
+            if warmed is not None and time.time() - warmed < self.ttl:
+                return None
+            thread = threading.Thread(target=self._warm, args=(model,), daemon=True, name=f"woohoo-warm-{model}")
+            self._warming[model] = thread
+        if background:
+            thread.start()
+        else:
+            thread.run()
+        return thread
+
+    def _warm(self, model: str):
+        if not self.ensure(model):
+            return
+        try:
+            # An empty prompt loads the model without generating anything
+            self._client().generate(model=model, prompt="", keep_alive=self.keep_alive)
+            self._warmed[model] = time.time()
+        except Exception as e:
+            print(f"Warning: Could not warm up model {model}: {e}")
+
+    def release(self, model: str):
+        """Unload the model from server memory now."""
+        try:
+            self._client().generate(model=model, prompt="", keep_alive=0)
+            self._warmed.pop(model, None)
+        except Exception as e:
+            print(f"Warning: Could not unload model {model}: {e}")
+
+_registries: Dict[Optional[str], ModelRegistry] = {}
+_registries_lock = threading.Lock()
+
+def get_model_registry(host: Optional[str] = DEFAULT_HOST) -> ModelRegistry:
+    """Return the process-wide registry for an Ollama server."""
+    with _registries_lock:
+        if host not in _registries:
+            _registries[host] = ModelRegistry(host)
+        return _registries[host]
@@ -1,40 +1,95 @@
-import PyPDF2
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional
+
+from app.utils.extraction_cache import ExtractionCache, get_extraction_cache
+from app.utils.pdf_engine import clean_metadata, iter_pages, open_reader, parse_document
+from app.utils.pdf_source import PDFSource, is_path, source_digest, source_name
+from app.utils.search_index import SearchIndex, get_search_index
 
 class PDFService:
-    def __init__(self):
-        """Initialize the PDF service."""
-        pass
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        cache: Optional[ExtractionCache] = None,
+        index: Optional[SearchIndex] = None
+    ):
+        """Initialize the PDF service.
+
+        Every method takes a file path or an in-memory upload; uploads are
+        parsed straight from their buffer and files are memory-mapped.
+        Parsed documents are added to the search index.
+        """
+        self.workers = workers
+        self.cache = cache or get_extraction_cache()
+        self.index = index or get_search_index()
+        
+    def parse(self, source: PDFSource, name: Optional[str] = None) -> Dict:
+        """Parse a PDF once and return its text, metadata and page texts.
+
+        The result holds ``text`` (pages joined by blank lines), ``metadata``,
+        ``num_pages`` and ``page_texts``.
+        """
+        digest = source_digest(source)
+        entry = self.cache.get(digest)
+        if "page_texts" not in entry or "metadata" not in entry:
+            info, page_texts = parse_document(source, workers=self.workers)
+            entry = self.cache.update(
+                digest,
+                page_texts=page_texts,
+                metadata=self._clean_metadata(info, len(page_texts))
+            )
+        
+        page_texts = entry["page_texts"]
+        metadata = self._with_title(entry["metadata"], name or source_name(source))
+        self.index.add_pdf(digest, metadata, page_texts, path=str(source) if is_path(source) else None)
+        return {
+            "text": "\n\n".join(page_texts),
+            "metadata": metadata,
+            "num_pages": len(page_texts),
+            "page_texts": page_texts
+        }
+        
+    def iter_pages(self, source: PDFSource) -> Iterator[str]:
+        """Yield page texts as they are decoded, so callers can stop early."""
+        digest = source_digest(source)
+        cached = self.cache.get(digest).get("page_texts")
+        if cached is not None:
+            yield from cached
+            return
         
-    def extract_text(self, file_path: str) -> str:
+        page_texts = []
+        for text in iter_pages(source):
+            page_texts.append(text)
+            yield text
+        
+        # Only a fully consumed document is worth caching
+        self.cache.update(digest, page_texts=page_texts)
+        
+    def extract_text(self, source: PDFSource) -> str:
         """Extract text from a PDF file."""
-        text = []
-        with open(file_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            for page in reader.pages:
-                text.append(page.extract_text())
-        return "\n\n".join(text)
-        
-    def get_metadata(self, file_path: str) -> Dict:
+        return self.parse(source)["text"]
+        
+    def get_metadata(self, source: PDFSource, name: Optional[str] = None) -> Dict:
         """Extract metadata from a PDF file."""
-        with open(file_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            metadata = reader.metadata
-            
-            # Clean up metadata
-            clean_metadata = {
-                'title': metadata.get('/Title', '').strip() if metadata.get('/Title') else None,
-                'author': metadata.get('/Author', '').strip() if metadata.get('/Author') else None,
-                'subject': metadata.get('/Subject', '').strip() if metadata.get('/Subject') else None,
-                'keywords': metadata.get('/Keywords', '').strip() if metadata.get('/Keywords') else None,
-                'creator': metadata.get('/Creator', '').strip() if metadata.get('/Creator') else None,
-                'producer': metadata.get('/Producer', '').strip() if metadata.get('/Producer') else None,
-                'pages': len(reader.pages)
-            }
-            
-            # Use filename as title if no title in metadata
-            if not clean_metadata['title']:
-                clean_metadata['title'] = Path(file_path).stem
-                
-            return clean_metadata 
\ No newline at end of file
+        digest = source_digest(source)
+        clean_metadata = self.cache.get(digest).get("metadata")
+        if clean_metadata is None:
+            reader = open_reader(source)
+            clean_metadata = self._clean_metadata(reader.metadata or {}, len(reader.pages))
+            self.cache.update(digest, metadata=clean_metadata)
+        return self._with_title(clean_metadata, name or source_name(source))
+        
+    def _clean_metadata(self, metadata: Dict, num_pages: int) -> Dict:
+        """Clean up a raw PDF info dictionary."""
+        return clean_metadata(metadata, num_pages)
+        
+    def _with_title(self, metadata: Dict, name: Optional[str]) -> Dict:
+        """Use filename as title if no title in metadata.
+
+        The same bytes may be cached under another name, so the fallback is
+        applied to a copy and never stored.
+        """
+        metadata = dict(metadata)
+        if not metadata['title']:
+            metadata['title'] = Path(name).stem if name else "Untitled"
+        return metadata
@@ -0,0 +1,133 @@
+from typing import Dict, List, Optional, Type
+import importlib.util
+import io
+import os
+import shutil
+import subprocess
+
+from app.utils.wav_audio import read_wav, write_wav
+
+# Engine used when none is given: a registered name; if it can't run
+# here, the first registered engine that can is used instead
+DEFAULT_ENGINE = os.getenv("WOOHOO_TTS_ENGINE", "gtts")
+
+# Languages offered in the app; every engine maps each to its own code
+LANGUAGES = ("en", "es", "fr", "de", "it", "pt", "ru", "ja", "ko", "zh")
+
+# Seconds a local engine may take for one piece of text
+LOCAL_TIMEOUT = 120
+
+# Engine name -> engine class
+ENGINES: Dict[str, Type["TTSEngine"]] = {}
+
+def register_engine(name: str):
+    """Register a TTSEngine subclass under a name."""
+    def decorator(engine: Type["TTSEngine"]) -> Type["TTSEngine"]:
+        engine.name = name
+        ENGINES[name] = engine
+        return engine
+    return decorator
+
+class TTSEngine:
+    """A speech engine: turns text into audio bytes in its ``format``, "mp3" or "wav"."""
+    name = ""
+    format = "mp3"
+    # App language code -> the engine's own code
+    languages: Dict[str, str] = {}
+
+    def available(self) -> bool:
+        """Whether the engine can run here."""
+        return True
+
+    def synthesize(self, text: str, language: str, voice: str = "default") -> bytes:
+        """Synthesize text in an app language and a profile ``voice_preference``.
+
+        Raises ValueError for a language the engine doesn't speak.
+        """
+        raise NotImplementedError
+
+    def _language(self, language: str) -> str:
+        if language not in self.languages:
+            raise ValueError(f"{self.name} does not support language: {language}")
+        return self.languages[language]
+
+@register_engine("gtts")
+class GTTSEngine(TTSEngine):
+    """Google Translate's TTS; needs network access, and has one voice per language."""
+    format = "mp3"
+    languages = {**{code: code for code in LANGUAGES}, "zh": "zh-CN"}
+
+    def available(self) -> bool:
+        return importlib.util.find_spec("gtts") is not None
+
+    def synthesize(self, text: str, language: str, voice: str = "default") -> bytes:
+        from gtts import gTTS
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=self._language(language)).write_to_fp(buffer)
+        return buffer.getvalue()
+
+@register_engine("espeak-ng")
+class EspeakEngine(TTSEngine):
+    """eSpeak NG, run as a local process: CPU only, no network, WAV output."""
+    format = "wav"
+    languages = {
+        "en": "en-us", "es": "es", "fr": "fr-fr", "de": "de", "it": "it",
+        "pt": "pt-br", "ru": "ru", "ja": "ja", "ko": "ko", "zh": "cmn"
+    }
+    # Profile voice_preference -> voice variant, words per minute and pitch (0-99)
+    voices = {
+        "default": {"variant": None, "rate": 165, "pitch": 50},
+        "casual": {"variant": "m3", "rate": 175, "pitch": 45},
+        "professional": {"variant": "m1", "rate": 155, "pitch": 40},
+        "enthusiastic": {"variant": "f2", "rate": 185, "pitch": 70}
+    }
+
+    def __init__(self, binary: Optional[str] = None):
+        """Use the ``espeak-ng`` binary (or ``WOOHOO_ESPEAK``), falling back to ``espeak``."""
+        self.binary = binary or os.getenv("WOOHOO_ESPEAK") or shutil.which("espeak-ng") or shutil.which("espeak")
+
+    def available(self) -> bool:
+        return self.binary is not None and shutil.which(self.binary) is not None
+
+    def synthesize(self, text: str, language: str, voice: str = "default") -> bytes:
+        settings = self.voices.get(voice, self.voices["default"])
+        name = self._language(language)
+        if settings["variant"]:
+            name = f"{name}+{settings['variant']}"
+        result = subprocess.run(
+            [self.binary, "-v", name, "-s", str(settings["rate"]), "-p", str(settings["pitch"]), "-b", "1", "--stdin", "--stdout"],
+            input=text.encode("utf-8"),
+            capture_output=True,
+            timeout=LOCAL_TIMEOUT,
+            check=True
+        )
+        # The header written to a pipe has no real sizes; rewrite it
+        layout, pcm = read_wav(result.stdout)
+        return write_wav(pcm, layout)
+
+def available_engines() -> List[str]:
+    """Names of the registered engines that can run here."""
+    return [name for name, engine in ENGINES.items() if engine().available()]
+
+def get_engine(name: Optional[str] = None) -> TTSEngine:
+    """Create a registered engine.
+
+    Without a name, ``DEFAULT_ENGINE`` is used if it can run here, else
+    the first registered engine that can (such as espeak-ng when gTTS
+    isn't installed), else ``DEFAULT_ENGINE`` anyway so its errors show.
+    """
+    if name is not None:
+        if name not in ENGINES:
+            raise ValueError(f"Unknown TTS engine: {name}")
+        return ENGINES[name]()
+    if DEFAULT_ENGINE not in ENGINES:
+        raise ValueError(f"Unknown TTS engine: {DEFAULT_ENGINE}")
+    engine = ENGINES[DEFAULT_ENGINE]()
+    if engine.available():
+        return engine
+    for fallback in ENGINES.values():
+        candidate = fallback()
+        if candidate.available():
+            print(f"TTS engine {DEFAULT_ENGINE} is not available here, using {candidate.name}")
+            return candidate
+    return engine
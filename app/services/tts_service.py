@@ -1,43 +1,183 @@
-from gtts import gTTS
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
 import os
+import random
+import threading
+import time
 from pathlib import Path
 
+from app.services.tts_engines import ENGINES, LANGUAGES, TTSEngine, get_engine
+from app.utils.chunking import speech_chunks
+from app.utils.mp3_frames import concat_mp3, mp3_duration
+from app.utils.tts_cache import TTSCache, get_tts_cache, tts_cache_key
+from app.utils.wav_audio import concat_wav, wav_duration
+
+# Audio format -> (join pieces without re-encoding, playing time in seconds)
+AUDIO_FORMATS = {
+    "mp3": (concat_mp3, mp3_duration),
+    "wav": (concat_wav, wav_duration)
+}
+
+# Characters per synthesis request; pieces end at paragraph or sentence ends
+SPEECH_CHUNK_CHARS = 1000
+
+# Pieces synthesized at once, and retries per piece after the first attempt
+# (with exponential backoff plus jitter)
+DEFAULT_WORKERS = int(os.getenv("WOOHOO_TTS_WORKERS", 4))
+DEFAULT_RETRIES = 3
+BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 30.0
+
 class TTSService:
-    def __init__(self):
-        """Initialize TTS service."""
-        pass
-    
+    def __init__(
+        self,
+        engine: Optional[TTSEngine] = None,
+        workers: int = DEFAULT_WORKERS,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = BACKOFF_SECONDS,
+        chunk_chars: int = SPEECH_CHUNK_CHARS,
+        cache: Optional[TTSCache] = None
+    ):
+        """Initialize TTS service.
+
+        Text is split into pieces of ``chunk_chars`` that ``workers``
+        threads synthesize at once through ``engine`` (the registered
+        ``DEFAULT_ENGINE`` if not given); a failed piece is retried on its
+        own up to ``retries`` times. Pieces are cached on disk by text,
+        language, voice and engine, so only new or edited paragraphs are
+        synthesized again.
+
+        If the default engine fails before it has made any audio (gTTS
+        without network, say), another engine that can run here takes
+        over; an engine given explicitly is kept.
+        """
+        self.engine = engine or get_engine()
+        self.format = self.engine.format
+        self._can_switch = engine is None
+        self._switch_lock = threading.Lock()
+        self.cache = cache or get_tts_cache()
+        self.workers = max(1, workers)
+        # Bounds engine calls across concurrent synthesize() calls too
+        self._slots = threading.BoundedSemaphore(self.workers)
+        self.retries = retries
+        self.backoff = backoff
+        self.chunk_chars = chunk_chars
+
+    def _synthesize_chunk(self, text: str, language: str, voice: str, key: Optional[str] = None) -> bytes:
+        """Synthesize one piece, retrying failures; bad arguments are not retried.
+
+        The audio is cached under ``key`` as soon as it is made.
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                with self._slots:
+                    audio = self.engine.synthesize(text, language, voice)
+                if key is not None:
+                    self.cache.put(key, audio)
+                return audio
+            except ValueError:
+                raise
+            except Exception:
+                if attempt == self.retries:
+                    raise
+                delay = min(MAX_BACKOFF_SECONDS, self.backoff * 2 ** attempt)
+                time.sleep(delay * random.uniform(0.5, 1.5))
+
+    def synthesize(self, text: str, language: str = "en", voice: str = "default") -> bytes:
+        """Synthesize text into one audio file, joined from concurrently made pieces."""
+        return self.join(self.synthesize_pieces(text, language, voice))
+
+    def synthesize_pieces(self, text: str, language: str = "en", voice: str = "default") -> List[bytes]:
+        """Synthesize text piece by piece, concurrently, returning each piece's audio in order.
+
+        Cached pieces are reused and repeated ones made once. Errors
+        propagate once a piece has run out of retries (and no other engine
+        can take over); pieces made before that stay cached.
+        """
+        engine = self.engine
+        try:
+            pieces = self._synthesize_pieces(text, language, voice)
+        except ValueError:
+            raise
+        except Exception as e:
+            if not self._switch_engine(engine, e):
+                raise
+            return self.synthesize_pieces(text, language, voice)
+        with self._switch_lock:
+            if self.engine is engine:
+                self._can_switch = False
+                return pieces
+        # Made by the engine another thread has since replaced; pieces must share a format
+        return self.synthesize_pieces(text, language, voice)
+
+    def _switch_engine(self, failed: TTSEngine, error: Exception) -> bool:
+        """Replace a default engine that failed before making any audio; False if none can."""
+        with self._switch_lock:
+            if self.engine is not failed:
+                # Another thread switched already
+                return True
+            if not self._can_switch:
+                return False
+            for fallback in ENGINES.values():
+                if fallback.name == failed.name:
+                    continue
+                candidate = fallback()
+                if candidate.available():
+                    print(f"TTS engine {failed.name} failed ({error}), using {candidate.name}")
+                    self.engine = candidate
+                    self.format = candidate.format
+                    self._can_switch = False
+                    return True
+            return False
+
+    def _synthesize_pieces(self, text: str, language: str, voice: str) -> List[bytes]:
+        chunks = speech_chunks(text, self.chunk_chars)
+        keys = [tts_cache_key(chunk, language, voice, self.engine.name) for chunk in chunks]
+        audio: Dict[str, bytes] = {}
+        missing: Dict[str, str] = {}
+        for key, chunk in zip(keys, chunks):
+            if key in audio or key in missing:
+                continue
+            cached = self.cache.get(key)
+            if cached is not None:
+                audio[key] = cached
+            else:
+                missing[key] = chunk
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(missing)), thread_name_prefix="woohoo-tts") as pool:
+                made = pool.map(lambda item: self._synthesize_chunk(item[1], language, voice, item[0]), missing.items())
+                audio.update(zip(missing, made))
+        return [audio[key] for key in keys]
+
+    def join(self, parts: Iterable[bytes]) -> bytes:
+        """Join pieces of this engine's audio, in order, without re-encoding."""
+        return AUDIO_FORMATS[self.format][0](parts)
+
+    def duration(self, audio: bytes) -> float:
+        """Playing time of this engine's audio in seconds."""
+        return AUDIO_FORMATS[self.format][1](audio)
+
     def generate_audio(
         self,
         text: str,
         output_path: str,
-        language: str = "en"
+        language: str = "en",
+        voice: str = "default"
     ) -> bool:
-        """Generate audio from text using Google TTS."""
+        """Generate audio from text and save it in the engine's format."""
         try:
             # Ensure output directory exists
             Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-            
+
             # Generate audio
-            tts = gTTS(text=text, lang=language)
-            tts.save(output_path)
+            audio = self.synthesize(text, language, voice)
+            with open(output_path, "wb") as f:
+                f.write(audio)
             return True
         except Exception as e:
             print(f"Error with TTS: {e}")
             return False
-    
+
     def list_available_languages(self) -> list:
-        """List available languages."""
-        return [
-            "en",  # English
-            "es",  # Spanish
-            "fr",  # French
-            "de",  # German
-            "it",  # Italian
-            "pt",  # Portuguese
-            "ru",  # Russian
-            "ja",  # Japanese
-            "ko",  # Korean
-            "zh",  # Chinese
-        ] 
\ No newline at end of file
+        """List the app languages the engine speaks."""
+        return [code for code in LANGUAGES if code in self.engine.languages]
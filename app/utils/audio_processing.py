@@ -0,0 +1,219 @@
+from typing import List, Optional, Sequence, Tuple
+import os
+import shutil
+import subprocess
+
+import numpy as np
+
+from app.utils.mp3_frames import iter_frames
+from app.utils.wav_audio import read_wav, write_wav
+
+# Target loudness of every piece, as gated RMS in dBFS, and the most a
+# quiet piece is boosted
+TARGET_DBFS = -20.0
+MAX_GAIN_DB = 20.0
+
+# Highest sample peak after gain, in dBFS
+PEAK_DBFS = -1.0
+
+# Silence trimming: analysis window, level below the piece's loudness
+# that counts as silence (never above the floor), and silence kept at
+# each end so pieces don't run into each other
+WINDOW_SECONDS = 0.01
+SILENCE_BELOW_DB = 35.0
+SILENCE_FLOOR_DBFS = -60.0
+PAD_SECONDS = 0.15
+
+# Overlap between consecutive pieces, and between the intro or outro
+# and the speech
+CROSSFADE_SECONDS = 0.03
+MUSIC_CROSSFADE_SECONDS = 0.5
+
+# Audio files played before and after every episode, if set
+INTRO_PATH = os.getenv("WOOHOO_INTRO")
+OUTRO_PATH = os.getenv("WOOHOO_OUTRO")
+
+# Bitrate of re-encoded MP3s
+MP3_BITRATE = "64k"
+
+# Seconds ffmpeg may take to decode or encode one file
+CODEC_TIMEOUT = 600
+
+def ffmpeg_binary() -> Optional[str]:
+    """The ffmpeg binary (``WOOHOO_FFMPEG`` or on the PATH), needed to decode and encode MP3."""
+    return os.getenv("WOOHOO_FFMPEG") or shutil.which("ffmpeg")
+
+def _ffmpeg(args: List[str], data: bytes) -> bytes:
+    binary = ffmpeg_binary()
+    if binary is None:
+        raise RuntimeError("ffmpeg is needed to process MP3 audio")
+    result = subprocess.run(
+        [binary, "-v", "error", *args], input=data, capture_output=True, timeout=CODEC_TIMEOUT, check=True
+    )
+    return result.stdout
+
+def decode(data: bytes, format: str) -> Tuple[np.ndarray, int]:
+    """Decode a WAV or MP3 file to mono float32 samples in [-1, 1] and its sample rate."""
+    if format == "wav":
+        (channels, rate, width), pcm = read_wav(data)
+        if width == 1:
+            samples = (np.frombuffer(pcm, dtype=np.uint8).astype(np.float32) - 128) / 128
+        elif width in (2, 4):
+            dtype = np.int16 if width == 2 else np.int32
+            samples = np.frombuffer(pcm, dtype=dtype).astype(np.float32) / np.iinfo(dtype).max
+        else:
+            raise ValueError(f"Unsupported WAV sample width: {width * 8} bits")
+        return samples.reshape(-1, channels).mean(axis=1, dtype=np.float32), rate
+    if format == "mp3":
+        rate = next((rate for _, _, rate in iter_frames(data)), None)
+        if rate is None:
+            return np.zeros(0, dtype=np.float32), 0
+        pcm = _ffmpeg(["-i", "pipe:0", "-f", "s16le", "-ac", "1", "-ar", str(rate), "pipe:1"], data)
+        return np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32767, rate
+    raise ValueError(f"Unsupported audio format: {format}")
+
+def encode(samples: np.ndarray, rate: int, format: str) -> bytes:
+    """Encode mono int16 samples as WAV or MP3."""
+    pcm = samples.astype(np.int16).tobytes()
+    if format == "wav":
+        return write_wav(pcm, (1, rate, 2))
+    if format == "mp3":
+        return _ffmpeg(
+            ["-f", "s16le", "-ar", str(rate), "-ac", "1", "-i", "pipe:0", "-b:a", MP3_BITRATE, "-f", "mp3", "pipe:1"], pcm
+        )
+    raise ValueError(f"Unsupported audio format: {format}")
+
+def resample(samples: np.ndarray, rate: int, target_rate: int) -> np.ndarray:
+    """Resample by linear interpolation; enough for intros and outros, not for speech."""
+    if rate == target_rate or not len(samples):
+        return samples
+    length = int(round(len(samples) * target_rate / rate))
+    positions = np.arange(length, dtype=np.float64) * (rate / target_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+def window_energy(samples: np.ndarray, window: int) -> np.ndarray:
+    """Mean square of each full ``window``-sample window."""
+    count = len(samples) // window
+    frames = samples[:count * window].reshape(count, window)
+    return np.einsum("ij,ij->i", frames, frames) / window
+
+def loudness_db(energy: np.ndarray) -> float:
+    """Gated RMS loudness in dBFS of window energies.
+
+    Windows below -70 dBFS, then those 10 dB below the remaining mean,
+    are left out, as in ITU-R BS.1770 gating, so pauses don't count.
+    """
+    gated = energy[energy > 1e-7]
+    if not len(gated):
+        return -np.inf
+    gated = gated[gated > gated.mean() * 0.1]
+    return float(10 * np.log10(gated.mean()))
+
+def trim_silence(samples: np.ndarray, rate: int, loudness: float) -> np.ndarray:
+    """Cut leading and trailing silence, keeping ``PAD_SECONDS`` of it at each end."""
+    window = max(1, int(rate * WINDOW_SECONDS))
+    energy = window_energy(samples, window)
+    threshold = 10 ** (max(SILENCE_FLOOR_DBFS, loudness - SILENCE_BELOW_DB) / 10)
+    loud = np.flatnonzero(energy > threshold)
+    if not len(loud):
+        return samples[:0]
+    pad = int(rate * PAD_SECONDS)
+    return samples[max(0, loud[0] * window - pad):(loud[-1] + 1) * window + pad]
+
+def normalize(samples: np.ndarray, loudness: float, target_db: float = TARGET_DBFS) -> np.ndarray:
+    """Scale to ``target_db`` loudness, boosting by at most ``MAX_GAIN_DB`` and keeping peaks under ``PEAK_DBFS``."""
+    if not len(samples) or not np.isfinite(loudness):
+        return samples
+    gain = 10 ** (min(target_db - loudness, MAX_GAIN_DB) / 20)
+    peak = float(np.abs(samples).max()) * gain
+    gain *= min(1.0, 10 ** (PEAK_DBFS / 20) / peak) if peak else 1.0
+    return samples * np.float32(gain)
+
+def crossfade_join(pieces: Sequence[np.ndarray], fades: Sequence[int]) -> np.ndarray:
+    """Join pieces into int16 samples, overlapping each pair by ``fades[i]`` samples.
+
+    Overlaps use equal-power fades. The output is allocated once as
+    int16; each piece is faded and written in place, so memory stays at
+    one piece in float32 on top of the output.
+    """
+    fades = [min(fade, len(first), len(second)) for fade, first, second in zip(fades, pieces, pieces[1:])]
+    output = np.zeros(sum(map(len, pieces)) - sum(fades), dtype=np.int16)
+    offset = 0
+    for i, piece in enumerate(pieces):
+        piece = piece.copy()
+        head = fades[i - 1] if i else 0
+        tail = fades[i] if i < len(fades) else 0
+        if head:
+            piece[:head] *= np.sin(np.linspace(0, np.pi / 2, head, dtype=np.float32))
+        if tail:
+            piece[len(piece) - tail:] *= np.cos(np.linspace(0, np.pi / 2, tail, dtype=np.float32))
+        scaled = np.clip(piece * 32767, -32768, 32767)
+        # The overlap adds onto the previous piece's faded tail
+        overlap = output[offset:offset + head].astype(np.float32) + scaled[:head]
+        output[offset:offset + head] = np.clip(overlap, -32768, 32767)
+        output[offset + head:offset + len(piece)] = scaled[head:]
+        offset += len(piece) - tail
+    return output
+
+class AudioPostProcessor:
+    def __init__(
+        self,
+        target_db: float = TARGET_DBFS,
+        crossfade: float = CROSSFADE_SECONDS,
+        intro_path: Optional[str] = INTRO_PATH,
+        outro_path: Optional[str] = OUTRO_PATH
+    ):
+        """Initialize the post-processing stage for synthesized speech.
+
+        Every piece is decoded once, trimmed of leading and trailing
+        silence and brought to ``target_db`` loudness; the pieces are then
+        crossfaded together between the optional intro and outro files
+        and the episode is encoded once.
+        """
+        self.target_db = target_db
+        self.crossfade = crossfade
+        self.intro_path = intro_path
+        self.outro_path = outro_path
+
+    def supports(self, format: str) -> bool:
+        """Whether audio in a format can be decoded and encoded here."""
+        return format == "wav" or (format == "mp3" and ffmpeg_binary() is not None)
+
+    def _music(self, path: Optional[str], rate: int) -> Optional[np.ndarray]:
+        """Decode an intro or outro file, by its suffix, at the speech's sample rate."""
+        if not path:
+            return None
+        with open(path, "rb") as f:
+            samples, music_rate = decode(f.read(), os.path.splitext(path)[1].lstrip(".").lower())
+        samples = resample(samples, music_rate, rate)
+        loudness = loudness_db(window_energy(samples, max(1, int(rate * WINDOW_SECONDS))))
+        return normalize(samples, loudness, self.target_db)
+
+    def process(self, parts: Sequence[bytes], format: str) -> bytes:
+        """Turn the audio of consecutive speech pieces into one polished file in the same format."""
+        pieces = []
+        rate = None
+        for part in parts:
+            samples, part_rate = decode(part, format)
+            if not len(samples):
+                continue
+            if rate is None:
+                rate = part_rate
+            samples = resample(samples, part_rate, rate)
+            loudness = loudness_db(window_energy(samples, max(1, int(rate * WINDOW_SECONDS))))
+            samples = trim_silence(samples, rate, loudness)
+            if len(samples):
+                pieces.append(normalize(samples, loudness, self.target_db))
+        if rate is None:
+            return b""
+
+        fades = [int(rate * self.crossfade)] * max(0, len(pieces) - 1)
+        intro = self._music(self.intro_path, rate)
+        outro = self._music(self.outro_path, rate)
+        if intro is not None:
+            pieces.insert(0, intro)
+            fades.insert(0, int(rate * MUSIC_CROSSFADE_SECONDS))
+        if outro is not None:
+            pieces.append(outro)
+            fades.append(int(rate * MUSIC_CROSSFADE_SECONDS))
+        return encode(crossfade_join(pieces, fades), rate, format)
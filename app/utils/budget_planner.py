@@ -0,0 +1,127 @@
+from typing import Dict, List
+import os
+
+from app.utils.chunking import estimate_tokens
+from app.utils.section_detector import detect_sections
+
+# Context window the model is run with (sent as num_ctx)
+CONTEXT_TOKENS = int(os.getenv("WOOHOO_CONTEXT_TOKENS", 8192))
+
+# Script tokens written per minute of episode (about 150 spoken words)
+SCRIPT_TOKENS_PER_MINUTE = 200
+
+# Source tokens worth reading per minute of episode; short episodes don't
+# need the whole context window
+SOURCE_TOKENS_PER_MINUTE = 600
+
+# Source tokens the map stage reads per minute of episode when it can pick
+# the most relevant chunks; longer sources are cut down to this
+READ_TOKENS_PER_MINUTE = 2000
+
+# Section types that rarely add anything to an episode
+LOW_VALUE_SECTIONS = frozenset({"references", "appendix"})
+
+# Section types read first when a source can't be read in full; the rest
+# follow in document order
+SECTION_PRIORITY = ("abstract", "conclusion", "introduction", "results", "discussion")
+
+# Fewest tokens worth spending on a section; below this a section is
+# left out rather than cut to a fragment
+MIN_SECTION_TOKENS = 60
+
+def allocate(demands: List[int], budget: int) -> List[int]:
+    """Share a budget so nobody gets more than it asks for and the rest split evenly.
+
+    Small demands are met in full and what they leave over goes to the
+    larger ones (water-filling), so the total never exceeds ``budget``.
+    """
+    allocation = [0] * len(demands)
+    remaining = max(0, budget)
+    pending = sorted(range(len(demands)), key=lambda i: demands[i])
+    while pending:
+        share = remaining // len(pending)
+        smallest = pending[0]
+        if demands[smallest] > share:
+            for i in pending:
+                allocation[i] = share
+            break
+        allocation[smallest] = demands[smallest]
+        remaining -= demands[smallest]
+        pending.pop(0)
+    return allocation
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to at most ``max_tokens``, at a sentence end where possible."""
+    tokens = estimate_tokens(text)
+    if tokens <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+    cut = len(text) * max_tokens // tokens
+    while cut > 0:
+        candidate = text[:cut]
+        sentence_end = candidate.rfind(". ")
+        if sentence_end > cut // 2:
+            candidate = candidate[:sentence_end + 1]
+        if estimate_tokens(candidate) <= max_tokens:
+            return candidate.rstrip()
+        cut = cut * 9 // 10
+    return ""
+
+def source_sections(source: Dict) -> List[Dict]:
+    """Return a source's sections worth reading, with their estimated ``tokens``."""
+    if source.get('type') == 'pdf':
+        sections = [
+            section for section in detect_sections(source.get('text', ''))
+            if section['type'] not in LOW_VALUE_SECTIONS
+        ]
+    else:
+        abstract = source.get('data', {}).get('abstractNote', '')
+        sections = [{"title": "Abstract", "type": "abstract", "content": abstract}] if abstract else []
+    for section in sections:
+        section['tokens'] = estimate_tokens(f"{section['title']}\n{section['content']}")
+    return sections
+
+def source_budget(duration_minutes: int, overhead_tokens: int, context_tokens: int = CONTEXT_TOKENS) -> int:
+    """Return the tokens available for source material in one prompt.
+
+    The context window holds the prompt's fixed text (``overhead_tokens``),
+    the source material and the script to be written; the material is
+    further capped by what an episode of this length can use.
+    """
+    available = context_tokens - overhead_tokens - duration_minutes * SCRIPT_TOKENS_PER_MINUTE
+    return max(0, min(available, duration_minutes * SOURCE_TOKENS_PER_MINUTE))
+
+def _rank(section: Dict) -> int:
+    return SECTION_PRIORITY.index(section['type']) if section['type'] in SECTION_PRIORITY else len(SECTION_PRIORITY)
+
+def _select_sections(sections: List[Dict], budget_tokens: int) -> List[Dict]:
+    """Keep the highest-priority sections a budget can cover usefully, in document order."""
+    if sum(section['tokens'] for section in sections) <= budget_tokens:
+        return sections
+    count = max(1, budget_tokens // MIN_SECTION_TOKENS)
+    ranked = sorted(range(len(sections)), key=lambda i: _rank(sections[i]))
+    return [sections[i] for i in sorted(ranked[:count])]
+
+def plan_sources(sources: List[Dict], budget_tokens: int) -> List[str]:
+    """Fit every source's useful sections into ``budget_tokens`` in total.
+
+    The budget is shared among sources, then among each source's
+    sections, by water-filling; when a source doesn't fit, its
+    highest-priority sections are kept and truncated to their share.
+    Returns one text per source, in order.
+    """
+    sections_per_source = [source_sections(source) for source in sources]
+    source_shares = allocate([sum(s['tokens'] for s in sections) for sections in sections_per_source], budget_tokens)
+
+    texts = []
+    for sections, share in zip(sections_per_source, source_shares):
+        sections = _select_sections(sections, share)
+        section_shares = allocate([section['tokens'] for section in sections], share)
+        blocks = []
+        for section, section_share in zip(sections, section_shares):
+            content = truncate_to_tokens(section['content'], section_share - estimate_tokens(section['title']))
+            if content:
+                blocks.append(f"{section['title']}\n{content}")
+        texts.append("\n\n".join(blocks))
+    return texts
@@ -0,0 +1,125 @@
+from typing import Collection, Dict, Iterable, Iterator, List
+import re
+
+from app.utils.section_detector import detect_sections
+
+# Rough characters per token for English prose, used to size chunks
+CHARS_PER_TOKEN = 4
+
+# Subword tokenizers split text into words and punctuation, and split long
+# words again; counting both approximates their token counts closely
+# enough for budgeting without loading a tokenizer.
+WORD_OR_SYMBOL_RE = re.compile(r"\w+|[^\w\s]")
+LONG_WORD_RE = re.compile(r"\w{8,}")
+
+# Separators tried in order when a section is too long for one chunk
+SPLIT_SEPARATORS = ("\n\n", "\n", ". ", " ")
+
+# Blank line between paragraphs, as written by the model
+PARAGRAPH_BREAK_RE = re.compile(r"\n[ \t]*\n")
+
+# Whitespace after a sentence's closing punctuation (and quote or bracket)
+SENTENCE_BREAK_RE = re.compile(r"(?:(?<=[.!?])|(?<=[.!?][\"')\]]))\s+")
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text: one per word or symbol, plus one per long word."""
+    return len(WORD_OR_SYMBOL_RE.findall(text)) + len(LONG_WORD_RE.findall(text))
+
+def _split_text(text: str, max_chars: int) -> List[str]:
+    """Split text into pieces of at most ``max_chars``, on the coarsest separator that works."""
+    if len(text) <= max_chars:
+        return [text]
+    for separator in SPLIT_SEPARATORS:
+        parts = text.split(separator)
+        if len(parts) == 1:
+            continue
+        pieces, current = [], ""
+        for part in parts:
+            candidate = f"{current}{separator}{part}" if current else part
+            if len(candidate) <= max_chars:
+                current = candidate
+                continue
+            if current:
+                pieces.append(current)
+            if len(part) <= max_chars:
+                current = part
+            else:
+                pieces.extend(_split_text(part, max_chars))
+                current = ""
+        if current:
+            pieces.append(current)
+        return pieces
+    return [text[i:i + max_chars] for i in range(0, len(text), max_chars)]
+
+def chunk_sections(text: str, max_tokens: int, skip_types: Collection[str] = ()) -> List[Dict]:
+    """Split a document into chunks of at most ``max_tokens`` that follow section boundaries.
+
+    Consecutive short sections share a chunk; a section too long for one
+    chunk is split at paragraph, line or sentence boundaries. Sections
+    whose type is in ``skip_types`` are left out. Each chunk holds the
+    ``sections`` it covers and its ``text``, headers included.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    chunks = []
+    current = {"sections": [], "text": ""}
+    for section in detect_sections(text):
+        if section['type'] in skip_types:
+            continue
+        block = f"{section['title']}\n{section['content']}"
+        if len(block) > max_chars:
+            pieces = _split_text(section['content'], max_chars - len(section['title']) - 1)
+            blocks = [f"{section['title']}\n{piece}" for piece in pieces]
+        else:
+            blocks = [block]
+        for block in blocks:
+            if current["text"] and len(current["text"]) + 2 + len(block) > max_chars:
+                chunks.append(current)
+                current = {"sections": [], "text": ""}
+            current["text"] = f"{current['text']}\n\n{block}" if current["text"] else block
+            if section['title'] not in current["sections"]:
+                current["sections"].append(section['title'])
+    if current["text"]:
+        chunks.append(current)
+    return chunks
+
+def iter_paragraphs(pieces: Iterable[str]) -> Iterator[str]:
+    """Group streamed text pieces into paragraphs, yielding each once it is complete.
+
+    A paragraph ends at a blank line; the last one ends with the stream.
+    """
+    buffer = ""
+    for piece in pieces:
+        buffer += piece
+        *complete, buffer = PARAGRAPH_BREAK_RE.split(buffer)
+        for paragraph in complete:
+            if paragraph.strip():
+                yield paragraph.strip()
+    if buffer.strip():
+        yield buffer.strip()
+
+def speech_chunks(text: str, max_chars: int) -> List[str]:
+    """Split a script into pieces of at most ``max_chars`` for speech synthesis.
+
+    Every paragraph starts a new piece, so pauses fall where the script
+    has them; a long paragraph is split between sentences, and a sentence
+    too long on its own at the coarsest boundary that fits.
+    """
+    chunks = []
+    for paragraph in PARAGRAPH_BREAK_RE.split(text):
+        paragraph = " ".join(paragraph.split())
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            chunks.append(paragraph)
+            continue
+        current = ""
+        for sentence in SENTENCE_BREAK_RE.split(paragraph):
+            for piece in _split_text(sentence, max_chars):
+                if current and len(current) + 1 + len(piece) > max_chars:
+                    chunks.append(current)
+                    current = piece
+                else:
+                    current = f"{current} {piece}" if current else piece
+        if current:
+            chunks.append(current)
+    return chunks
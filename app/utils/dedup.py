@@ -0,0 +1,222 @@
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+import re
+import zlib
+
+import numpy as np
+
+from app.utils.section_detector import detect_sections
+
+# MinHash signature length and LSH banding: 32 bands of 4 rows make pairs
+# above about 0.42 Jaccard similarity likely to share a bucket
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 32
+
+# Words per shingle, and the estimated Jaccard similarity above which two
+# texts count as the same
+SHINGLE_WORDS = 3
+DUPLICATE_THRESHOLD = 0.5
+
+# Words of a source's abstract (or opening) its signature is built from
+SIGNATURE_WORDS = 300
+
+# Shingle hashes permuted per step, to bound the temporary matrix
+HASH_BATCH = 4096
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Fixed seed, so signatures stored with sources stay comparable across runs
+_rng = np.random.default_rng(20240601)
+_MULTIPLIERS = _rng.integers(1, 2 ** 63, NUM_PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+_OFFSETS = _rng.integers(0, 2 ** 63, NUM_PERMUTATIONS, dtype=np.uint64)
+_EMPTY = np.full(NUM_PERMUTATIONS, 0xFFFFFFFF, dtype=np.uint32)
+
+def shingles(text: str, size: int = SHINGLE_WORDS) -> Set[str]:
+    """Overlapping runs of ``size`` normalized words; shorter texts give one shingle."""
+    words = WORD_RE.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+def minhash(text: str) -> np.ndarray:
+    """Return the MinHash signature of a text's shingles as uint32.
+
+    Each permutation is a multiply-shift hash of the shingle's CRC32; the
+    share of equal positions in two signatures estimates their Jaccard
+    similarity.
+    """
+    items = shingles(text)
+    if not items:
+        return _EMPTY.copy()
+    hashes = np.fromiter((zlib.crc32(item.encode("utf-8")) for item in items), dtype=np.uint64, count=len(items))
+    signature = np.full(NUM_PERMUTATIONS, 0xFFFFFFFF, dtype=np.uint64)
+    for start in range(0, len(hashes), HASH_BATCH):
+        batch = hashes[start:start + HASH_BATCH]
+        permuted = (_MULTIPLIERS[:, None] * batch[None, :] + _OFFSETS[:, None]) >> np.uint64(32)
+        signature = np.minimum(signature, permuted.min(axis=1))
+    return signature.astype(np.uint32)
+
+def similarity(first: np.ndarray, second: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.mean(first == second))
+
+class LSHIndex:
+    def __init__(self, bands: int = LSH_BANDS, threshold: float = DUPLICATE_THRESHOLD):
+        """Initialize a banded LSH index of MinHash signatures.
+
+        Lookups only compare against keys sharing a band bucket, so each
+        query costs O(bands) however many signatures are indexed.
+        """
+        self.bands = bands
+        self.rows = NUM_PERMUTATIONS // bands
+        self.threshold = threshold
+        self.signatures: Dict[Any, np.ndarray] = {}
+        self._buckets: Dict[Tuple[int, bytes], Set[Any]] = defaultdict(set)
+
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def add(self, key: Any, signature: np.ndarray):
+        """Index a signature under a key."""
+        self.signatures[key] = signature
+        for band_key in self._band_keys(signature):
+            self._buckets[band_key].add(key)
+
+    def clear(self):
+        """Drop every key from the index."""
+        self.signatures.clear()
+        self._buckets.clear()
+
+    def remove(self, key: Any):
+        """Drop a key from the index, if present."""
+        signature = self.signatures.pop(key, None)
+        if signature is not None:
+            for band_key in self._band_keys(signature):
+                self._buckets[band_key].discard(key)
+
+    def query(self, signature: np.ndarray) -> List[Tuple[Any, float]]:
+        """Return indexed keys at least ``threshold`` similar to a signature, most similar first."""
+        if (signature == _EMPTY).all():
+            return []
+        candidates = set()
+        for band_key in self._band_keys(signature):
+            candidates |= self._buckets.get(band_key, set())
+        matches = [(key, similarity(signature, self.signatures[key])) for key in candidates]
+        return sorted((match for match in matches if match[1] >= self.threshold), key=lambda match: -match[1])
+
+def _content(source: Dict) -> str:
+    """The text a source contributes: a PDF's text, or an abstract."""
+    if source.get('type') == 'pdf':
+        return source.get('text', '')
+    if 'data' in source:
+        return source['data'].get('abstractNote', '')
+    # Bibliography entries from FileHandler.parse_bibliography
+    return source.get('abstract', '')
+
+def source_title(source: Dict) -> str:
+    """Display title of a PDF, Zotero or bibliography source."""
+    if source.get('type') == 'pdf':
+        return source.get('metadata', {}).get('title') or 'Unknown PDF'
+    if 'data' in source:
+        return source['data'].get('title') or 'Untitled'
+    return source.get('title') or 'Untitled'
+
+def _identity_text(source: Dict) -> str:
+    """Text that identifies the work behind a source, whatever its kind.
+
+    The abstract is what a PDF, its Zotero item and its BibTeX entry have
+    in common; a PDF without a detected abstract is identified by its
+    opening words, and a source without content by its title.
+    """
+    content = _content(source)
+    if source.get('type') == 'pdf' and content:
+        sections = detect_sections(content)
+        leading = []
+        for section in sections:
+            if section['type'] != 'abstract':
+                break
+            leading.append(section['content'])
+        # With an explicit Abstract header the preamble (title, authors) comes first
+        content = leading[-1] if leading and len(leading[-1].split()) >= 20 else content
+    words = content.split()[:SIGNATURE_WORDS]
+    return " ".join(words) if len(words) >= 20 else f"{source_title(source)} {' '.join(words)}"
+
+def source_signature(source: Dict) -> np.ndarray:
+    """Return a source's MinHash signature, stored on it as ``minhash``.
+
+    A PDF whose text isn't extracted yet gets a title-only signature that
+    is not stored, so it is recomputed once the text is there.
+    """
+    stored = source.get('minhash')
+    if stored is not None and len(stored) == NUM_PERMUTATIONS:
+        return np.asarray(stored, dtype=np.uint32)
+    signature = minhash(_identity_text(source))
+    if source.get('type') != 'pdf' or source.get('text'):
+        source['minhash'] = signature.tolist()
+    return signature
+
+def add_source(sources: List[Dict], source: Dict, index: Optional[LSHIndex] = None) -> Optional[Dict]:
+    """Add a source to a list unless it duplicates one already there.
+
+    A duplicate with more content (a PDF rather than its Zotero abstract)
+    takes the place of the copy it duplicates. Returns the duplicated
+    source, or None if the source was simply added. Keep one ``index``
+    with the list, removing sources with ``remove_source``, so each call
+    only indexes the new signature; without one, or with one out of step
+    with the list, the list is indexed first.
+    """
+    if index is None:
+        index = LSHIndex()
+    if len(index.signatures) != len(sources):
+        index.clear()
+        for i, existing in enumerate(sources):
+            index.add(i, source_signature(existing))
+    signature = source_signature(source)
+    matches = index.query(signature)
+    if not matches:
+        index.add(len(sources), signature)
+        sources.append(source)
+        return None
+    position = matches[0][0]
+    duplicate = sources[position]
+    if len(_content(source)) > len(_content(duplicate)):
+        sources[position] = source
+        index.remove(position)
+        index.add(position, signature)
+    return duplicate
+
+def remove_source(sources: List[Dict], position: int, index: Optional[LSHIndex] = None) -> Dict:
+    """Remove and return the source at a position, keeping its ``add_source`` index in step."""
+    removed = sources.pop(position)
+    if index is not None and position in index.signatures:
+        # Keys are positions: move the later sources' signatures down one
+        index.remove(position)
+        for later in range(position + 1, len(sources) + 1):
+            signature = index.signatures[later]
+            index.remove(later)
+            index.add(later - 1, signature)
+    return removed
+
+def unique_sources(sources: Sequence[Dict]) -> List[Dict]:
+    """Drop near-duplicate sources, keeping the copy with the most content of each."""
+    unique: List[Dict] = []
+    index = LSHIndex()
+    for source in sources:
+        add_source(unique, source, index)
+    return unique
+
+def dedupe_chunks(chunks_per_source: Sequence[Sequence[str]]) -> List[List[str]]:
+    """Drop chunks that nearly duplicate an earlier chunk of any source."""
+    index = LSHIndex()
+    kept = []
+    for source, chunks in enumerate(chunks_per_source):
+        unique = []
+        for i, chunk in enumerate(chunks):
+            signature = minhash(chunk)
+            if index.query(signature):
+                continue
+            index.add((source, i), signature)
+            unique.append(chunk)
+        kept.append(unique)
+    return kept
@@ -0,0 +1,165 @@
+from pathlib import Path
+from typing import Dict, Optional
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+# Counters shared by every process using a cache directory
+COUNTERS_FILE = "counters.sqlite3"
+
+# Seconds between rescans of the directory, to pick up entries written
+# by other processes into the running size total
+RESCAN_SECONDS = 60.0
+
+# Eviction frees space down to this fraction of the cap, so a full cache
+# isn't rescanned on every write
+EVICT_TO = 0.9
+
+def sha256_digest(data) -> str:
+    """Return the hex SHA-256 of a bytes-like object."""
+    return hashlib.sha256(data).hexdigest()
+
+def file_digest(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """Return the hex SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class DiskCache:
+    def __init__(self, cache_dir: str, max_bytes: int, suffix: str = ".bin"):
+        """Initialize a size-capped, LRU-evicted cache of files keyed by hex digest.
+
+        Recency is tracked through file modification times, so the cache
+        survives restarts and can be shared by several processes. A
+        running size total, updated on every write, means the directory
+        is only scanned once it may be over the cap (or every
+        ``RESCAN_SECONDS``, for writes by other processes).
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._total: Optional[int] = None
+        self._scanned = 0.0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        """Return the file path for a cache key."""
+        return self.cache_dir / f"{key}{self.suffix}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached bytes for a key, marking it recently used."""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+            return data
+        except OSError:
+            return None
+
+    def put(self, key: str, data: bytes):
+        """Store bytes under a key and evict least recently used entries."""
+        # Write to a temp file and rename so readers never see partial entries
+        path = self._path(key)
+        fd, temp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            replaced = self._file_size(path)
+            os.replace(temp_name, path)
+        except OSError as e:
+            print(f"Error writing cache entry: {e}")
+            if os.path.exists(temp_name):
+                os.unlink(temp_name)
+            return
+        with self._lock:
+            if self._total is not None:
+                self._total += len(data) - replaced
+            if self._total is None or self._total > self.max_bytes or time.time() - self._scanned > RESCAN_SECONDS:
+                self._evict()
+
+    def remove(self, key: str):
+        """Drop the entry for a key, if any."""
+        path = self._path(key)
+        size = self._file_size(path)
+        path.unlink(missing_ok=True)
+        with self._lock:
+            if self._total is not None:
+                self._total -= size
+
+    def contains(self, key: str) -> bool:
+        """Check whether a key is cached without touching its recency."""
+        return self._path(key).exists()
+
+    def size(self) -> int:
+        """Return the total size of cached entries in bytes."""
+        return sum(stat.st_size for _, stat in self._entries())
+
+    def clear(self):
+        """Remove every cached entry."""
+        for path, _ in self._entries():
+            path.unlink(missing_ok=True)
+        with self._lock:
+            self._total = None
+
+    def count(self, **deltas: int):
+        """Add to named counters kept next to the entries, shared by every process."""
+        with sqlite3.connect(self.cache_dir / COUNTERS_FILE, timeout=30) as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            conn.executemany(
+                "INSERT INTO counters (name, value) VALUES (?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET value = value + excluded.value",
+                deltas.items()
+            )
+        conn.close()
+
+    def counters(self) -> Dict[str, int]:
+        """Return the counters added with ``count``."""
+        path = self.cache_dir / COUNTERS_FILE
+        if not path.exists():
+            return {}
+        with sqlite3.connect(path, timeout=30) as conn:
+            try:
+                rows = conn.execute("SELECT name, value FROM counters").fetchall()
+            except sqlite3.OperationalError:
+                rows = []
+        conn.close()
+        return dict(rows)
+
+    def _entries(self):
+        """List (path, stat) for every cached entry."""
+        entries = []
+        for path in self.cache_dir.glob(f"*{self.suffix}"):
+            try:
+                entries.append((path, path.stat()))
+            except OSError:
+                continue
+        return entries
+
+    @staticmethod
+    def _file_size(path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except OSError:
+            return 0
+
+    def _evict(self):
+        """Rescan the directory and, past the cap, drop least recently used entries down to ``EVICT_TO`` of it.
+
+        Called with ``_lock`` held; resets the running total.
+        """
+        entries = self._entries()
+        total = sum(stat.st_size for _, stat in entries)
+        if total > self.max_bytes:
+            for path, stat in sorted(entries, key=lambda entry: entry[1].st_mtime):
+                path.unlink(missing_ok=True)
+                total -= stat.st_size
+                if total <= self.max_bytes * EVICT_TO:
+                    break
+        self._total = total
+        self._scanned = time.time()
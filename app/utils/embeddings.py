@@ -0,0 +1,151 @@
+from typing import Any, List, Optional, Sequence, Tuple
+import re
+import threading
+import zlib
+
+import numpy as np
+
+from app.utils.budget_planner import allocate
+from app.utils.chunking import estimate_tokens
+from app.utils.disk_cache import DiskCache, sha256_digest
+
+# Embedding width; part of the cache key, so changing it invalidates entries
+EMBEDDING_DIM = 512
+EMBEDDING_VERSION = "hashing-v1"
+
+# Default cap for cached embeddings on disk
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+TERM_RE = re.compile(r"[a-z0-9]+")
+
+# Words too common to say what a text is about
+STOPWORDS = frozenset("""
+a an and are as at be been but by can for from had has have in into is it its
+of on or our that the their there these this those to was we were which while
+with within without will would also than then they them such not no may more
+most other some using used use based between both each how what when where who
+""".split())
+
+def _terms(text: str) -> List[str]:
+    """Content words, crudely singularized, and the bigrams they form."""
+    words = [
+        word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+        for word in TERM_RE.findall(text.lower()) if word not in STOPWORDS
+    ]
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+def embed_text(text: str, dim: int = EMBEDDING_DIM) -> np.ndarray:
+    """Embed a text on the CPU with the hashing trick.
+
+    Terms are hashed into ``dim`` signed buckets; counts are log-scaled and
+    the vector is L2-normalized, so dot products are cosine similarities.
+    """
+    vector = np.zeros(dim, dtype=np.float32)
+    terms = _terms(text)
+    if not terms:
+        return vector
+    hashes = np.fromiter((zlib.crc32(term.encode("utf-8")) for term in terms), dtype=np.uint32, count=len(terms))
+    # The top bit picks the sign, so colliding terms tend to cancel out
+    signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+    np.add.at(vector, hashes % dim, signs)
+    vector = np.sign(vector) * np.log1p(np.abs(vector))
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+class EmbeddingCache:
+    def __init__(self, cache_dir: str = "data/cache/embeddings", max_bytes: int = DEFAULT_MAX_BYTES, dim: int = EMBEDDING_DIM):
+        """Initialize the embedding cache, keyed by the SHA-256 of each text.
+
+        Hits and misses are counted per process.
+        """
+        self.store = DiskCache(cache_dir, max_bytes, suffix=".f32")
+        self.dim = dim
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _key(self, text: str) -> str:
+        return sha256_digest(f"{EMBEDDING_VERSION}:{self.dim}\n{text}".encode("utf-8"))
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Return a float32 matrix with one embedding per text, computing only uncached ones."""
+        matrix = np.empty((len(texts), self.dim), dtype=np.float32)
+        hits = 0
+        for i, text in enumerate(texts):
+            key = self._key(text)
+            data = self.store.get(key)
+            if data is not None and len(data) == self.dim * 4:
+                matrix[i] = np.frombuffer(data, dtype=np.float32)
+                hits += 1
+            else:
+                matrix[i] = embed_text(text, self.dim)
+                self.store.put(key, matrix[i].tobytes())
+        with self._lock:
+            self.hits += hits
+            self.misses += len(texts) - hits
+        return matrix
+
+_default_cache: Optional[EmbeddingCache] = None
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Return the process-wide embedding cache."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = EmbeddingCache()
+    return _default_cache
+
+class VectorIndex:
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        """Initialize an in-memory index of unit vectors with exact top-k search."""
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self.items: List[Any] = []
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def add(self, vectors: np.ndarray, items: Sequence[Any]):
+        """Add a matrix of vectors, one row per item."""
+        self.vectors = np.vstack([self.vectors, np.asarray(vectors, dtype=np.float32)])
+        self.items.extend(items)
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[Any, float]]:
+        """Return the ``k`` items most similar to ``query``, best first, with their scores."""
+        k = min(k, len(self.items))
+        if k <= 0:
+            return []
+        scores = self.vectors @ np.asarray(query, dtype=np.float32)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.items[i], float(scores[i])) for i in top]
+
+def select_chunks(
+    chunks_per_source: List[Sequence[str]],
+    query: str,
+    budget_tokens: int,
+    cache: Optional[EmbeddingCache] = None
+) -> List[List[int]]:
+    """Pick the chunks most relevant to ``query`` within ``budget_tokens`` in total.
+
+    The budget is shared among sources by water-filling, and each source
+    spends its share on its best-matching chunks; every source keeps at
+    least its best one. Returns the kept chunk indices per source, in
+    document order. Nothing is embedded if everything fits.
+    """
+    tokens = [[estimate_tokens(chunk) for chunk in chunks] for chunks in chunks_per_source]
+    if sum(map(sum, tokens)) <= budget_tokens:
+        return [list(range(len(chunks))) for chunks in chunks_per_source]
+
+    cache = cache or get_embedding_cache()
+    index = VectorIndex(cache.dim)
+    for source, chunks in enumerate(chunks_per_source):
+        if chunks:
+            index.add(cache.embed(chunks), [(source, i) for i in range(len(chunks))])
+
+    shares = allocate([sum(counts) for counts in tokens], budget_tokens)
+    kept: List[List[int]] = [[] for _ in chunks_per_source]
+    spent = [0] * len(chunks_per_source)
+    for (source, i), _ in index.search(embed_text(query, cache.dim), len(index)):
+        if not kept[source] or spent[source] + tokens[source][i] <= shares[source]:
+            kept[source].append(i)
+            spent[source] += tokens[source][i]
+    return [sorted(indices) for indices in kept]
@@ -0,0 +1,43 @@
+from typing import Dict, Optional
+import json
+
+from app.utils.disk_cache import DiskCache
+
+# Default cap for cached extractions on disk
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+class ExtractionCache:
+    def __init__(self, cache_dir: str = "data/cache/extractions", max_bytes: int = DEFAULT_MAX_BYTES):
+        """Initialize the extraction cache, keyed by the SHA-256 of the PDF bytes.
+
+        An entry is a JSON object that may hold any of ``page_texts`` (raw
+        text per page), ``full_text`` (cleaned text), ``sections`` and
+        ``metadata``; callers fill in the fields they compute.
+        """
+        self.store = DiskCache(cache_dir, max_bytes, suffix=".json")
+
+    def get(self, digest: str) -> Dict:
+        """Return the cached entry for a digest, or an empty dict."""
+        data = self.store.get(digest)
+        if data is None:
+            return {}
+        try:
+            return json.loads(data)
+        except ValueError:
+            return {}
+
+    def update(self, digest: str, **fields) -> Dict:
+        """Merge fields into the cached entry for a digest and return it."""
+        entry = self.get(digest)
+        entry.update(fields)
+        self.store.put(digest, json.dumps(entry, default=str).encode("utf-8"))
+        return entry
+
+_default_cache: Optional[ExtractionCache] = None
+
+def get_extraction_cache() -> ExtractionCache:
+    """Return the process-wide extraction cache."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ExtractionCache()
+    return _default_cache
@@ -0,0 +1,156 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, MutableMapping, Optional
+import threading
+
+from app.utils.extraction_cache import ExtractionCache, get_extraction_cache
+from app.utils.pdf_engine import clean_metadata, open_reader
+from app.utils.pdf_source import PDFSource, source_digest, source_name
+from app.utils.search_index import SearchIndex, get_search_index
+
+# Pages decoded up front for the preview
+PREVIEW_PAGES = 3
+
+# Documents kept per store (per session), least recently used first out
+MAX_STORED_DOCUMENTS = 4
+
+class LazyDocument:
+    def __init__(
+        self,
+        source: PDFSource,
+        preview_pages: int = PREVIEW_PAGES,
+        name: Optional[str] = None,
+        cache: Optional[ExtractionCache] = None,
+        digest: Optional[str] = None,
+        index: Optional[SearchIndex] = None
+    ):
+        """Decode the first pages and metadata now, the rest in a background thread.
+
+        Time to first preview depends only on ``preview_pages``. Poll
+        ``progress``/``done`` from the page; once complete, the page texts
+        and metadata are written to the extraction cache so later parses of
+        the same bytes are a cache hit, and the document is added to the
+        search index.
+        """
+        self.cache = cache or get_extraction_cache()
+        self.index = index or get_search_index()
+        self.digest = digest or source_digest(source)
+        self.name = name or source_name(source)
+        self.error: Optional[str] = None
+        self._pages: List[str] = []
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+        self._thread = None
+
+        entry = self.cache.get(self.digest)
+        if "page_texts" in entry and "metadata" in entry:
+            self._pages = entry["page_texts"]
+            self._metadata = entry["metadata"]
+            self.num_pages = len(self._pages)
+            self.index.add_pdf(self.digest, self.metadata, self._pages)
+            self._finished.set()
+            return
+
+        reader = open_reader(source)
+        self.num_pages = len(reader.pages)
+        self._metadata = clean_metadata(reader.metadata or {}, self.num_pages)
+        for page_num in range(min(preview_pages, self.num_pages)):
+            self._pages.append(reader.pages[page_num].extract_text() or "")
+
+        if len(self._pages) == self.num_pages:
+            self._complete()
+        else:
+            self._thread = threading.Thread(target=self._extract_rest, args=(reader,), daemon=True)
+            self._thread.start()
+
+    def _extract_rest(self, reader):
+        """Decode the remaining pages; runs on the background thread."""
+        try:
+            for page_num in range(len(self._pages), self.num_pages):
+                text = reader.pages[page_num].extract_text() or ""
+                with self._lock:
+                    self._pages.append(text)
+            self._complete()
+        except Exception as e:
+            self.error = str(e)
+            print(f"Error extracting PDF in background: {e}")
+            self._finished.set()
+
+    def _complete(self):
+        """Store the finished extraction and mark the document done."""
+        self.cache.update(self.digest, page_texts=self._pages, metadata=self._metadata)
+        self.index.add_pdf(self.digest, self.metadata, self._pages)
+        self._finished.set()
+
+    @property
+    def metadata(self) -> Dict:
+        """Document metadata, with the file name as title fallback."""
+        metadata = dict(self._metadata)
+        if not metadata['title']:
+            metadata['title'] = Path(self.name).stem if self.name else "Untitled"
+        return metadata
+
+    @property
+    def pages_done(self) -> int:
+        """Number of pages decoded so far."""
+        return len(self._pages)
+
+    @property
+    def progress(self) -> float:
+        """Fraction of pages decoded, between 0 and 1."""
+        return self.pages_done / self.num_pages if self.num_pages else 1.0
+
+    @property
+    def done(self) -> bool:
+        """Whether extraction has finished (successfully or not)."""
+        return self._finished.is_set()
+
+    def preview_text(self, max_chars: int = 1000) -> str:
+        """Return the start of the text from the pages decoded so far."""
+        with self._lock:
+            pages = list(self._pages)
+        preview = []
+        length = 0
+        for text in pages:
+            preview.append(text)
+            length += len(text)
+            if length >= max_chars:
+                break
+        return "\n\n".join(preview)[:max_chars]
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until extraction finishes; return whether it did."""
+        return self._finished.wait(timeout)
+
+    def page_texts(self, timeout: Optional[float] = None) -> List[str]:
+        """Return every page's text, waiting for the background worker."""
+        if not self.wait(timeout):
+            raise TimeoutError("PDF extraction is still running")
+        if self.error:
+            raise RuntimeError(self.error)
+        return list(self._pages)
+
+    def text(self, timeout: Optional[float] = None) -> str:
+        """Return the full text, pages joined by blank lines, once extracted."""
+        return "\n\n".join(self.page_texts(timeout))
+
+
+def lazy_document_for(
+    source: PDFSource,
+    store: MutableMapping,
+    preview_pages: int = PREVIEW_PAGES
+) -> LazyDocument:
+    """Return the LazyDocument for a source, reusing one kept in ``store``.
+
+    Pass ``st.session_state`` as the store so reruns poll the same
+    background extraction instead of starting a new one. Only the
+    ``MAX_STORED_DOCUMENTS`` most recently used documents are kept.
+    """
+    documents = store.setdefault("lazy_documents", OrderedDict())
+    digest = source_digest(source)
+    if digest not in documents or documents[digest].error:
+        documents[digest] = LazyDocument(source, preview_pages, digest=digest)
+    documents.move_to_end(digest)
+    while len(documents) > MAX_STORED_DOCUMENTS:
+        documents.popitem(last=False)
+    return documents[digest]
@@ -0,0 +1,76 @@
+from typing import Dict, Optional
+import hashlib
+import json
+import os
+import time
+
+from app.utils.disk_cache import DiskCache
+
+# Default cap for cached LLM responses on disk
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Seconds a cached response stays valid
+DEFAULT_TTL = float(os.getenv("WOOHOO_LLM_CACHE_TTL", 30 * 24 * 3600))
+
+def llm_cache_key(model: str, system: str, prompt: str, options: Optional[Dict] = None) -> str:
+    """Return the cache key for a request: the SHA-256 of everything that shapes the reply."""
+    request = json.dumps(
+        {"model": model, "system": system, "prompt": prompt, "options": options or {}},
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+class LLMCache:
+    def __init__(self, cache_dir: str = "data/cache/llm", max_bytes: int = DEFAULT_MAX_BYTES, ttl: float = DEFAULT_TTL):
+        """Initialize the LLM response cache, keyed by ``llm_cache_key``.
+
+        Entries expire ``ttl`` seconds after they were written and the
+        least recently used ones are evicted past ``max_bytes``. Hits and
+        misses are counted on disk, across every process using the cache.
+        """
+        self.store = DiskCache(cache_dir, max_bytes, suffix=".json")
+        self.ttl = ttl
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None if missing or expired."""
+        entry = None
+        data = self.store.get(key)
+        if data is not None:
+            try:
+                entry = json.loads(data)
+            except ValueError:
+                entry = None
+            if entry is not None and time.time() - entry.get("created", 0) > self.ttl:
+                self.store.remove(key)
+                entry = None
+        if entry is None:
+            self.store.count(misses=1)
+        else:
+            self.store.count(hits=1)
+        return entry["response"] if entry else None
+
+    def put(self, key: str, response: str):
+        """Store a response under a key."""
+        entry = {"response": response, "created": time.time()}
+        self.store.put(key, json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters and the cache's size on disk."""
+        counters = self.store.counters()
+        hits, misses = counters.get("hits", 0), counters.get("misses", 0)
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "bytes": self.store.size()
+        }
+
+_default_cache: Optional[LLMCache] = None
+
+def get_llm_cache() -> LLMCache:
+    """Return the process-wide LLM response cache."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = LLMCache()
+    return _default_cache
@@ -0,0 +1,95 @@
+from typing import Iterable, Iterator, Optional, Tuple
+
+# Bitrates in kbps by (MPEG version, layer), indexed by the header's bitrate bits
+BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+# Sample rates by MPEG version (2.5 is stored as 3), indexed by the header's rate bits
+SAMPLE_RATES = {1: (44100, 48000, 32000), 2: (22050, 24000, 16000), 3: (11025, 12000, 8000)}
+
+# Header bits for the MPEG version: 0 is 2.5, 2 is 2, 3 is 1 (1 is reserved)
+VERSIONS = {0: 3, 2: 2, 3: 1}
+
+ID3V1_SIZE = 128
+
+# A frame header: (frame length in bytes, samples, sample rate, side info length)
+Header = Tuple[int, int, int, int]
+
+def _header(data: bytes, pos: int) -> Optional[Header]:
+    """Parse the frame header at ``pos``, or return None if there isn't a valid one."""
+    if pos + 4 > len(data) or data[pos] != 0xFF or data[pos + 1] & 0xE0 != 0xE0:
+        return None
+    version = VERSIONS.get((data[pos + 1] >> 3) & 3)
+    layer = 4 - ((data[pos + 1] >> 1) & 3)
+    bitrate_index = data[pos + 2] >> 4
+    rate_index = (data[pos + 2] >> 2) & 3
+    if version is None or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    bitrate = BITRATES[(min(version, 2), layer)][bitrate_index] * 1000
+    sample_rate = SAMPLE_RATES[version][rate_index]
+    padding = (data[pos + 2] >> 1) & 1
+    mono = data[pos + 3] >> 6 == 3
+    if layer == 1:
+        return (12 * bitrate // sample_rate + padding) * 4, 384, sample_rate, 0
+    if layer == 2:
+        return 144 * bitrate // sample_rate + padding, 1152, sample_rate, 0
+    crc = 0 if data[pos + 1] & 1 else 2
+    if version == 1:
+        return 144 * bitrate // sample_rate + padding, 1152, sample_rate, (17 if mono else 32) + crc
+    return 72 * bitrate // sample_rate + padding, 576, sample_rate, (9 if mono else 17) + crc
+
+def strip_tags(data: bytes) -> bytes:
+    """Remove a leading ID3v2 tag and a trailing ID3v1 tag."""
+    if data[:3] == b"ID3" and len(data) >= 10:
+        # Syncsafe size: 7 bits per byte, plus a 10-byte footer if flagged
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        data = data[10 + size + (10 if data[5] & 0x10 else 0):]
+    if len(data) >= ID3V1_SIZE and data[-ID3V1_SIZE:-ID3V1_SIZE + 3] == b"TAG":
+        data = data[:-ID3V1_SIZE]
+    return data
+
+def _is_info_frame(frame: bytes, side_info: int) -> bool:
+    """Whether a frame is a Xing/Info/VBRI header describing the whole file rather than audio."""
+    return frame[4 + side_info:8 + side_info] in (b"Xing", b"Info") or frame[36:40] == b"VBRI"
+
+def iter_frames(data: bytes) -> Iterator[Tuple[bytes, int, int]]:
+    """Yield (frame, samples, sample rate) for each audio frame of an MP3.
+
+    Tags and Xing/Info/VBRI header frames are skipped, and so is anything
+    between frames: a header only counts if the next frame, or the end of
+    the data, follows it.
+    """
+    data = strip_tags(data)
+    pos = 0
+    while pos < len(data):
+        header = _header(data, pos)
+        if header is not None:
+            length, samples, sample_rate, side_info = header
+            end = pos + length
+            if end == len(data) or (end < len(data) and _header(data, end) is not None):
+                frame = data[pos:end]
+                if not _is_info_frame(frame, side_info):
+                    yield frame, samples, sample_rate
+                pos = end
+                continue
+        pos = data.find(b"\xff", pos + 1)
+        if pos == -1:
+            return
+
+def concat_mp3(parts: Iterable[bytes]) -> bytes:
+    """Join MP3 files frame by frame, without re-encoding.
+
+    Each part's tags and VBR header are dropped, since they would describe
+    that part alone; the result is a plain stream of audio frames.
+    """
+    return b"".join(frame for part in parts for frame, _, _ in iter_frames(part))
+
+def mp3_duration(data: bytes) -> float:
+    """Return the playing time of an MP3 in seconds, counted frame by frame."""
+    return sum(samples / sample_rate for _, samples, sample_rate in iter_frames(data))
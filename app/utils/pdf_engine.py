@@ -0,0 +1,166 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+import os
+import re
+import PyPDF2
+
+from app.utils.pdf_source import PDFSource, open_stream, picklable_source
+
+# Documents shorter than this are extracted serially; spinning up a process
+# pool costs more than it saves on a handful of pages.
+PARALLEL_MIN_PAGES = 40
+
+# Each worker receives a few page ranges so a slow range does not stall the pool.
+RANGES_PER_WORKER = 4
+
+# Per-process reader, set up once by the pool initializer.
+_worker_reader = None
+
+
+def default_workers() -> int:
+    """Return the configured worker count (WOOHOO_PDF_WORKERS or CPU count)."""
+    configured = os.getenv("WOOHOO_PDF_WORKERS")
+    if configured:
+        try:
+            return max(1, int(configured))
+        except ValueError:
+            pass
+    return os.cpu_count() or 1
+
+
+def clean_text(text: str) -> str:
+    """Clean extracted text by removing artifacts and normalizing spacing."""
+    # Remove multiple spaces and normalize whitespace
+    text = re.sub(r'\s+', ' ', text)
+
+    # Remove page numbers
+    text = re.sub(r'\n\d+\n', '\n', text)
+    text = re.sub(r'^\d+$', '', text, flags=re.MULTILINE)
+
+    # Remove hyphenation at line breaks
+    text = re.sub(r'(\w+)-\s*\n\s*(\w+)', r'\1\2', text)
+
+    # Fix common PDF artifacts
+    text = text.replace('ﬁ', 'fi')
+    text = text.replace('ﬂ', 'fl')
+    text = text.replace('−', '-')
+    text = text.replace('…', '...')
+
+    # Normalize quotes and apostrophes
+    text = text.replace('\u201c', '"').replace('\u201d', '"')
+    text = text.replace('\u2018', "'").replace('\u2019', "'")
+
+    # Remove excessive newlines
+    text = re.sub(r'\n{3,}', '\n\n', text)
+
+    return text.strip()
+
+
+def clean_metadata(metadata: Dict, num_pages: int) -> Dict:
+    """Clean up a raw PDF info dictionary, such as ``reader.metadata``.
+
+    Values are read by indexing, which resolves PyPDF2's indirect objects;
+    ``.get`` would return them unresolved.
+    """
+    info = {key: metadata[key] for key in metadata}
+    return {
+        'title': str(info['/Title']).strip() if info.get('/Title') else None,
+        'author': str(info['/Author']).strip() if info.get('/Author') else None,
+        'subject': str(info['/Subject']).strip() if info.get('/Subject') else None,
+        'keywords': str(info['/Keywords']).strip() if info.get('/Keywords') else None,
+        'creator': str(info['/Creator']).strip() if info.get('/Creator') else None,
+        'producer': str(info['/Producer']).strip() if info.get('/Producer') else None,
+        'pages': num_pages
+    }
+
+
+def open_reader(source: PDFSource) -> PyPDF2.PdfReader:
+    """Build a reader over a file path, upload or byte buffer without copying it."""
+    return PyPDF2.PdfReader(open_stream(source))
+
+
+def _extract_range(reader: PyPDF2.PdfReader, start: int, stop: int, clean: bool) -> List[str]:
+    """Extract text for pages [start, stop) from an open reader."""
+    texts = []
+    for page_num in range(start, stop):
+        text = reader.pages[page_num].extract_text() or ""
+        texts.append(clean_text(text) if clean else text)
+    return texts
+
+
+def _init_worker(source: PDFSource):
+    """Open the document once per worker process."""
+    global _worker_reader
+    _worker_reader = open_reader(source)
+
+
+def _worker_extract(page_range: Tuple[int, int], clean: bool) -> Tuple[int, List[str]]:
+    """Extract a page range inside a worker process."""
+    start, stop = page_range
+    return start, _extract_range(_worker_reader, start, stop, clean)
+
+
+def _page_ranges(num_pages: int, workers: int) -> List[Tuple[int, int]]:
+    """Split the page count into contiguous ranges for the pool."""
+    num_ranges = min(num_pages, workers * RANGES_PER_WORKER)
+    step = -(-num_pages // num_ranges)
+    return [(start, min(start + step, num_pages)) for start in range(0, num_pages, step)]
+
+
+def iter_pages(source: PDFSource, clean: bool = False) -> Iterator[str]:
+    """Yield page texts one at a time as they are decoded, from a single reader."""
+    reader = open_reader(source)
+    for page in reader.pages:
+        text = page.extract_text() or ""
+        yield clean_text(text) if clean else text
+
+
+def parse_document(
+    source: PDFSource,
+    clean: bool = False,
+    workers: Optional[int] = None,
+    min_parallel_pages: int = PARALLEL_MIN_PAGES
+) -> Tuple[Dict, List[str]]:
+    """Parse a PDF once, returning its raw info dictionary and per-page text.
+
+    Pages are fanned out to a process pool for long documents; small
+    documents, or a worker count of 1, are extracted serially from the
+    reader that was opened for the metadata. Page order is always preserved.
+    """
+    workers = workers or default_workers()
+    reader = open_reader(source)
+    # Index through the reader's dictionary so indirect values are resolved
+    metadata = reader.metadata or {}
+    info = {key: metadata[key] for key in metadata}
+    num_pages = len(reader.pages)
+
+    if workers <= 1 or num_pages < min_parallel_pages:
+        return info, _extract_range(reader, 0, num_pages, clean)
+
+    # Workers open their own reader; drop ours before forking the pool.
+    # Paths are mapped by each worker, buffers have to be sent over.
+    del reader
+    source = picklable_source(source)
+
+    pages: List[str] = []
+    ranges = _page_ranges(num_pages, workers)
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(ranges)),
+        initializer=_init_worker,
+        initargs=(source,)
+    ) as pool:
+        results = dict(pool.map(_worker_extract, ranges, [clean] * len(ranges)))
+
+    for start, _ in ranges:
+        pages.extend(results[start])
+    return info, pages
+
+
+def extract_pages(
+    source: PDFSource,
+    clean: bool = False,
+    workers: Optional[int] = None,
+    min_parallel_pages: int = PARALLEL_MIN_PAGES
+) -> List[str]:
+    """Extract per-page text from a PDF, in parallel for long documents."""
+    return parse_document(source, clean, workers, min_parallel_pages)[1]
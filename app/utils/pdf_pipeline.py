@@ -0,0 +1,179 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import os
+import tempfile
+
+from app.utils.pdf_engine import clean_text, open_reader
+from app.utils.pdf_source import PDFSource
+from app.utils.section_detector import DEFAULT_SECTION, SECTION_HEADER_RE
+
+def default_spill_bytes() -> int:
+    """Return the configured spill threshold (WOOHOO_SPILL_BYTES or 16 MB)."""
+    configured = os.getenv("WOOHOO_SPILL_BYTES")
+    if configured:
+        try:
+            return max(0, int(configured))
+        except ValueError:
+            pass
+    return 16 * 1024 * 1024
+
+# Extracted text stays in memory up to this many bytes, then spills to a
+# temp file on disk.
+DEFAULT_SPILL_BYTES = default_spill_bytes()
+
+# PyPDF2 keeps every resolved object alive for the reader's lifetime, so its
+# object cache is dropped every so often to let decoded pages be freed. The
+# cache is not public API; readers without it are left alone.
+RELEASE_EVERY = 50
+
+# (start, end, title, type) of a header, relative to its page text
+Header = Tuple[int, int, str, str]
+
+
+def decode_pages(source: PDFSource, release_every: int = RELEASE_EVERY) -> Iterator[str]:
+    """Stage 1: yield the raw text of each page as it is decoded."""
+    reader = open_reader(source)
+    resolved_objects = getattr(reader, "resolved_objects", None)
+    for page_num, page in enumerate(reader.pages):
+        if page_num and page_num % release_every == 0 and hasattr(resolved_objects, "clear"):
+            resolved_objects.clear()
+        yield page.extract_text() or ""
+
+
+def detect_headers(pages: Iterable[str]) -> Iterator[Tuple[str, List[Header]]]:
+    """Stage 2: pair each page's raw text with the section headers found in it.
+
+    Headers are matched at line starts, so this runs before cleaning
+    joins the lines.
+    """
+    for text in pages:
+        headers = [
+            (match.start(), match.end(), match.group().strip(), match.lastgroup)
+            for match in SECTION_HEADER_RE.finditer(text)
+        ]
+        yield text, headers
+
+
+def clean_pages(staged_pages: Iterable[Tuple[str, List[Header]]]) -> Iterator[Tuple[str, List[Header]]]:
+    """Stage 3: clean the text between each page's headers, moving the headers to match."""
+    for text, headers in staged_pages:
+        cleaned = ""
+        moved: List[Header] = []
+        position = 0
+        for start, end, title, header_type in headers:
+            body = clean_text(text[position:start])
+            if body:
+                cleaned += body + "\n"
+            moved.append((len(cleaned), len(cleaned) + len(title), title, header_type))
+            cleaned += title + "\n"
+            position = end
+        yield cleaned + clean_text(text[position:]), moved
+
+
+class StreamedDocument:
+    def __init__(self, spill_bytes: int = DEFAULT_SPILL_BYTES):
+        """Initialize an empty document backed by a spooled temp file.
+
+        Text is stored UTF-8 encoded; section spans are byte offsets into it,
+        so only the section list lives in memory once the text has spilled.
+        """
+        self._buffer = tempfile.SpooledTemporaryFile(max_size=spill_bytes, mode="w+b")
+        self._spill_bytes = spill_bytes
+        self._size = 0
+        self._title, self._type = DEFAULT_SECTION
+        self._start = 0
+        self.num_pages = 0
+        self.sections: List[Dict] = []
+
+    def consume(self, staged_pages: Iterable[Tuple[str, List[Header]]]) -> "StreamedDocument":
+        """Stage 4: append pages and close sections as headers go by."""
+        for text, headers in staged_pages:
+            if self.num_pages:
+                self._write("\n")
+            page_offset = self._size
+            for start, end, title, header_type in headers:
+                self._close_section(page_offset + len(text[:start].encode("utf-8")))
+                self._title, self._type = title, header_type
+                self._start = page_offset + len(text[:end].encode("utf-8"))
+            self._write(text)
+            self.num_pages += 1
+        self._close_section(self._size)
+        return self
+
+    def _write(self, text: str):
+        """Append text to the backing buffer."""
+        data = text.encode("utf-8")
+        self._buffer.seek(self._size)
+        self._buffer.write(data)
+        self._size += len(data)
+
+    def _close_section(self, end: int):
+        """Record the section that runs up to ``end``."""
+        self.sections.append({
+            "title": self._title,
+            "type": self._type,
+            "start": self._start,
+            "end": end
+        })
+
+    @property
+    def spilled(self) -> bool:
+        """Whether the text has been moved from memory to disk.
+
+        The buffer rolls over to disk once a write takes it past ``spill_bytes``.
+        """
+        return self._size > self._spill_bytes
+
+    @property
+    def size(self) -> int:
+        """Size of the extracted text in bytes."""
+        return self._size
+
+    def read(self, start: int = 0, end: Optional[int] = None) -> str:
+        """Read a byte range of the extracted text."""
+        end = self._size if end is None else min(end, self._size)
+        self._buffer.seek(start)
+        return self._buffer.read(max(0, end - start)).decode("utf-8", errors="ignore")
+
+    def text(self, limit: Optional[int] = None) -> str:
+        """Return the extracted text, or only its first ``limit`` bytes."""
+        return self.read(0, limit).strip()
+
+    def section_text(self, section: Dict, limit: Optional[int] = None) -> str:
+        """Return a section's body, or only its first ``limit`` bytes."""
+        end = section["end"] if limit is None else min(section["end"], section["start"] + limit)
+        return self.read(section["start"], end).strip()
+
+    def iter_sections(self, limit: Optional[int] = None) -> Iterator[Dict]:
+        """Yield sections with their content, one at a time, skipping blank ones.
+
+        Content is cleaned across page breaks too, so the sections match
+        ``detect_page_sections`` on the same pages.
+        """
+        for section in self.sections:
+            content = clean_text(self.section_text(section, limit))
+            if content:
+                yield {"title": section["title"], "type": section["type"], "content": content}
+
+    def close(self):
+        """Release the backing buffer and any spilled temp file."""
+        self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def stream_document(
+    source: PDFSource,
+    spill_bytes: int = DEFAULT_SPILL_BYTES,
+    release_every: int = RELEASE_EVERY
+) -> StreamedDocument:
+    """Run decode -> section detect -> clean -> consume over a PDF.
+
+    Pages flow through the generator stages one at a time, so peak memory
+    is bounded by the PDF itself plus ``spill_bytes`` of text.
+    """
+    pages = decode_pages(source, release_every)
+    return StreamedDocument(spill_bytes).consume(clean_pages(detect_headers(pages)))
@@ -1,140 +1,112 @@
 from pathlib import Path
-import PyPDF2
-import re
 from typing import Dict, List, Optional
-import tempfile
 import streamlit as st
 
+from app.utils.extraction_cache import ExtractionCache, get_extraction_cache
+from app.utils.pdf_engine import clean_text, extract_pages
+from app.utils.pdf_pipeline import DEFAULT_SPILL_BYTES, stream_document
+from app.utils.pdf_source import source_digest
+from app.utils.search_index import SearchIndex, get_search_index
+from app.utils.section_detector import detect_page_sections
+
+# Uploads larger than this are processed by the streaming pipeline, which
+# keeps at most DEFAULT_SPILL_BYTES of text in memory
+STREAM_ABOVE_BYTES = 32 * 1024 * 1024
+
+# Text returned for a streamed upload: enough to preview the document and
+# each of its sections
+STREAM_PREVIEW_BYTES = 4096
+
 class PDFProcessor:
-    def __init__(self):
-        """Initialize PDF processor."""
-        self.temp_dir = Path(tempfile.gettempdir()) / "woohoo_uploads"
-        self.temp_dir.mkdir(parents=True, exist_ok=True)
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        cache: Optional[ExtractionCache] = None,
+        index: Optional[SearchIndex] = None
+    ):
+        """Initialize PDF processor.
+
+        ``workers`` sets the size of the page extraction pool; by default it
+        follows WOOHOO_PDF_WORKERS or the CPU count. Uploads are parsed
+        straight from their in-memory buffer; only the text of large ones
+        may spill to a temp file. Detected sections are added to the search
+        index.
+        """
+        self.workers = workers
+        self.cache = cache or get_extraction_cache()
+        self.index = index or get_search_index()
     
     def process_uploaded_file(self, uploaded_file) -> Dict:
-        """Process an uploaded PDF file and return extracted information."""
+        """Process an uploaded PDF file and return extracted information.
+
+        Sections are detected on the raw page texts, as the search index
+        does, and only the page texts are cached. Large uploads that are not
+        cached are streamed instead, and their ``full_text`` and section
+        contents are cut to a preview.
+        """
         try:
-            # Save uploaded file to temp directory
-            temp_path = self.temp_dir / uploaded_file.name
-            with open(temp_path, "wb") as f:
-                f.write(uploaded_file.getvalue())
+            digest = source_digest(uploaded_file)
+            page_texts = self.cache.get(digest).get("page_texts")
             
-            # Extract text and metadata
-            with open(temp_path, "rb") as f:
-                pdf = PyPDF2.PdfReader(f)
-                
-                # Get basic metadata
-                metadata = {
-                    "title": uploaded_file.name,
-                    "num_pages": len(pdf.pages),
-                    "file_size": uploaded_file.size,
-                }
-                
-                # Extract text from each page
-                full_text = ""
-                page_texts = []
-                
-                for page_num, page in enumerate(pdf.pages):
-                    text = page.extract_text()
-                    text = self._clean_text(text)
-                    page_texts.append(text)
-                    full_text += "\n" + text
-                
-                # Process the full text to find sections
-                sections = self._extract_sections(full_text)
-                
-                # Clean up temp file
-                temp_path.unlink()
-                
-                return {
-                    "metadata": metadata,
-                    "full_text": full_text.strip(),
-                    "sections": sections
-                }
+            if page_texts is None and self.is_large(uploaded_file):
+                return self._process_streamed(uploaded_file, digest)
+            
+            if page_texts is None:
+                # Extract page texts, in parallel for long documents
+                page_texts = extract_pages(uploaded_file, workers=self.workers)
+                self.cache.update(digest, page_texts=page_texts)
+            
+            full_text = "\n".join(self._clean_text(text) for text in page_texts)
+            
+            # Get basic metadata
+            metadata = {
+                "title": uploaded_file.name,
+                "num_pages": len(page_texts),
+                "file_size": uploaded_file.size,
+            }
+            self.index.add_pdf(
+                digest,
+                {"title": Path(uploaded_file.name).stem, "pages": metadata["num_pages"]},
+                page_texts
+            )
+            
+            return {
+                "metadata": metadata,
+                "full_text": full_text.strip(),
+                "sections": self._extract_sections(page_texts)
+            }
                 
         except Exception as e:
             st.error(f"Error processing PDF: {str(e)}")
             return None
     
+    def is_large(self, uploaded_file) -> bool:
+        """Whether an upload is processed by the bounded-memory streaming pipeline."""
+        return uploaded_file.size > STREAM_ABOVE_BYTES
+    
+    def _process_streamed(self, uploaded_file, digest: str, spill_bytes: int = DEFAULT_SPILL_BYTES) -> Dict:
+        """Stream a large upload, indexing it one section at a time."""
+        with stream_document(uploaded_file, spill_bytes=spill_bytes) as document:
+            metadata = {
+                "title": uploaded_file.name,
+                "num_pages": document.num_pages,
+                "file_size": uploaded_file.size,
+            }
+            self.index.add_pdf_sections(
+                digest,
+                {"title": Path(uploaded_file.name).stem, "pages": document.num_pages},
+                document.iter_sections()
+            )
+            return {
+                "metadata": metadata,
+                "full_text": clean_text(document.text(limit=STREAM_PREVIEW_BYTES)),
+                "sections": list(document.iter_sections(limit=STREAM_PREVIEW_BYTES))
+            }
+    
     def _clean_text(self, text: str) -> str:
         """Clean extracted text by removing artifacts and normalizing spacing."""
-        # Remove multiple spaces and normalize whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove page numbers
-        text = re.sub(r'\n\d+\n', '\n', text)
-        text = re.sub(r'^\d+$', '', text, flags=re.MULTILINE)
-        
-        # Remove hyphenation at line breaks
-        text = re.sub(r'(\w+)-\s*\n\s*(\w+)', r'\1\2', text)
-        
-        # Fix common PDF artifacts
-        text = text.replace('ﬁ', 'fi')
-        text = text.replace('ﬂ', 'fl')
-        text = text.replace('−', '-')
-        text = text.replace('…', '...')
-        
-        # Normalize quotes and apostrophes
-        text = text.replace('"', '"').replace('"', '"')
-        text = text.replace(''', "'").replace(''', "'")
-        
-        # Remove excessive newlines
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        
-        return text.strip()
+        return clean_text(text)
     
-    def _extract_sections(self, text: str) -> List[Dict]:
-        """Extract sections from text using improved academic paper structure detection."""
-        sections = []
-        
-        # Common section header patterns in academic papers
-        header_patterns = [
-            # Standard sections
-            r'^(?:(?:\d+\.)?\s*)?(?:ABSTRACT|Abstract)',
-            r'^(?:(?:\d+\.)?\s*)?(?:INTRODUCTION|Introduction)',
-            r'^(?:(?:\d+\.)?\s*)?(?:BACKGROUND|Background)',
-            r'^(?:(?:\d+\.)?\s*)?(?:LITERATURE\s+REVIEW|Literature\s+Review)',
-            r'^(?:(?:\d+\.)?\s*)?(?:METHODOLOGY|Methodology|METHODS|Methods)',
-            r'^(?:(?:\d+\.)?\s*)?(?:RESULTS|Results)',
-            r'^(?:(?:\d+\.)?\s*)?(?:DISCUSSION|Discussion)',
-            r'^(?:(?:\d+\.)?\s*)?(?:CONCLUSION|Conclusion|CONCLUSIONS|Conclusions)',
-            r'^(?:(?:\d+\.)?\s*)?(?:REFERENCES|References|BIBLIOGRAPHY|Bibliography)',
-            r'^(?:(?:\d+\.)?\s*)?(?:APPENDIX|Appendix|APPENDICES|Appendices)',
-            
-            # Numbered sections
-            r'^\d+\.\s+[A-Z][A-Za-z\s]{2,50}$',
-            
-            # Common academic paper subsections
-            r'^(?:(?:\d+\.\d+\.)?\s*)?(?:Research Questions|Objectives|Hypotheses)',
-            r'^(?:(?:\d+\.\d+\.)?\s*)?(?:Data Collection|Analysis|Findings)',
-            r'^(?:(?:\d+\.\d+\.)?\s*)?(?:Theoretical Framework|Conceptual Framework)',
-            r'^(?:(?:\d+\.\d+\.)?\s*)?(?:Limitations|Future Research|Implications)'
-        ]
-        
-        # Combine patterns
-        combined_pattern = '|'.join(f'({pattern})' for pattern in header_patterns)
-        
-        # Split text into potential sections
-        parts = re.split(f'({combined_pattern})', text, flags=re.MULTILINE)
-        
-        current_section = {"title": "Abstract", "content": ""}
-        
-        for part in parts:
-            if part and part.strip():
-                # Check if this part matches any header pattern
-                is_header = any(re.match(pattern, part.strip(), re.MULTILINE) for pattern in header_patterns)
-                
-                if is_header:
-                    # Save previous section if it has content
-                    if current_section["content"].strip():
-                        sections.append(current_section)
-                    current_section = {"title": part.strip(), "content": ""}
-                else:
-                    # Add to current section content
-                    current_section["content"] += " " + part.strip()
-        
-        # Add the last section
-        if current_section["content"].strip():
-            sections.append(current_section)
-        
-        return sections 
\ No newline at end of file
+    def _extract_sections(self, page_texts: List[str]) -> List[Dict]:
+        """Extract sections from raw page texts using academic paper structure detection."""
+        return detect_page_sections(page_texts)
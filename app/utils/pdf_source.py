@@ -0,0 +1,107 @@
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+import hashlib
+import io
+import mmap
+
+from app.utils.disk_cache import file_digest
+
+# A PDF can come from a path on disk, raw bytes, a buffer view, or an
+# in-memory upload (anything with getbuffer(), such as Streamlit's
+# UploadedFile or io.BytesIO).
+PDFSource = Union[str, Path, bytes, bytearray, memoryview, BinaryIO]
+
+
+class BufferStream(io.RawIOBase):
+    def __init__(self, buffer):
+        """Initialize a read-only, seekable stream over a buffer without copying it."""
+        self._view = memoryview(buffer).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._pos = max(0, offset)
+        return self._pos
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else min(len(self._view), self._pos + size)
+        data = self._view[self._pos:end].tobytes()
+        self._pos = max(self._pos, end)
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        """Release the view so the underlying buffer can be resized or freed."""
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+def is_path(source: PDFSource) -> bool:
+    """Whether a source refers to a file on disk."""
+    return isinstance(source, (str, Path))
+
+
+def source_buffer(source: PDFSource) -> memoryview:
+    """Return a zero-copy view of an in-memory source."""
+    if hasattr(source, "getbuffer"):
+        return source.getbuffer()
+    return memoryview(source)
+
+
+def map_file(file_path: Union[str, Path]):
+    """Memory-map a file read-only; empty files fall back to an empty buffer."""
+    with open(file_path, "rb") as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return io.BytesIO(b"")
+
+
+def open_stream(source: PDFSource):
+    """Open a seekable binary stream over a source without copying it.
+
+    Files are memory-mapped; uploads and byte buffers are read through
+    their buffer directly.
+    """
+    if is_path(source):
+        return map_file(source)
+    return BufferStream(source_buffer(source))
+
+
+def picklable_source(source: PDFSource) -> Union[str, bytes]:
+    """Return a form of the source that can be sent to worker processes."""
+    if is_path(source):
+        return str(source)
+    return bytes(source_buffer(source))
+
+
+def source_digest(source: PDFSource) -> str:
+    """Return the SHA-256 of a source's bytes, hashing buffers in place."""
+    if is_path(source):
+        return file_digest(str(source))
+    with source_buffer(source) as view:
+        return hashlib.sha256(view).hexdigest()
+
+
+def source_name(source: PDFSource) -> Optional[str]:
+    """Return the file name of a source, if it has one."""
+    if is_path(source):
+        return Path(source).name
+    return getattr(source, "name", None)
@@ -0,0 +1,212 @@
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import json
+import re
+import sqlite3
+import time
+
+from app.utils.section_detector import detect_page_sections
+
+DEFAULT_DB_PATH = "data/search.sqlite3"
+
+# Long sections are indexed as several passages so hits point at a
+# readable span rather than a whole chapter.
+PASSAGE_CHARS = 2000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    title TEXT NOT NULL,
+    source TEXT NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS passages USING fts5(
+    doc_id UNINDEXED,
+    title,
+    section,
+    body,
+    tokenize = 'porter unicode61'
+);
+"""
+
+# bm25 column weights for (doc_id, title, section, body)
+BM25_WEIGHTS = (0.0, 4.0, 2.0, 1.0)
+
+def _split_passages(text: str, max_chars: int = PASSAGE_CHARS) -> List[str]:
+    """Split text into passages of at most ``max_chars``, on sentence ends where possible."""
+    passages = []
+    # Walk an offset rather than re-slicing the rest, which is quadratic
+    # on the long sections of large documents
+    start = 0
+    while len(text) - start > max_chars:
+        cut = text.rfind(". ", start, start + max_chars) - start
+        cut = cut + 1 if cut > max_chars // 2 else max_chars
+        passages.append(text[start:start + cut].strip())
+        start += cut
+    if text[start:].strip():
+        passages.append(text[start:].strip())
+    return passages
+
+def _match_query(query: str) -> Optional[str]:
+    """Turn free text into an FTS5 query: every word required, last one as a prefix."""
+    words = re.findall(r"\w+", query.lower())
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+class SearchIndex:
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        """Initialize a full-text index over PDF sections and Zotero abstracts.
+
+        Documents are added incrementally at ingest time and skipped if
+        already indexed; queries are ranked with BM25.
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def has_document(self, doc_id: str) -> bool:
+        """Check whether a document is already indexed."""
+        with self._connect() as conn:
+            return conn.execute("SELECT 1 FROM documents WHERE doc_id = ?", (doc_id,)).fetchone() is not None
+
+    def _add(self, doc_id: str, kind: str, title: str, source: Dict, passages: Iterable[tuple]) -> bool:
+        """Index a document's (section, body) passages in one transaction."""
+        with self._connect() as conn:
+            if conn.execute("SELECT 1 FROM documents WHERE doc_id = ?", (doc_id,)).fetchone():
+                return False
+            conn.execute(
+                "INSERT INTO documents (doc_id, kind, title, source, indexed_at) VALUES (?, ?, ?, ?, ?)",
+                (doc_id, kind, title, json.dumps(source, default=str), time.time())
+            )
+            conn.executemany(
+                "INSERT INTO passages (doc_id, title, section, body) VALUES (?, ?, ?, ?)",
+                ((doc_id, title, section, body) for section, body in passages)
+            )
+        return True
+
+    def add_pdf(
+        self,
+        digest: str,
+        metadata: Dict,
+        page_texts: List[str],
+        path: Optional[str] = None
+    ) -> bool:
+        """Index a PDF by section, detecting the sections from its raw page texts.
+
+        Returns False if the document was already indexed.
+        """
+        if self.has_document(f"pdf:{digest}"):
+            return False
+        return self.add_pdf_sections(digest, metadata, detect_page_sections(page_texts), path)
+
+    def add_pdf_sections(
+        self,
+        digest: str,
+        metadata: Dict,
+        sections: Iterable[Dict],
+        path: Optional[str] = None
+    ) -> bool:
+        """Index a PDF from sections already detected, such as a StreamedDocument's.
+
+        ``sections`` is consumed one at a time and must follow the rule of
+        ``detect_page_sections``. Returns False if the document was
+        already indexed.
+        """
+        doc_id = f"pdf:{digest}"
+        if self.has_document(doc_id):
+            return False
+        title = metadata.get('title') or "Untitled"
+        passages = (
+            (section['title'], passage)
+            for section in sections
+            for passage in _split_passages(section['content'])
+        )
+        return self._add(doc_id, "pdf", title, {'path': path, 'metadata': metadata}, passages)
+
+    def add_zotero_items(self, items: List[Dict]) -> int:
+        """Index the titles and abstracts of Zotero items; return how many were new."""
+        added = 0
+        for item in items:
+            data = item.get('data', {})
+            abstract = data.get('abstractNote', '')
+            passages = [("Abstract", passage) for passage in _split_passages(abstract)] or [("", "")]
+            if self._add(f"zotero:{item.get('key', data.get('key'))}", "zotero", data.get('title', 'Untitled'), item, passages):
+                added += 1
+        return added
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """Return the best matching passages, most relevant first.
+
+        Each hit carries the document title, section, a highlighted
+        ``snippet``, the passage ``text`` and a ready-to-use ``source``.
+        """
+        match = _match_query(query)
+        if match is None:
+            return []
+        with self._connect() as conn:
+            # Rank first, then build snippets for the top rows only: the
+            # CROSS JOIN makes SQLite look each ranked row up by rowid
+            # instead of running the match over every passage again
+            rows = conn.execute(
+                f"""
+                WITH ranked AS (
+                    SELECT rowid, bm25(passages, {', '.join(map(str, BM25_WEIGHTS))}) AS score
+                    FROM passages WHERE passages MATCH :match
+                    ORDER BY score LIMIT :limit
+                )
+                SELECT p.doc_id, p.title, p.section, p.body, d.kind, d.source, ranked.score,
+                       snippet(passages, 3, '**', '**', '…', 16) AS snippet
+                FROM ranked
+                CROSS JOIN passages p ON p.rowid = ranked.rowid AND passages MATCH :match
+                JOIN documents d ON d.doc_id = p.doc_id
+                ORDER BY ranked.score
+                """,
+                {"match": match, "limit": limit}
+            ).fetchall()
+        return [self._hit(row) for row in rows]
+
+    def _hit(self, row: sqlite3.Row) -> Dict:
+        """Turn a result row into a hit with a source usable by Generator."""
+        stored = json.loads(row["source"])
+        if row["kind"] == "zotero":
+            source = stored
+        else:
+            metadata = dict(stored['metadata'])
+            metadata['title'] = f"{row['title']} — {row['section']}" if row['section'] else row['title']
+            source = {'type': 'pdf', 'path': stored.get('path'), 'metadata': metadata, 'text': row["body"]}
+        return {
+            "doc_id": row["doc_id"],
+            "kind": row["kind"],
+            "title": row["title"],
+            "section": row["section"],
+            "snippet": row["snippet"],
+            "text": row["body"],
+            "score": -row["score"],
+            "source": source
+        }
+
+    def remove(self, doc_id: str):
+        """Drop a document and its passages from the index."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM passages WHERE doc_id = ?", (doc_id,))
+            conn.execute("DELETE FROM documents WHERE doc_id = ?", (doc_id,))
+
+_default_index: Optional[SearchIndex] = None
+
+def get_search_index() -> SearchIndex:
+    """Return the process-wide search index."""
+    global _default_index
+    if _default_index is None:
+        _default_index = SearchIndex()
+    return _default_index
@@ -0,0 +1,87 @@
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.utils.pdf_engine import clean_text
+
+# Common section header patterns in academic papers, keyed by header type.
+# Order matters: at any position the first pattern that matches wins.
+# Whitespace is matched with [ \t] so that no pattern crosses a line.
+HEADER_PATTERNS = [
+    # Standard sections
+    ("abstract", r'(?:\d+\.)?[ \t]*(?:ABSTRACT|Abstract)'),
+    ("introduction", r'(?:\d+\.)?[ \t]*(?:INTRODUCTION|Introduction)'),
+    ("background", r'(?:\d+\.)?[ \t]*(?:BACKGROUND|Background)'),
+    ("literature_review", r'(?:\d+\.)?[ \t]*(?:LITERATURE[ \t]+REVIEW|Literature[ \t]+Review)'),
+    ("methods", r'(?:\d+\.)?[ \t]*(?:METHODOLOGY|Methodology|METHODS|Methods)'),
+    ("results", r'(?:\d+\.)?[ \t]*(?:RESULTS|Results)'),
+    ("discussion", r'(?:\d+\.)?[ \t]*(?:DISCUSSION|Discussion)'),
+    ("conclusion", r'(?:\d+\.)?[ \t]*(?:CONCLUSION|Conclusion|CONCLUSIONS|Conclusions)'),
+    ("references", r'(?:\d+\.)?[ \t]*(?:REFERENCES|References|BIBLIOGRAPHY|Bibliography)'),
+    ("appendix", r'(?:\d+\.)?[ \t]*(?:APPENDIX|Appendix|APPENDICES|Appendices)'),
+
+    # Numbered sections
+    ("numbered", r'\d+\.[ \t]+[A-Z][A-Za-z \t]{2,50}'),
+
+    # Common academic paper subsections
+    ("research_questions", r'(?:\d+\.\d+\.)?[ \t]*(?:Research Questions|Objectives|Hypotheses)'),
+    ("analysis", r'(?:\d+\.\d+\.)?[ \t]*(?:Data Collection|Analysis|Findings)'),
+    ("framework", r'(?:\d+\.\d+\.)?[ \t]*(?:Theoretical Framework|Conceptual Framework)'),
+    ("limitations", r'(?:\d+\.\d+\.)?[ \t]*(?:Limitations|Future Research|Implications)'),
+]
+
+# One alternation with a named group per header type, compiled once.
+# ``match.lastgroup`` tells which header type matched. A header is a whole
+# line, so prose that merely starts with "Results" or "Findings" is not one;
+# detect on raw text, before cleaning joins the lines.
+SECTION_HEADER_RE = re.compile(
+    '^[ \t]*(?:' + '|'.join(f'(?P<{name}>{pattern})' for name, pattern in HEADER_PATTERNS) + ')[ \t]*$',
+    re.MULTILINE
+)
+
+# Title and type of the section that precedes the first detected header
+DEFAULT_SECTION = ("Abstract", "abstract")
+
+Span = Tuple[str, Optional[str], int, int]
+
+
+def iter_section_spans(text: str, default: Tuple[str, Optional[str]] = DEFAULT_SECTION) -> Iterator[Span]:
+    """Yield (title, type, start, end) for every section in a single scan.
+
+    ``start`` and ``end`` delimit the section body in ``text``; the header
+    itself is excluded. Sections with blank bodies are still yielded.
+    """
+    title, header_type = default
+    start = 0
+    for match in SECTION_HEADER_RE.finditer(text):
+        yield title, header_type, start, match.start()
+        title, header_type = match.group().strip(), match.lastgroup
+        start = match.end()
+    yield title, header_type, start, len(text)
+
+
+def detect_sections(text: str) -> List[Dict]:
+    """Split text into sections with ``title``, ``type`` and ``content``.
+
+    Sections whose body is blank are dropped, as a header immediately
+    followed by another header carries no content of its own.
+    """
+    sections = []
+    for title, header_type, start, end in iter_section_spans(text):
+        content = text[start:end].strip()
+        if content:
+            sections.append({"title": title, "type": header_type, "content": content})
+    return sections
+
+
+def detect_page_sections(page_texts: List[str]) -> List[Dict]:
+    """Detect sections on raw page texts, then clean each section's content.
+
+    This is the rule every ingestion path uses, so a document gets the
+    same sections however it was first read.
+    """
+    sections = []
+    for section in detect_sections("\n".join(page_texts)):
+        content = clean_text(section["content"])
+        if content:
+            sections.append({**section, "content": content})
+    return sections
@@ -0,0 +1,124 @@
+from typing import Dict, List
+import json
+import re
+
+# Most chapters and tags kept from a structured reply
+MAX_CHAPTERS = 12
+MAX_TAGS = 8
+
+# JSON schema a structured episode reply must follow (Ollama ``format``)
+EPISODE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "script": {"type": "string"},
+        "summary": {"type": "string"},
+        "chapters": {"type": "array", "items": {"type": "string"}},
+        "tags": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["script", "summary", "chapters", "tags"]
+}
+
+# A reply wrapped in a Markdown code fence
+CODE_FENCE_RE = re.compile(r"^```(?:json)?\s*(.*?)\s*```$", re.DOTALL)
+
+# "Summary:", "**Tags:**" or "## Chapters" labels starting a line of a plain-text reply
+LABEL_RE = re.compile(
+    r"^[ \t]*(?:#+[ \t]*)?(?:\*\*)?(summary|chapters|tags)(?:\*\*)?[ \t]*(?::(?:\*\*)?[ \t]*|$)",
+    re.IGNORECASE | re.MULTILINE
+)
+
+# List markers before an item: "-", "*", "1." or "1)"
+LIST_MARKER_RE = re.compile(r"^(?:[-*\u2022]|\d+[.)])\s+")
+
+# Markdown headings, taken as chapter titles when a reply has no chapter list
+HEADING_RE = re.compile(r"^#{1,3}\s+(.+?)\s*#*$", re.MULTILINE)
+
+# A string field of a JSON object, closed or cut off by the end of the reply
+JSON_STRING_FIELD_RE = re.compile(r'"(script|summary)"\s*:\s*"((?:[^"\\]|\\.)*)(")?', re.DOTALL)
+
+# A \u escape cut off at the end of a truncated string
+PARTIAL_ESCAPE_RE = re.compile(r"\\u[0-9a-fA-F]{0,3}$")
+
+def _load_json(reply: str):
+    """Parse a JSON object from a reply, tolerating code fences and surrounding prose."""
+    text = reply.strip()
+    fenced = CODE_FENCE_RE.match(text)
+    if fenced:
+        text = fenced.group(1)
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        try:
+            return json.loads(text[start:end + 1])
+        except ValueError:
+            pass
+    return None
+
+def _load_truncated_json(text: str) -> Dict:
+    """Recover the string fields of a JSON object cut off mid-reply, such as by ``num_predict``.
+
+    A field whose string is cut off keeps the text up to the cut; the
+    lists, which follow the strings, are lost.
+    """
+    episode = {}
+    for match in JSON_STRING_FIELD_RE.finditer(text):
+        for body in (match.group(2), PARTIAL_ESCAPE_RE.sub("", match.group(2))):
+            try:
+                episode.setdefault(match.group(1), json.loads(f'"{body}"'))
+                break
+            except ValueError:
+                continue
+    return episode
+
+def _parse_text(reply: str) -> Dict:
+    """Read an episode from a plain-text reply: a script with optional labelled parts."""
+    parts = LABEL_RE.split(reply)
+    episode = {"script": parts[0].strip()}
+    for label, content in zip(parts[1::2], parts[2::2]):
+        episode[label.lower()] = content.strip()
+    if "chapters" not in episode:
+        episode["chapters"] = HEADING_RE.findall(episode["script"])
+    return episode
+
+def _string_list(value, limit: int, lower: bool = False) -> List[str]:
+    """Coerce a list, or a comma/line separated string, into unique non-empty strings."""
+    if isinstance(value, str):
+        value = re.split(r"[\n,;]", value)
+    if not isinstance(value, list):
+        return []
+    items = []
+    for item in value:
+        item = LIST_MARKER_RE.sub("", str(item).strip()).strip()
+        if lower:
+            item = item.lower()
+        if item and item not in items:
+            items.append(item)
+    return items[:limit]
+
+def parse_episode(reply: str) -> Dict:
+    """Validate a structured episode reply into ``script``, ``summary``, ``chapters`` and ``tags``.
+
+    JSON is expected; JSON cut off before its end keeps the script written
+    so far, and anything else is read as a plain-text script. Raises
+    ValueError if the reply holds no script.
+    """
+    episode = _load_json(reply)
+    if not isinstance(episode, dict) or not isinstance(episode.get("script"), str):
+        text = reply.strip()
+        if text.startswith("```"):
+            text = text.split("\n", 1)[-1]
+        # Never read raw JSON out loud as the script
+        episode = _load_truncated_json(text) if text.startswith("{") else _parse_text(reply)
+    script = episode.get("script", "").strip()
+    if not script:
+        raise ValueError("Structured reply has no script")
+    summary = episode.get("summary")
+    return {
+        "script": script,
+        "summary": summary.strip() if isinstance(summary, str) else "",
+        "chapters": _string_list(episode.get("chapters"), MAX_CHAPTERS),
+        "tags": _string_list(episode.get("tags"), MAX_TAGS, lower=True)
+    }
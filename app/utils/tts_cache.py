@@ -0,0 +1,69 @@
+from typing import Dict, Optional
+import json
+import re
+import unicodedata
+
+from app.utils.disk_cache import DiskCache, sha256_digest
+
+# Default cap for cached speech segments on disk
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+def normalize_segment(text: str) -> str:
+    """Normalize a segment so edits that don't change the speech keep its key."""
+    return WHITESPACE_RE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+def tts_cache_key(text: str, language: str, voice: str = "default", engine: str = "") -> str:
+    """Return the cache key for a segment: the SHA-256 of everything that shapes its audio."""
+    segment = json.dumps(
+        {"engine": engine, "language": language, "voice": voice, "text": normalize_segment(text)},
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return sha256_digest(segment.encode("utf-8"))
+
+class TTSCache:
+    def __init__(self, cache_dir: str = "data/cache/tts", max_bytes: int = DEFAULT_MAX_BYTES):
+        """Initialize the speech segment cache, keyed by ``tts_cache_key``.
+
+        The least recently used segments are evicted past ``max_bytes``.
+        Hits, misses and the bytes of audio served from the cache instead
+        of being synthesized are counted on disk, across the job workers
+        that synthesize speech and the app that shows the numbers.
+        """
+        self.store = DiskCache(cache_dir, max_bytes, suffix=".audio")
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached audio for a key, or None."""
+        data = self.store.get(key)
+        if data is None:
+            self.store.count(misses=1)
+        else:
+            self.store.count(hits=1, bytes_saved=len(data))
+        return data
+
+    def put(self, key: str, audio: bytes):
+        """Store a segment's audio under a key."""
+        self.store.put(key, audio)
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters, bytes saved and the cache's size on disk."""
+        counters = self.store.counters()
+        hits, misses = counters.get("hits", 0), counters.get("misses", 0)
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "bytes_saved": counters.get("bytes_saved", 0),
+            "bytes": self.store.size()
+        }
+
+_default_cache: Optional[TTSCache] = None
+
+def get_tts_cache() -> TTSCache:
+    """Return the process-wide speech segment cache."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = TTSCache()
+    return _default_cache
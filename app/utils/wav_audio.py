@@ -0,0 +1,61 @@
+from typing import Iterable, Tuple
+import io
+import struct
+import wave
+
+# A PCM layout: (channels, sample rate, bytes per sample)
+WavFormat = Tuple[int, int, int]
+
+def read_wav(data: bytes) -> Tuple[WavFormat, bytes]:
+    """Return the PCM layout and samples of a WAV file.
+
+    Chunk sizes that run past the end of the data, as in WAV streamed to
+    a pipe (e.g. ``espeak-ng --stdout``), are cut to the data present.
+    """
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        raise ValueError("Not a WAV file")
+    layout = None
+    pos = 12
+    while pos + 8 <= len(data):
+        chunk_id, size = struct.unpack_from("<4sI", data, pos)
+        body = data[pos + 8:pos + 8 + size]
+        if chunk_id == b"fmt ":
+            encoding, channels, rate, _, _, bits = struct.unpack_from("<HHIIHH", body)
+            if encoding != 1:
+                raise ValueError("Only PCM WAV files are supported")
+            layout = (channels, rate, bits // 8)
+        elif chunk_id == b"data":
+            if layout is None:
+                raise ValueError("WAV data before its format")
+            frame = layout[0] * layout[2]
+            return layout, body[:len(body) - len(body) % frame]
+        # Chunks are padded to an even size
+        pos += 8 + size + (size & 1)
+    raise ValueError("WAV file has no data")
+
+def write_wav(pcm: bytes, layout: WavFormat) -> bytes:
+    """Wrap PCM samples in a WAV file."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as f:
+        f.setnchannels(layout[0])
+        f.setframerate(layout[1])
+        f.setsampwidth(layout[2])
+        f.writeframes(pcm)
+    return buffer.getvalue()
+
+def concat_wav(parts: Iterable[bytes]) -> bytes:
+    """Join WAV files sample by sample; every part must share one PCM layout."""
+    layout = None
+    samples = []
+    for part in parts:
+        part_layout, pcm = read_wav(part)
+        if layout is not None and part_layout != layout:
+            raise ValueError(f"Cannot join WAV files of different layouts: {layout} and {part_layout}")
+        layout = part_layout
+        samples.append(pcm)
+    return write_wav(b"".join(samples), layout) if layout else b""
+
+def wav_duration(data: bytes) -> float:
+    """Return the playing time of a WAV file in seconds."""
+    (channels, rate, width), pcm = read_wav(data)
+    return len(pcm) / (channels * rate * width)
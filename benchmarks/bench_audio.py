@@ -0,0 +1,80 @@
+"""
+Audio post-processing on a synthetic episode.
+
+Builds speech-like WAV pieces (noise bursts shaped like syllables and
+words) with uneven loudness and long leading and trailing silences, as
+TTS pieces come out, then runs AudioPostProcessor over them: decode,
+silence trimming, loudness normalization, crossfades and encoding. It
+reports wall time, the real-time factor on one core, the spread of
+loudness across pieces before and after, and how much silence was cut.
+Run from the repository root:
+
+    python -m benchmarks.bench_audio --minutes 60 --piece-seconds 20
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.utils.audio_processing import AudioPostProcessor, WINDOW_SECONDS, decode, loudness_db, window_energy
+from app.utils.wav_audio import wav_duration, write_wav
+
+RATE = 22050
+
+
+def speech_like(seconds: float, level_db: float, silence: float, rng: np.random.Generator) -> np.ndarray:
+    """Noise bursts about a syllable long, grouped into words, at ``level_db``, padded with silence."""
+    length = int(seconds * RATE)
+    syllables = np.repeat(rng.random(length // 2205 + 1) < 0.8, 2205)[:length]
+    words = np.repeat(rng.random(length // 11025 + 1) < 0.85, 11025)[:length]
+    envelope = syllables * words * np.abs(np.sin(np.arange(length) * np.pi / 2205))
+    samples = rng.standard_normal(length).astype(np.float32) * envelope.astype(np.float32)
+    samples *= 10 ** (level_db / 20) / max(1e-9, np.sqrt(np.mean(samples ** 2)))
+    pad = np.zeros(int(silence * RATE), dtype=np.float32)
+    return np.concatenate([pad, samples, pad])
+
+
+def to_wav(samples: np.ndarray) -> bytes:
+    return write_wav((np.clip(samples, -1, 1) * 32767).astype(np.int16).tobytes(), (1, RATE, 2))
+
+
+def piece_loudness(data: bytes) -> float:
+    samples, rate = decode(data, "wav")
+    return loudness_db(window_energy(samples, int(rate * WINDOW_SECONDS)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=60, help="length of the synthetic episode")
+    parser.add_argument("--piece-seconds", type=float, default=20, help="speech per TTS piece")
+    parser.add_argument("--silence", type=float, default=0.6, help="silence before and after each piece")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    count = max(1, int(args.minutes * 60 / args.piece_seconds))
+    pieces = [
+        to_wav(speech_like(args.piece_seconds, rng.uniform(-32, -14), args.silence, rng))
+        for _ in range(count)
+    ]
+    before = [piece_loudness(piece) for piece in pieces]
+    input_seconds = sum(wav_duration(piece) for piece in pieces)
+
+    processor = AudioPostProcessor(intro_path=None, outro_path=None)
+    start = time.perf_counter()
+    episode = processor.process(pieces, "wav")
+    seconds = time.perf_counter() - start
+    output_seconds = wav_duration(episode)
+
+    # Measure the pieces' loudness in the output, between the crossfades
+    samples, _ = decode(episode, "wav")
+    bounds = np.linspace(0, len(samples), count + 1).astype(int)
+    after = [loudness_db(window_energy(samples[a:b], int(RATE * WINDOW_SECONDS))) for a, b in zip(bounds, bounds[1:])]
+
+    print(f"{count} pieces, {input_seconds / 60:.1f} min in, {output_seconds / 60:.1f} min out")
+    print(f"processing: {seconds:.2f}s  RTF {seconds / input_seconds:.4f}")
+    print(f"loudness spread: {np.ptp(before):.1f} dB before, {np.ptp(after):.1f} dB after")
+    print(f"silence trimmed: {input_seconds - output_seconds:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Batch episode generation against a local fake Ollama server.
+
+Builds episode specs for several profiles that draw overlapping sources
+from a shared pool, then generates them one by one with
+Generator.generate_episode and all at once with Generator.generate_batch,
+reporting wall time and LLM request counts for each. Run from the
+repository root:
+
+    python -m benchmarks.bench_batch --episodes 8 --sources 6 --per-episode 3
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from app.services.generator import Generator
+from app.services.gpt_service import LLMService
+from app.services.tts_service import TTSService
+from app.utils.llm_cache import LLMCache
+from app.utils.tts_cache import TTSCache
+from benchmarks.fake_ollama import FakeOllama
+from benchmarks.fake_tts import FakeTTS
+from benchmarks.synthetic_pdf import academic_pages
+
+
+def make_specs(episodes: int, sources: int, per_episode: int, pages: int, seed: int = 0):
+    """Episode specs drawing ``per_episode`` sources each from a shared pool."""
+    rng = random.Random(seed)
+    pool = [
+        {
+            "type": "pdf",
+            "metadata": {"title": f"Synthetic paper {i}"},
+            "text": "\n".join("\n".join(lines) for lines in academic_pages(pages, seed=i))
+        }
+        for i in range(sources)
+    ]
+    return [
+        {
+            "sources": rng.sample(pool, min(per_episode, sources)),
+            "title": f"Weekly digest {i}",
+            "duration_minutes": 5
+        }
+        for i in range(episodes)
+    ]
+
+
+def run(generate, latency: float, concurrency: int, output_dir: str):
+    """Time ``generate(generator)`` with a fresh fake server and empty LLM cache."""
+    with FakeOllama(latency=latency) as server, tempfile.TemporaryDirectory() as cache_dir:
+        generator = Generator()
+        generator.output_dir = Path(output_dir)
+        generator.llm = LLMService(host=server.url, concurrency=concurrency, cache=LLMCache(cache_dir))
+        generator.tts = TTSService(engine=FakeTTS(latency=0), cache=TTSCache(f"{cache_dir}/tts"))
+        start = time.perf_counter()
+        failures = generate(generator)
+        return time.perf_counter() - start, server.requests, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--episodes", type=int, default=8, help="episodes in the batch")
+    parser.add_argument("--sources", type=int, default=6, help="sources shared by the batch")
+    parser.add_argument("--per-episode", type=int, default=3, help="sources per episode")
+    parser.add_argument("--pages", type=int, default=10, help="pages per synthetic source")
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds per fake request")
+    parser.add_argument("--concurrency", type=int, default=4, help="LLM requests in flight")
+    parser.add_argument("--workers", type=int, default=4, help="episodes generated at once")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        def sequential(generator):
+            specs = make_specs(args.episodes, args.sources, args.per_episode, args.pages)
+            return sum(generator.generate_episode(**spec) is None for spec in specs)
+
+        def batch(generator):
+            specs = make_specs(args.episodes, args.sources, args.per_episode, args.pages)
+            return sum(result["error"] is not None for result in generator.generate_batch(specs, args.workers))
+
+        for name, generate in (("sequential", sequential), ("batch", batch)):
+            seconds, requests, failures = run(generate, args.latency, args.concurrency, output_dir)
+            print(f"{name:>10}: {seconds:6.2f}s  {requests:>4} requests  {failures} failed")
+
+
+if __name__ == "__main__":
+    main()
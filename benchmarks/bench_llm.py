@@ -0,0 +1,69 @@
+"""
+Map-reduce script generation against a local fake Ollama server.
+
+Runs LLMService over a synthetic document at several concurrency limits
+and reports wall time, request count, peak server-side concurrency and
+retried failures, then repeats the run to time the response cache, and
+compares one structured call for script, summary, chapters and tags. No
+model or network access is needed. Run from the repository root:
+
+    python -m benchmarks.bench_llm --pages 30 --latency 0.2 --concurrency 1 4 8
+"""
+import argparse
+import tempfile
+import time
+
+from app.services.gpt_service import LLMService
+from app.utils.llm_cache import LLMCache
+from benchmarks.fake_ollama import FakeOllama
+from benchmarks.synthetic_pdf import academic_pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=30, help="pages in the synthetic document")
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per fake request")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="share of requests failing with 503")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8], help="limits to compare")
+    args = parser.parse_args()
+
+    text = "\n".join("\n".join(lines) for lines in academic_pages(args.pages))
+    sources = [{"type": "pdf", "metadata": {"title": "Synthetic paper"}, "text": text}]
+
+    for concurrency in args.concurrency:
+        with FakeOllama(latency=args.latency, failure_rate=args.failure_rate) as server, \
+                tempfile.TemporaryDirectory() as cache_dir:
+            service = LLMService(host=server.url, concurrency=concurrency, cache=LLMCache(cache_dir))
+            service.client.backoff = 0.05
+            start = time.perf_counter()
+            script, summary = service.generate_script_and_summary(sources, "professional", 5)
+            seconds = time.perf_counter() - start
+            requests = server.requests
+
+            start = time.perf_counter()
+            service.generate_script_and_summary(sources, "professional", 5)
+            repeat = time.perf_counter() - start
+            print(
+                f"concurrency {concurrency:>2}: {seconds:6.2f}s  {requests:>3} requests  "
+                f"peak {server.peak_concurrency:>2} in flight  {server.failures} retried  "
+                f"script {len(script.split())} words  summary {'yes' if summary else 'no'}  "
+                f"repeat {repeat * 1000:.0f} ms ({server.requests - requests} requests)"
+            )
+
+    # Script, summary, chapters and tags in one call instead of script plus summary
+    with FakeOllama(latency=args.latency, failure_rate=args.failure_rate) as server, \
+            tempfile.TemporaryDirectory() as cache_dir:
+        service = LLMService(host=server.url, concurrency=max(args.concurrency), cache=LLMCache(cache_dir))
+        service.client.backoff = 0.05
+        start = time.perf_counter()
+        episode = service.generate_structured(sources, "professional", 5)
+        seconds = time.perf_counter() - start
+        print(
+            f"structured    : {seconds:6.2f}s  {server.requests:>3} requests  "
+            f"script {len(episode['script'].split())} words  {len(episode['chapters'])} chapters  "
+            f"{len(episode['tags'])} tags"
+        )
+
+
+if __name__ == "__main__":
+    main()
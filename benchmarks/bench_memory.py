@@ -0,0 +1,94 @@
+"""
+Peak-RSS regression check for the streaming PDF pipeline.
+
+Builds a synthetic 1,000-page PDF, runs the streaming pipeline and the
+eager extraction path each in a fresh process, and fails (exit status 1)
+if the streaming pipeline's peak RSS grows past the budget. Run from the
+repository root:
+
+    python -m benchmarks.bench_memory --pages 1000 --max-growth-mb 48
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.measure import current_rss_mb, peak_rss_mb, run_isolated
+from benchmarks.synthetic_pdf import write_synthetic_pdf
+
+
+def _run_streaming(path: str, spill_bytes: int) -> dict:
+    from app.utils.pdf_pipeline import stream_document
+    baseline = current_rss_mb()
+    start = time.perf_counter()
+    with stream_document(path, spill_bytes=spill_bytes) as document:
+        sections = sum(1 for _ in document.iter_sections(limit=500))
+        return {
+            "pages": document.num_pages,
+            "sections": sections,
+            "text_mb": document.size / 1e6,
+            "spilled": document.spilled,
+            "seconds": time.perf_counter() - start,
+            "growth_mb": peak_rss_mb() - baseline,
+        }
+
+
+def _run_eager(path: str, spill_bytes: int) -> dict:
+    from app.utils.pdf_engine import clean_text, parse_document
+    from app.utils.section_detector import detect_page_sections
+    baseline = current_rss_mb()
+    start = time.perf_counter()
+    _, pages = parse_document(path, workers=1)
+    sections = detect_page_sections(pages)
+    full_text = "\n".join(clean_text(text) for text in pages)
+    return {
+        "pages": len(pages),
+        "sections": len(sections),
+        "text_mb": len(full_text.encode("utf-8")) / 1e6,
+        "spilled": False,
+        "seconds": time.perf_counter() - start,
+        "growth_mb": peak_rss_mb() - baseline,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--spill-mb", type=float, default=4)
+    parser.add_argument("--max-growth-mb", type=float, default=48)
+    parser.add_argument("--skip-eager", action="store_true", help="only measure the streaming pipeline")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = str(write_synthetic_pdf(Path(workdir) / "synthetic.pdf", args.pages))
+        spill_bytes = int(args.spill_mb * 1024 * 1024)
+        runs = [("streaming", _run_streaming)]
+        if not args.skip_eager:
+            runs.append(("eager", _run_eager))
+
+        reports = {}
+        for name, target in runs:
+            reports[name] = report = run_isolated(target, path, spill_bytes)
+            if "error" in report:
+                print(f"{name:<10} ERROR {report['error']}")
+                continue
+            print(
+                f"{name:<10} {report['pages']} pages, {report['text_mb']:.1f} MB text, "
+                f"{report['sections']} sections, {report['seconds']:.1f} s, "
+                f"peak RSS growth {report['growth_mb']:.1f} MB"
+                + (" (spilled to disk)" if report["spilled"] else "")
+            )
+
+    if "error" in reports["streaming"]:
+        print("FAIL: the streaming pipeline did not finish")
+        sys.exit(1)
+    growth = reports["streaming"]["growth_mb"]
+    if growth > args.max_growth_mb:
+        print(f"FAIL: streaming peak RSS grew {growth:.1f} MB, budget is {args.max_growth_mb:.1f} MB")
+        sys.exit(1)
+    print(f"OK: streaming peak RSS growth within {args.max_growth_mb:.1f} MB budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Sequential vs pipelined episode rendering against local fake LLM and TTS backends.
+
+Generates the same episode with the script and audio stages run one
+after the other, then pipelined so paragraphs are synthesized while the
+script is still streaming, and reports time to first audio and total
+wall time for each. Every run starts with empty LLM and TTS caches. Run
+from the repository root:
+
+    python -m benchmarks.bench_pipeline --minutes 5 --seconds-per-token 0.002 --tts-latency 0.3
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from app.services.generator import Generator
+from app.services.gpt_service import LLMService
+from app.services.tts_service import TTSService
+from app.utils.llm_cache import LLMCache
+from app.utils.tts_cache import TTSCache
+from benchmarks.fake_ollama import FakeOllama
+from benchmarks.fake_tts import FakeTTS
+from benchmarks.synthetic_pdf import academic_pages
+
+
+def run(args, pipelined: bool):
+    """Generate one episode with fresh fakes and caches; return (episode, wall seconds)."""
+    text = "\n".join("\n".join(lines) for lines in academic_pages(args.pages))
+    sources = [{"type": "pdf", "metadata": {"title": "Synthetic paper"}, "text": text}]
+    with FakeOllama(latency=args.latency, seconds_per_token=args.seconds_per_token) as server, \
+            tempfile.TemporaryDirectory() as work_dir:
+        generator = Generator()
+        generator.output_dir = Path(work_dir)
+        generator.llm = LLMService(host=server.url, cache=LLMCache(f"{work_dir}/llm"))
+        generator.tts = TTSService(engine=FakeTTS(latency=args.tts_latency), cache=TTSCache(f"{work_dir}/tts"))
+        start = time.perf_counter()
+        episode = generator.generate_episode(
+            sources, "Pipeline benchmark", duration_minutes=args.minutes, pipelined=pipelined
+        )
+        seconds = time.perf_counter() - start
+        if episode is not None:
+            with open(episode["audio_path"], "rb") as f:
+                episode["audio_seconds"] = generator.tts.duration(f.read())
+        return episode, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=10, help="pages in the synthetic source")
+    parser.add_argument("--minutes", type=int, default=5, help="episode length")
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds per fake LLM request")
+    parser.add_argument("--seconds-per-token", type=float, default=0.002, help="fake LLM generation pace")
+    parser.add_argument("--tts-latency", type=float, default=0.3, help="seconds per fake TTS request")
+    args = parser.parse_args()
+
+    for name, pipelined in (("sequential", False), ("pipelined", True)):
+        episode, seconds = run(args, pipelined)
+        if episode is None:
+            print(f"{name:>10}: failed")
+            continue
+        print(
+            f"{name:>10}: first audio {episode['time_to_first_audio']:6.2f}s  "
+            f"total {seconds:6.2f}s  {episode['audio_seconds']:6.1f}s of audio"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Indexing and query latency for the full-text search index.
+
+Indexes a synthetic corpus of academic-style documents (text only, no PDF
+rendering) and reports documents indexed per second and query latency
+percentiles. Run from the repository root:
+
+    python -m benchmarks.bench_search --documents 2000
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from app.utils.search_index import SearchIndex
+from benchmarks.synthetic_pdf import academic_pages
+
+QUERIES = [
+    "methodology",
+    "results discussion",
+    "qualitative survey",
+    "learn",
+    "cultural education research",
+    "paper 17",
+    "nonexistent term",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--documents", type=int, default=2000, help="documents to index")
+    parser.add_argument("--pages", type=int, default=4, help="pages per document")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per query")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        index = SearchIndex(str(Path(workdir) / "search.sqlite3"))
+        start = time.perf_counter()
+        for doc_num in range(args.documents):
+            pages = ["\n".join(lines) for lines in academic_pages(args.pages, seed=doc_num)]
+            index.add_pdf(f"doc{doc_num}", {"title": f"Paper {doc_num}"}, pages)
+        seconds = time.perf_counter() - start
+        print(f"Indexed {args.documents} documents in {seconds:.1f}s ({args.documents / seconds:.0f} docs/s)")
+
+        for query in QUERIES:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                hits = index.search(query)
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            p95 = timings[int(len(timings) * 0.95) - 1]
+            print(f"{query!r:<32} {len(hits):>3} hits  p50 {statistics.median(timings):6.1f} ms  p95 {p95:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
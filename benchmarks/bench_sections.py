@@ -0,0 +1,111 @@
+"""
+Compare the compiled section detector with the previous _extract_sections.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_sections --pages 500
+"""
+import argparse
+import random
+import re
+import time
+from typing import Dict, List
+
+from app.utils.section_detector import detect_sections
+
+WORDS = (
+    "the of and to in students education agricultural teachers study data "
+    "analysis research participants diversity program university results "
+    "learning experience cultural competence survey interview findings"
+).split()
+
+HEADERS = [
+    "Abstract", "1. Introduction", "2. Background", "Literature Review",
+    "3. Methods", "Data Collection", "Analysis", "4. Results", "Findings",
+    "5. Discussion", "Limitations", "Implications", "6. Conclusions",
+    "References", "Appendix",
+]
+
+
+def legacy_extract_sections(text: str) -> List[Dict]:
+    """The section extraction PDFProcessor used before the compiled detector."""
+    sections = []
+    header_patterns = [
+        r'^(?:(?:\d+\.)?\s*)?(?:ABSTRACT|Abstract)',
+        r'^(?:(?:\d+\.)?\s*)?(?:INTRODUCTION|Introduction)',
+        r'^(?:(?:\d+\.)?\s*)?(?:BACKGROUND|Background)',
+        r'^(?:(?:\d+\.)?\s*)?(?:LITERATURE\s+REVIEW|Literature\s+Review)',
+        r'^(?:(?:\d+\.)?\s*)?(?:METHODOLOGY|Methodology|METHODS|Methods)',
+        r'^(?:(?:\d+\.)?\s*)?(?:RESULTS|Results)',
+        r'^(?:(?:\d+\.)?\s*)?(?:DISCUSSION|Discussion)',
+        r'^(?:(?:\d+\.)?\s*)?(?:CONCLUSION|Conclusion|CONCLUSIONS|Conclusions)',
+        r'^(?:(?:\d+\.)?\s*)?(?:REFERENCES|References|BIBLIOGRAPHY|Bibliography)',
+        r'^(?:(?:\d+\.)?\s*)?(?:APPENDIX|Appendix|APPENDICES|Appendices)',
+        r'^\d+\.\s+[A-Z][A-Za-z\s]{2,50}$',
+        r'^(?:(?:\d+\.\d+\.)?\s*)?(?:Research Questions|Objectives|Hypotheses)',
+        r'^(?:(?:\d+\.\d+\.)?\s*)?(?:Data Collection|Analysis|Findings)',
+        r'^(?:(?:\d+\.\d+\.)?\s*)?(?:Theoretical Framework|Conceptual Framework)',
+        r'^(?:(?:\d+\.\d+\.)?\s*)?(?:Limitations|Future Research|Implications)'
+    ]
+    combined_pattern = '|'.join(f'({pattern})' for pattern in header_patterns)
+    parts = re.split(f'({combined_pattern})', text, flags=re.MULTILINE)
+    current_section = {"title": "Abstract", "content": ""}
+    for part in parts:
+        if part and part.strip():
+            is_header = any(re.match(pattern, part.strip(), re.MULTILINE) for pattern in header_patterns)
+            if is_header:
+                if current_section["content"].strip():
+                    sections.append(current_section)
+                current_section = {"title": part.strip(), "content": ""}
+            else:
+                current_section["content"] += " " + part.strip()
+    if current_section["content"].strip():
+        sections.append(current_section)
+    return sections
+
+
+def synthetic_paper(pages: int, lines_per_page: int = 45, seed: int = 7) -> str:
+    """Build paper-like text with a header line every few pages."""
+    rng = random.Random(seed)
+    lines = []
+    header_every = max(1, pages * lines_per_page // (len(HEADERS) * 4))
+    for line_num in range(pages * lines_per_page):
+        if line_num % header_every == 0:
+            lines.append(HEADERS[(line_num // header_every) % len(HEADERS)])
+        else:
+            lines.append(" ".join(rng.choice(WORDS) for _ in range(12)))
+    return "\n".join(lines)
+
+
+def best_of(func, text: str, repeat: int) -> float:
+    """Return the fastest of several timed runs, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    text = synthetic_paper(args.pages)
+    legacy = legacy_extract_sections(text)
+    current = detect_sections(text)
+    legacy_time = best_of(legacy_extract_sections, text, args.repeat)
+    current_time = best_of(detect_sections, text, args.repeat)
+
+    print(f"pages:     {args.pages} ({len(text) / 1e6:.1f} MB of text)")
+    print(f"sections:  legacy {len(legacy)}, compiled {len(current)}")
+    print(f"titles:    {'identical' if [s['title'] for s in legacy] == [s['title'] for s in current] else 'DIFFER'}")
+    print(f"legacy:    {legacy_time * 1000:.1f} ms")
+    print(f"compiled:  {current_time * 1000:.1f} ms")
+    print(f"speedup:   {legacy_time / current_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+A local fake Ollama HTTP server for exercising the LLM layer offline.
+
+Implements the endpoints the app uses (/api/chat, streaming or not,
+/api/generate for loading models, /api/pull and /api/tags) with configurable latency and failure rate, and
+records request counts and peak concurrency:
+
+    with FakeOllama(latency=0.2, failure_rate=0.1) as server:
+        service = LLMService(host=server.url)
+"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+WORDS_PER_TOKEN = 0.75
+PARAGRAPH_WORDS = 60
+
+
+class FakeOllama:
+    def __init__(
+        self,
+        latency: float = 0.05,
+        seconds_per_token: float = 0.0,
+        failure_rate: float = 0.0,
+        models: Optional[List[str]] = None,
+        seed: int = 7
+    ):
+        """Configure a fake server; start it with ``start()`` or as a context manager.
+
+        Each chat request sleeps ``latency`` plus ``seconds_per_token`` per
+        generated token (paced piece by piece when streaming), and fails
+        with a 503 with probability ``failure_rate``. Requests with a
+        ``format`` get a JSON object with a structured episode's fields.
+        """
+        self.latency = latency
+        self.seconds_per_token = seconds_per_token
+        self.failure_rate = failure_rate
+        self.models = list(models or ["claude"])
+        self.requests = 0
+        self.failures = 0
+        self.pulls = 0
+        self.lists = 0
+        self.loads = 0
+        self.keep_alive = None
+        self.in_flight = 0
+        self.peak_concurrency = 0
+        self.prompts: List[str] = []
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeOllama":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeOllama":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def reply(self, prompt: str, max_tokens: int) -> str:
+        """Deterministic reply text of about ``max_tokens`` tokens, in paragraphs."""
+        words = prompt.split() or ["ok"]
+        count = max(1, int(max_tokens * WORDS_PER_TOKEN))
+        return "\n\n".join(
+            " ".join(words[i % len(words)] for i in range(start, min(start + PARAGRAPH_WORDS, count)))
+            for start in range(0, count, PARAGRAPH_WORDS)
+        )
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, status: int, body: dict):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    with fake._lock:
+                        fake.lists += 1
+                    self._send_json(200, {"models": [{"name": f"{name}:latest", "model": f"{name}:latest"} for name in fake.models]})
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if self.path == "/api/pull":
+                    with fake._lock:
+                        fake.pulls += 1
+                        if body.get("model") not in fake.models:
+                            fake.models.append(body.get("model"))
+                    self._send_json(200, {"status": "success"})
+                elif self.path == "/api/generate":
+                    with fake._lock:
+                        fake.loads += 1
+                        fake.keep_alive = body.get("keep_alive")
+                    self._send_json(200, {"model": body.get("model"), "response": "", "done": True})
+                elif self.path == "/api/chat":
+                    with fake._lock:
+                        fake.keep_alive = body.get("keep_alive", fake.keep_alive)
+                    self._chat(body)
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def _chat(self, body: dict):
+                with fake._lock:
+                    fake.requests += 1
+                    fake.in_flight += 1
+                    fake.peak_concurrency = max(fake.peak_concurrency, fake.in_flight)
+                    fail = fake._random.random() < fake.failure_rate
+                    prompt = body["messages"][-1]["content"]
+                    fake.prompts.append(prompt)
+                try:
+                    max_tokens = (body.get("options") or {}).get("num_predict") or 64
+                    streaming = body.get("stream", True)
+                    # Streamed replies are paced per token instead of all up front
+                    time.sleep(fake.latency + (0 if streaming and not fail else fake.seconds_per_token * max_tokens))
+                    if fail:
+                        with fake._lock:
+                            fake.failures += 1
+                        self._send_json(503, {"error": "server busy"})
+                        return
+                    content = fake.reply(prompt, max_tokens)
+                    if body.get("format"):
+                        # Structured replies fill every field of the requested object
+                        words = content.split()
+                        content = json.dumps({
+                            "script": content,
+                            "summary": " ".join(words[:40]),
+                            "chapters": [" ".join(words[i:i + 3]) for i in range(0, min(len(words), 15), 3)],
+                            "tags": words[:5]
+                        })
+                    done = {
+                        "model": body.get("model"),
+                        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                        "done": True,
+                        "done_reason": "stop",
+                        "eval_count": max_tokens,
+                    }
+                    if streaming:
+                        self.send_response(200)
+                        self.send_header("Content-Type", "application/x-ndjson")
+                        self.end_headers()
+                        for word in content.split(" "):
+                            time.sleep(fake.seconds_per_token / WORDS_PER_TOKEN)
+                            piece = {"model": body.get("model"), "message": {"role": "assistant", "content": word + " "}, "done": False}
+                            self.wfile.write(json.dumps(piece).encode("utf-8") + b"\n")
+                        self.wfile.write(json.dumps({**done, "message": {"role": "assistant", "content": ""}}).encode("utf-8") + b"\n")
+                    else:
+                        self._send_json(200, {**done, "message": {"role": "assistant", "content": content}})
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up, e.g. on a timeout
+                    pass
+                finally:
+                    with fake._lock:
+                        fake.in_flight -= 1
+
+        return Handler
@@ -0,0 +1,73 @@
+"""
+A local fake TTS engine for exercising speech synthesis offline.
+
+Produces valid silent MP3s (MPEG-1 Layer III, 128 kbps, 44.1 kHz) whose
+length follows the text, each wrapped in an ID3v2 tag and an Info header
+frame like real encoder output, with configurable latency and failure
+rate, and records call counts and peak concurrency:
+
+    fake = FakeTTS(latency=0.2, failure_rate=0.1)
+    service = TTSService(engine=fake)
+"""
+import random
+import threading
+import time
+
+from app.services.tts_engines import LANGUAGES, TTSEngine
+
+# A 128 kbps, 44.1 kHz, unpadded MPEG-1 Layer III frame is 417 bytes
+FRAME_HEADER = b"\xff\xfb\x90\xc0"
+FRAME_BYTES = 417
+FRAME_SECONDS = 1152 / 44100
+
+# Speaking rate used to size the audio
+CHARS_PER_SECOND = 15
+
+# An empty ID3v2.3 tag and an Info frame, as encoders write before the audio
+ID3_TAG = b"ID3\x03\x00\x00\x00\x00\x00\x00"
+INFO_FRAME = FRAME_HEADER + bytes(32) + b"Info" + bytes(FRAME_BYTES - 40)
+
+
+def silent_mp3(seconds: float) -> bytes:
+    """A tagged MP3 of silent frames lasting about ``seconds``."""
+    frames = max(1, round(seconds / FRAME_SECONDS))
+    return ID3_TAG + INFO_FRAME + (FRAME_HEADER + bytes(FRAME_BYTES - 4)) * frames
+
+
+class FakeTTS(TTSEngine):
+    name = "fake"
+    format = "mp3"
+    languages = {code: code for code in LANGUAGES}
+
+    def __init__(self, latency: float = 0.05, failure_rate: float = 0.0, seed: int = 7):
+        """Configure a fake engine.
+
+        Each call sleeps ``latency`` and fails with a ConnectionError with
+        probability ``failure_rate``.
+        """
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self.failures = 0
+        self.in_flight = 0
+        self.peak_concurrency = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+
+    def synthesize(self, text: str, language: str, voice: str = "default") -> bytes:
+        self._language(language)
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak_concurrency = max(self.peak_concurrency, self.in_flight)
+            fail = self._random.random() < self.failure_rate
+        try:
+            time.sleep(self.latency)
+            if fail:
+                with self._lock:
+                    self.failures += 1
+                raise ConnectionError("fake TTS failure")
+            return silent_mp3(len(text) / CHARS_PER_SECOND)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
@@ -0,0 +1,50 @@
+"""
+Process isolation and memory helpers shared by the benchmarks.
+"""
+import multiprocessing
+import queue
+import resource
+
+
+def peak_rss_mb() -> float:
+    """Peak RSS of the current process in MB (ru_maxrss is KB on Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def current_rss_mb() -> float:
+    """Current RSS of the current process in MB, falling back to the peak."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / (1024 * 1024)
+    except OSError:
+        return peak_rss_mb()
+
+
+def _run_child(target, args, results):
+    try:
+        results.put(target(*args))
+    except Exception as e:
+        results.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def run_isolated(target, *args) -> dict:
+    """Run ``target(*args)`` in a fresh process and return the dict it returns.
+
+    Each measurement gets its own interpreter, so peak RSS is not inflated
+    by earlier runs. If the child fails, the dict holds only an "error".
+    """
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_run_child, args=(target, args, results))
+    process.start()
+    while True:
+        try:
+            report = results.get(timeout=1)
+            break
+        except queue.Empty:
+            # Killed outright (e.g. by the OOM killer) without reporting
+            if not process.is_alive() and results.empty():
+                report = {"error": f"benchmark process exited with status {process.exitcode}"}
+                break
+    process.join()
+    return report
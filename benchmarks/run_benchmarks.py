@@ -0,0 +1,231 @@
+"""
+PDF ingestion benchmark suite over synthetic academic-style corpora.
+
+Generates PDFs offline (see benchmarks/synthetic_pdf.py), runs every
+extraction path in a fresh process and reports pages/sec, milliseconds per
+stage (decode, clean, section detect) and peak RSS growth. Results are
+written as JSON and can be compared with a previous run. Run from the
+repository root:
+
+    python -m benchmarks.run_benchmarks --output bench.json
+    python -m benchmarks.run_benchmarks --output new.json --compare bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.measure import current_rss_mb, peak_rss_mb, run_isolated
+from benchmarks.synthetic_pdf import write_synthetic_pdf
+
+# Document styles: (name, write_synthetic_pdf options)
+VARIANTS = [
+    ("plain", {}),
+    ("dense", {"dense": True}),
+    ("typeset", {"ligatures": True, "hyphenation": True}),
+]
+
+PATHS = ["serial", "parallel", "streaming", "service", "service_cached"]
+
+DEFAULT_PAGES = [10, 100, 400]
+
+
+class _Timed:
+    def __init__(self, iterable):
+        """Wrap an iterator and accumulate the time spent producing its items."""
+        self._iterator = iter(iterable)
+        self.seconds = 0.0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            return next(self._iterator)
+        finally:
+            self.seconds += time.perf_counter() - start
+
+
+def _report(pages: int, seconds: float, baseline: float, stages: Dict[str, float]) -> dict:
+    """Build the result record for one run."""
+    return {
+        "pages": pages,
+        "seconds": round(seconds, 4),
+        "pages_per_sec": round(pages / seconds, 1) if seconds else None,
+        "stages_ms": {name: round(value * 1000, 1) for name, value in stages.items()},
+        "peak_rss_growth_mb": round(peak_rss_mb() - baseline, 1),
+    }
+
+
+def _bench_serial(path: str, workers: int) -> dict:
+    from app.utils.pdf_engine import clean_text, iter_pages
+    from app.utils.section_detector import detect_sections
+    baseline = current_rss_mb()
+    start = time.perf_counter()
+    raw = list(iter_pages(path))
+    decoded = time.perf_counter()
+    # detect_page_sections, timed stage by stage
+    sections = detect_sections("\n".join(raw))
+    detected = time.perf_counter()
+    [clean_text(section["content"]) for section in sections]
+    end = time.perf_counter()
+    return _report(len(raw), end - start, baseline, {
+        "decode": decoded - start,
+        "clean": end - detected,
+        "sections": detected - decoded,
+    })
+
+
+def _bench_parallel(path: str, workers: int) -> dict:
+    from app.utils.pdf_engine import clean_text, parse_document
+    from app.utils.section_detector import detect_sections
+    baseline = current_rss_mb()
+    start = time.perf_counter()
+    _, raw = parse_document(path, workers=workers, min_parallel_pages=1)
+    decoded = time.perf_counter()
+    # detect_page_sections, timed stage by stage
+    sections = detect_sections("\n".join(raw))
+    detected = time.perf_counter()
+    [clean_text(section["content"]) for section in sections]
+    end = time.perf_counter()
+    return _report(len(raw), end - start, baseline, {
+        "decode": decoded - start,
+        "clean": end - detected,
+        "sections": detected - decoded,
+    })
+
+
+def _bench_streaming(path: str, workers: int) -> dict:
+    from app.utils.pdf_pipeline import StreamedDocument, clean_pages, decode_pages, detect_headers
+    baseline = current_rss_mb()
+    start = time.perf_counter()
+    # Each stage's timer includes its upstream stages, so subtract them out
+    decode = _Timed(decode_pages(path))
+    detect = _Timed(detect_headers(decode))
+    clean = _Timed(clean_pages(detect))
+    with StreamedDocument().consume(clean) as document:
+        pages = document.num_pages
+    end = time.perf_counter()
+    return _report(pages, end - start, baseline, {
+        "decode": decode.seconds,
+        "clean": clean.seconds - detect.seconds,
+        "sections": detect.seconds - decode.seconds,
+    })
+
+
+def _bench_service(path: str, workers: int, cached: bool = False) -> dict:
+    from app.services.pdf_service import PDFService
+    from app.utils.extraction_cache import ExtractionCache
+    from app.utils.search_index import SearchIndex
+    with tempfile.TemporaryDirectory() as cache_dir:
+        index = SearchIndex(str(Path(cache_dir) / "search.sqlite3"))
+        service = PDFService(workers=workers, cache=ExtractionCache(cache_dir), index=index)
+        if cached:
+            service.parse(path)
+        baseline = current_rss_mb()
+        start = time.perf_counter()
+        document = service.parse(path)
+        end = time.perf_counter()
+        return _report(document["num_pages"], end - start, baseline, {"decode": end - start})
+
+
+def _bench_service_cached(path: str, workers: int) -> dict:
+    return _bench_service(path, workers, cached=True)
+
+
+BENCHES = {
+    "serial": _bench_serial,
+    "parallel": _bench_parallel,
+    "streaming": _bench_streaming,
+    "service": _bench_service,
+    "service_cached": _bench_service_cached,
+}
+
+
+def run_suite(page_counts: List[int], paths: List[str], workers: int, repeat: int = 3) -> dict:
+    """Generate every corpus and benchmark each path on it, keeping the fastest of ``repeat`` runs."""
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for pages in page_counts:
+            for variant, options in VARIANTS:
+                corpus = f"{variant}-{pages}"
+                pdf_path = write_synthetic_pdf(Path(workdir) / f"{corpus}.pdf", pages, **options)
+                for path_name in paths:
+                    runs = [run_isolated(BENCHES[path_name], str(pdf_path), workers) for _ in range(repeat)]
+                    report = min(runs, key=lambda run: run.get("seconds", float("inf")))
+                    report.update({"corpus": corpus, "path": path_name, "file_mb": round(pdf_path.stat().st_size / 1e6, 2)})
+                    results.append(report)
+                    _print_result(report)
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "workers": workers,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def _print_result(report: dict):
+    if "error" in report:
+        print(f"{report['corpus']:<14} {report['path']:<15} ERROR {report['error']}")
+        return
+    stages = " ".join(f"{name}={value:.0f}ms" for name, value in report["stages_ms"].items())
+    print(
+        f"{report['corpus']:<14} {report['path']:<15} {report['pages_per_sec'] or 0:>9.1f} pages/s "
+        f"{report['peak_rss_growth_mb']:>7.1f} MB  {stages}"
+    )
+
+
+def compare(current: dict, previous: dict, threshold: float) -> List[str]:
+    """Print throughput and memory changes against a previous run; return regressions."""
+    before = {(r["corpus"], r["path"]): r for r in previous["results"] if "error" not in r}
+    regressions = []
+    print(f"\nComparison with run from {previous['meta'].get('timestamp', 'unknown')}:")
+    for result in current["results"]:
+        key = (result["corpus"], result["path"])
+        if "error" in result or key not in before or not before[key]["pages_per_sec"]:
+            continue
+        speed = (result["pages_per_sec"] - before[key]["pages_per_sec"]) / before[key]["pages_per_sec"] * 100
+        memory = result["peak_rss_growth_mb"] - before[key]["peak_rss_growth_mb"]
+        flag = ""
+        if speed < -threshold:
+            flag = "  <-- REGRESSION"
+            regressions.append(f"{key[0]}/{key[1]}: {speed:+.1f}% pages/s")
+        print(f"{key[0]:<14} {key[1]:<15} {speed:+7.1f}% pages/s  {memory:+7.1f} MB{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=DEFAULT_PAGES, help="page counts to generate")
+    parser.add_argument("--paths", nargs="+", choices=PATHS, default=PATHS, help="extraction paths to run")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="pool size for parallel paths")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per path; the fastest is kept")
+    parser.add_argument("--output", default="bench_results.json", help="where to write the JSON results")
+    parser.add_argument("--compare", help="previous JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=10.0, help="pages/s drop (%%) reported as a regression")
+    args = parser.parse_args()
+
+    results = run_suite(args.pages, args.paths, args.workers, args.repeat)
+    Path(args.output).write_text(json.dumps(results, indent=2))
+    print(f"\nWrote {args.output}")
+
+    if args.compare:
+        regressions = compare(results, json.loads(Path(args.compare).read_text()), args.threshold)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Offline generator for synthetic academic-style PDFs.
+
+Builds small, valid PDF files by hand (Helvetica text, one Flate-compressed
+content stream per page) so benchmarks need no network and no PDF writer
+dependency. Pages can be dense, carry fi/fl ligature glyphs, and break
+words with hyphens at line ends, like text set by a typesetter.
+"""
+import random
+import zlib
+from pathlib import Path
+from typing import List
+
+WORDS = (
+    "the of and to in a is that for on with as by students education "
+    "agricultural teachers study data analysis research participants "
+    "diversity program university results learning experience cultural "
+    "competence survey interview findings framework curriculum outcomes "
+    "qualitative quantitative methodology significant correlation"
+).split()
+
+# Words containing fi/fl, drawn more often when ligatures are enabled
+LIGATURE_WORDS = "first field flow significant efficient reflect influence benefit".split()
+
+# Ligature characters are drawn with spare WinAnsi codes remapped by the
+# font's /Differences array to the /fi and /fl glyphs.
+LIGATURE_CODES = {"\ufb01": "\x80", "\ufb02": "\x81"}
+
+SECTION_TITLES = [
+    "Introduction", "Background", "Literature Review", "Methods",
+    "Results", "Discussion", "Conclusions",
+]
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+
+
+def _escape(line: str) -> str:
+    """Escape a line for use in a PDF literal string."""
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _sentence(rng: random.Random, words: int, ligatures: bool = False) -> str:
+    """Return one random sentence."""
+    vocabulary = WORDS + LIGATURE_WORDS * 3 if ligatures else WORDS
+    text = " ".join(rng.choice(vocabulary) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def _hyphenate(lines: List[str], rng: random.Random) -> List[str]:
+    """Break the last long word of some lines across the next line with a hyphen."""
+    for i in range(len(lines) - 1):
+        head, _, word = lines[i].rpartition(" ")
+        if head and len(word) > 7 and rng.random() < 0.3:
+            cut = len(word) // 2
+            lines[i] = f"{head} {word[:cut]}-"
+            lines[i + 1] = f"{word[cut:]} {lines[i + 1]}"
+    return lines
+
+
+def academic_pages(
+    num_pages: int,
+    lines_per_page: int = 48,
+    words_per_line: int = 13,
+    ligatures: bool = False,
+    hyphenation: bool = False,
+    seed: int = 7
+) -> List[List[str]]:
+    """Return the lines of a paper with an abstract and numbered sections."""
+    rng = random.Random(seed)
+    section_every = max(1, num_pages // len(SECTION_TITLES))
+    pages = []
+    for page_num in range(num_pages):
+        lines = []
+        if page_num == 0:
+            lines.append("Abstract")
+        elif page_num % section_every == 0:
+            index = page_num // section_every
+            if index <= len(SECTION_TITLES):
+                lines.append(f"{index}. {SECTION_TITLES[index - 1]}")
+        body = [_sentence(rng, words_per_line, ligatures) for _ in range(lines_per_page - len(lines))]
+        if hyphenation:
+            body = _hyphenate(body, rng)
+        if ligatures:
+            body = [line.replace("fi", "\ufb01").replace("fl", "\ufb02") for line in body]
+        lines.extend(body)
+        lines.append(str(page_num + 1))
+        pages.append(lines)
+    return pages
+
+
+def _encode(line: str) -> bytes:
+    """Encode a line for the synthetic font, mapping ligatures to their codes."""
+    for char, code in LIGATURE_CODES.items():
+        line = line.replace(char, code)
+    return line.encode("latin-1", errors="replace")
+
+
+def build_pdf(pages: List[List[str]], font_size: int = 10) -> bytes:
+    """Render pages of text lines into PDF bytes."""
+    leading = font_size + 2
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the kids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding "
+        b"<< /Type /Encoding /BaseEncoding /WinAnsiEncoding /Differences [128 /fi /fl] >> >>",
+    ]
+    kids = []
+    for lines in pages:
+        ops = [f"BT /F1 {font_size} Tf {leading} TL 56 {PAGE_HEIGHT - 56} Td".encode()]
+        ops.extend(b"(" + _encode(_escape(line)) + b") Tj T*" for line in lines)
+        ops.append(b"ET")
+        stream = zlib.compress(b"\n".join(ops))
+        objects.append(
+            b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream)
+            + stream + b"\nendstream"
+        )
+        content_ref = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_ref} 0 R >>".encode()
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def write_synthetic_pdf(
+    path: str,
+    num_pages: int,
+    dense: bool = False,
+    ligatures: bool = False,
+    hyphenation: bool = False,
+    seed: int = 7
+) -> Path:
+    """Write an academic-style synthetic PDF and return its path.
+
+    Dense documents pack more, longer lines into each page in a smaller font.
+    """
+    if dense:
+        pages = academic_pages(num_pages, 80, 20, ligatures, hyphenation, seed)
+        data = build_pdf(pages, font_size=6)
+    else:
+        data = build_pdf(academic_pages(num_pages, ligatures=ligatures, hyphenation=hyphenation, seed=seed))
+    path = Path(path)
+    path.write_bytes(data)
+    return path
@@ -0,0 +1,27 @@
+from app.utils.dedup import LSHIndex, add_source, remove_source
+
+
+def _item(key: str, abstract: str) -> dict:
+    return {"key": key, "data": {"title": key, "abstractNote": abstract}}
+
+
+ABSTRACTS = [
+    " ".join(f"{topic}{n}" for n in range(40))
+    for topic in ("soil", "teacher", "survey", "river")
+]
+
+
+def test_persistent_index_follows_additions_and_removals():
+    sources, index = [], LSHIndex()
+    for n, abstract in enumerate(ABSTRACTS):
+        assert add_source(sources, _item(f"k{n}", abstract), index) is None
+
+    removed = remove_source(sources, 1, index)
+    assert removed["key"] == "k1"
+    assert sorted(index.signatures) == [0, 1, 2]
+
+    # Later sources moved down a position and are still found
+    duplicate = add_source(sources, _item("again", ABSTRACTS[3]), index)
+    assert duplicate["key"] == "k3"
+    assert add_source(sources, _item("k1", ABSTRACTS[1]), index) is None
+    assert [source["key"] for source in sources] == ["k0", "k2", "k3", "k1"]
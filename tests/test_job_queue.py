@@ -0,0 +1,55 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from app.services import job_queue
+from app.services.job_queue import JobQueue, register, run_worker
+
+runs = []
+
+@register("test_silent")
+def silent(payload, report_progress):
+    runs.append(threading.current_thread().name)
+    time.sleep(payload["seconds"])
+    return {"ok": True}
+
+
+def test_silent_job_outliving_stale_after_runs_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_queue, "STALE_AFTER", 1.0)
+    monkeypatch.setattr(job_queue, "HEARTBEAT_SECONDS", 0.2)
+    monkeypatch.setattr(job_queue, "POLL_SECONDS", 0.05)
+    db_path = str(tmp_path / "jobs.sqlite3")
+    queue = JobQueue(db_path)
+    job_id = queue.submit("test_silent", {"seconds": 3.0})
+
+    stop = SimpleNamespace(value=False)
+    workers = [
+        threading.Thread(target=run_worker, args=(db_path, None, stop), name=f"w{i}")
+        for i in (1, 2)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        deadline = time.time() + 15
+        while queue.get(job_id)["status"] != "done" and time.time() < deadline:
+            time.sleep(0.1)
+        # Give a wrongly requeued job the chance to start again
+        time.sleep(1.5)
+    finally:
+        stop.value = True
+        for worker in workers:
+            worker.join()
+
+    assert queue.get(job_id)["status"] == "done"
+    assert len(runs) == 1
+
+
+def test_requeued_job_is_not_finished_by_its_old_worker(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+    job_id = queue.submit("test_silent", {"seconds": 0})
+    queue.claim("old")
+    queue.requeue_stale()
+    assert queue.get(job_id)["status"] == "queued"
+
+    queue.complete(job_id, {"ok": True}, "old")
+    assert queue.get(job_id)["status"] == "queued"
@@ -0,0 +1,54 @@
+import io
+
+import pytest
+from PyPDF2 import PdfWriter
+from PyPDF2.generic import NameObject, TextStringObject
+
+from app.utils import lazy_document
+from app.utils.extraction_cache import ExtractionCache
+from app.utils.lazy_document import LazyDocument, lazy_document_for
+from app.utils.pdf_engine import parse_document
+from app.utils.search_index import SearchIndex
+
+
+def _pdf_with_indirect_title(title: str = "Indirect Title", pages: int = 1) -> bytes:
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=200, height=200)
+    writer.add_metadata({"/Author": " Someone "})
+    # Stored as its own object, so the info dictionary holds a reference
+    writer._info.get_object()[NameObject("/Title")] = writer._add_object(TextStringObject(title))
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def stores(tmp_path):
+    return {
+        "cache": ExtractionCache(str(tmp_path / "cache")),
+        "index": SearchIndex(str(tmp_path / "search.sqlite3")),
+    }
+
+
+def test_indirect_metadata_is_resolved(stores):
+    data = _pdf_with_indirect_title()
+    document = LazyDocument(io.BytesIO(data), **stores)
+    assert document.metadata["title"] == "Indirect Title"
+    assert document.metadata["author"] == "Someone"
+    assert parse_document(io.BytesIO(data), workers=1)[0]["/Title"] == "Indirect Title"
+
+
+def test_stored_documents_are_bounded(monkeypatch, stores):
+    def isolated(source, preview_pages, digest):
+        return LazyDocument(source, preview_pages, digest=digest, **stores)
+    monkeypatch.setattr(lazy_document, "LazyDocument", isolated)
+    store = {}
+    uploads = [io.BytesIO(_pdf_with_indirect_title(f"Paper {n}")) for n in range(lazy_document.MAX_STORED_DOCUMENTS + 2)]
+    first = lazy_document_for(uploads[0], store)
+    for upload in uploads[1:]:
+        lazy_document_for(upload, store)
+        # Keep the first one in use
+        assert lazy_document_for(uploads[0], store) is first
+    assert len(store["lazy_documents"]) == lazy_document.MAX_STORED_DOCUMENTS
+    assert list(store["lazy_documents"].values())[-1] is first
@@ -0,0 +1,72 @@
+import importlib
+import io
+
+import pytest
+
+from app.utils import pdf_pipeline, pdf_processor
+from app.utils.extraction_cache import ExtractionCache
+from app.utils.pdf_engine import extract_pages
+from app.utils.pdf_pipeline import stream_document
+from app.utils.pdf_source import source_digest
+from app.utils.search_index import SearchIndex
+from app.utils.section_detector import detect_page_sections
+from benchmarks.synthetic_pdf import write_synthetic_pdf
+
+
+@pytest.fixture(scope="module")
+def pdf_path(tmp_path_factory):
+    return str(write_synthetic_pdf(tmp_path_factory.mktemp("pdf") / "paper.pdf", 40))
+
+
+def test_streamed_sections_match_the_eager_rule(pdf_path):
+    with stream_document(pdf_path) as document:
+        streamed = list(document.iter_sections())
+        assert document.num_pages == 40
+        assert not document.spilled
+    assert streamed == detect_page_sections(extract_pages(pdf_path, workers=1))
+    assert [section["title"] for section in streamed][:2] == ["Abstract", "1. Introduction"]
+
+
+def test_text_spills_past_the_threshold(pdf_path):
+    with stream_document(pdf_path, spill_bytes=1024) as small:
+        assert small.spilled
+        with stream_document(pdf_path) as large:
+            assert small.size == large.size > 1024
+            assert small.text() == large.text()
+            assert list(small.iter_sections()) == list(large.iter_sections())
+
+
+def test_malformed_spill_setting_falls_back_to_the_default(monkeypatch):
+    monkeypatch.setenv("WOOHOO_SPILL_BYTES", "16MB")
+    try:
+        assert importlib.reload(pdf_pipeline).DEFAULT_SPILL_BYTES == 16 * 1024 * 1024
+    finally:
+        monkeypatch.delenv("WOOHOO_SPILL_BYTES")
+        importlib.reload(pdf_pipeline)
+
+
+class Upload(io.BytesIO):
+    """An in-memory upload, like Streamlit's UploadedFile."""
+    def __init__(self, data: bytes, name: str):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+
+
+def test_large_uploads_are_streamed_and_indexed(pdf_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_processor, "STREAM_ABOVE_BYTES", 0)
+    with open(pdf_path, "rb") as f:
+        upload = Upload(f.read(), "paper.pdf")
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    index = SearchIndex(str(tmp_path / "search.sqlite3"))
+    processor = pdf_processor.PDFProcessor(workers=1, cache=cache, index=index)
+
+    result = processor.process_uploaded_file(upload)
+
+    assert result["metadata"]["num_pages"] == 40
+    eager = detect_page_sections(extract_pages(pdf_path, workers=1))
+    assert [s["title"] for s in result["sections"]] == [s["title"] for s in eager]
+    assert len(result["full_text"]) <= pdf_processor.STREAM_PREVIEW_BYTES
+    # Nothing held in memory was cached, but the document was indexed
+    assert "page_texts" not in cache.get(source_digest(upload))
+    assert index.search("methods")
@@ -0,0 +1,29 @@
+from app.utils.section_detector import detect_page_sections, detect_sections
+
+
+def test_prose_starting_with_a_header_word_is_not_a_header():
+    text = (
+        "1. Introduction\n"
+        "Results from earlier studies were mixed.\n"
+        "Findings diversity students interview survey.\n"
+        "4. Results\n"
+        "The model works.\n"
+    )
+    sections = detect_sections(text)
+    assert [(s["title"], s["type"]) for s in sections] == [
+        ("1. Introduction", "introduction"),
+        ("4. Results", "results"),
+    ]
+    assert sections[0]["content"].startswith("Results from earlier studies")
+
+
+def test_headers_must_fill_their_line():
+    sections = detect_sections("Preamble\n  METHODS  \nWe asked.\nAnalysis of variance was run.\n")
+    assert [s["title"] for s in sections] == ["Abstract", "METHODS"]
+
+
+def test_page_sections_are_detected_before_cleaning():
+    pages = ["Some intro\ntext here.\n2. Methods\nWe did\nthings.", "More things.\nReferences\n[1] A paper."]
+    sections = detect_page_sections(pages)
+    assert [s["title"] for s in sections] == ["Abstract", "2. Methods", "References"]
+    assert sections[1]["content"] == "We did things. More things."
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from app.utils.structured_output import parse_episode
+
+EPISODE = {
+    "script": "Welcome to the show.\n\nToday: \"sparse attention\", explained.",
+    "summary": "Sparse attention in ten minutes.",
+    "chapters": ["Intro", "Method"],
+    "tags": ["ML", "attention"]
+}
+
+
+def test_complete_json_reply():
+    episode = parse_episode(json.dumps(EPISODE))
+    assert episode["script"] == EPISODE["script"]
+    assert episode["chapters"] == ["Intro", "Method"]
+    assert episode["tags"] == ["ml", "attention"]
+
+
+def test_truncated_json_reply_keeps_the_script_written_so_far():
+    reply = json.dumps(EPISODE)
+    cut = reply[:reply.index("explained")]
+    episode = parse_episode(cut)
+    assert episode["script"] == "Welcome to the show.\n\nToday: \"sparse attention\","
+    assert "{" not in episode["script"]
+    assert episode["chapters"] == [] and episode["tags"] == []
+
+
+def test_truncated_json_reply_after_the_script_keeps_the_summary():
+    reply = json.dumps(EPISODE)
+    episode = parse_episode(reply[:reply.index("chapters") + 5])
+    assert episode["script"] == EPISODE["script"]
+    assert episode["summary"] == EPISODE["summary"]
+
+
+def test_truncated_json_reply_inside_an_escape():
+    episode = parse_episode('{"script": "Caf\\u00e9 talk, then caf\\u00')
+    assert episode["script"] == "Café talk, then caf"
+
+
+def test_truncated_json_reply_without_a_script_raises():
+    with pytest.raises(ValueError):
+        parse_episode('{"script')
+
+
+def test_plain_text_reply():
+    episode = parse_episode("# Intro\nHello there.\n\nSummary: A short one.\nTags: a, b")
+    assert episode["script"] == "# Intro\nHello there."
+    assert episode["summary"] == "A short one."
+    assert episode["chapters"] == ["Intro"]
+    assert episode["tags"] == ["a", "b"]